@@ -0,0 +1,300 @@
+# benchmarks/auth_bench.py
+#
+# 인증 API 부하/벤치마크 스크립트
+#
+# 로컬 SQLite(또는 --database-url 로 지정한 PostgreSQL)와 가짜 SMTP 서버(aiosmtpd)를 붙여
+# uvicorn 으로 앱을 띄운 뒤, 동시 요청으로 엔드포인트별 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+# 결과는 baseline 파일과 비교하여 허용 범위를 넘는 성능 저하가 있으면 종료 코드 1 을 반환합니다.
+#
+# 실행 (fastapi_id 디렉토리에서):
+#   pip install httpx aiosmtpd
+#   python benchmarks/auth_bench.py                     # 측정 후 baseline 과 비교
+#   python benchmarks/auth_bench.py --update-baseline   # 측정 결과를 새 baseline 으로 저장
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+PASSWORDS = ("Bench!pass01", "Bench!pass02") # 비밀번호 변경 시 번갈아 사용 (정책: 영문+숫자+특수문자 10자 이상)
+
+# 혼합 부하의 엔드포인트 비율 (읽기 위주)
+DEFAULT_MIX = {"mypage": 0.80, "login": 0.15, "change-password": 0.05}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        if ok:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+        else:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self) -> dict:
+        duration = max(self.finished - self.started, 1e-9)
+        result = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies.get(endpoint, []))
+            result[endpoint] = {
+                "requests": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(values) / duration, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+        return result
+
+
+class BenchUser:
+    def __init__(self, index: int, run_id: str):
+        self.emp_number = f"B{run_id}{index:05d}"
+        self.email = f"bench-{run_id}-{index}@example.com"
+        self.password = PASSWORDS[0]
+        self.token = None
+
+
+async def _timed(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response, ok = None, False
+    recorder.record(endpoint, time.perf_counter() - started, ok)
+    return response
+
+
+async def do_signup(client, recorder, user: BenchUser):
+    await _timed(client, recorder, "signup", "POST", "/auth/signup", json={
+        "email": user.email, "password": user.password, "name": "bench", "phone": "010-0000-0000",
+        "empNumber": user.emp_number,
+    })
+
+async def do_login(client, recorder, user: BenchUser):
+    response = await _timed(client, recorder, "login", "POST", "/auth/login", json={
+        "emp_number": user.emp_number, "password": user.password,
+    })
+    if response is not None and response.status_code == 200:
+        user.token = response.json()["access_token"]
+
+async def do_mypage(client, recorder, user: BenchUser):
+    await _timed(client, recorder, "mypage", "GET", "/auth/mypage", headers={"Authorization": f"Bearer {user.token}"})
+
+async def do_change_password(client, recorder, user: BenchUser):
+    new_password = PASSWORDS[1] if user.password == PASSWORDS[0] else PASSWORDS[0]
+    response = await _timed(client, recorder, "change-password", "PUT", "/auth/change-password",
+        headers={"Authorization": f"Bearer {user.token}"},
+        json={"current_password": user.password, "new_password": new_password, "confirm_password": new_password},
+    )
+    if response is not None and response.status_code == 200:
+        user.password = new_password
+
+OPERATIONS = {"login": do_login, "mypage": do_mypage, "change-password": do_change_password}
+
+
+async def run_phase(base_url: str, concurrency: int, jobs: list) -> dict:
+    """jobs: (operation, user) 목록을 concurrency 개의 워커로 실행하고 엔드포인트별 결과를 반환합니다."""
+    recorder = Recorder()
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            while True:
+                try:
+                    operation, user = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await operation(client, recorder, user)
+
+        recorder.started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        recorder.finished = time.perf_counter()
+    return recorder.report()
+
+
+async def run_benchmark(base_url: str, users_count: int, concurrency: int, mixed_requests: int, mix: dict) -> dict:
+    run_id = uuid.uuid4().hex[:6]
+    users = [BenchUser(i, run_id) for i in range(users_count)]
+    results = {}
+
+    # 1) 쓰기: 회원가입
+    results.update(await run_phase(base_url, concurrency, [(do_signup, u) for u in users]))
+    # 2) 로그인 (토큰 확보)
+    results.update(await run_phase(base_url, concurrency, [(do_login, u) for u in users]))
+    # 3) 읽기: 내 정보 조회
+    results.update(await run_phase(base_url, concurrency, [(do_mypage, u) for u in users for _ in range(5)]))
+    # 4) 혼합 부하 (읽기/쓰기 비율은 mix 로 지정). 같은 사용자의 비밀번호 변경이 겹치지 않도록 사용자별로 한 번에 하나씩만 배정
+    rng = random.Random(42)
+    names, weights = zip(*mix.items())
+    jobs = []
+    for i in range(mixed_requests):
+        operation = OPERATIONS[rng.choices(names, weights)[0]]
+        jobs.append((operation, users[i % len(users)]))
+    mixed = await run_phase(base_url, concurrency, jobs)
+    results.update({f"mixed:{name}": value for name, value in mixed.items()})
+    return results
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """p95 가 tolerance 비율 이상 늘었거나 처리량이 그만큼 줄어든 엔드포인트를 반환합니다."""
+    regressions = []
+    for endpoint, base in baseline.get("results", {}).items():
+        current = results.get(endpoint)
+        if current is None:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: rps {base['rps']} -> {current['rps']}")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{endpoint}: errors {base.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def start_fake_smtp():
+    """aiosmtpd 로 받은 메일을 버리는 SMTP 서버를 띄웁니다."""
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.handlers import Sink
+    controller = Controller(Sink(), hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    return controller
+
+
+def start_server(database_url: str, smtp_port: int, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_USE_TLS": "false",
+        "SMTP_USERNAME": "",
+        "SMTP_PASSWORD": "",
+        # 벤치마크가 요청 제한에 걸리지 않도록 충분히 크게 설정
+        "RATE_LIMIT_LOGIN": "1000000/60",
+        "RATE_LIMIT_VERIFY_PASSWORD": "1000000/60",
+        "RATE_LIMIT_WITHDRAWAL": "1000000/60",
+        "RATE_LIMIT_FORGOT_PASSWORD": "1000000/60",
+    })
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=APP_DIR, env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/healthz", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError("Server did not become ready in time.")
+
+
+def print_table(results: dict) -> None:
+    print(f"{'endpoint':<26}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, r in results.items():
+        print(f"{endpoint:<26}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Auth API load benchmark")
+    parser.add_argument("--database-url", help="PostgreSQL 등 사용할 DB (기본: 임시 SQLite 파일)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mixed-requests", type=int, default=2000)
+    parser.add_argument("--mix", help='혼합 비율 JSON (예: \'{"mypage": 0.9, "login": 0.1}\')')
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.20, help="허용 성능 저하 비율 (기본 20%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="측정 결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    tmpdir = tempfile.TemporaryDirectory()
+    database_url = args.database_url or f"sqlite:///{tmpdir.name}/bench.db"
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    smtp = start_fake_smtp()
+    server = start_server(database_url, smtp.port, port, args.workers)
+    try:
+        wait_until_ready(base_url)
+        results = asyncio.run(run_benchmark(base_url, args.users, args.concurrency, args.mixed_requests, mix))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        smtp.stop()
+        tmpdir.cleanup()
+
+    print_table(results)
+    report = {
+        "config": {
+            "users": args.users, "concurrency": args.concurrency, "mixed_requests": args.mixed_requests,
+            "mix": mix, "workers": args.workers, "database": "postgresql" if args.database_url else "sqlite",
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"baseline 저장: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"baseline 파일이 없습니다: {args.baseline} (--update-baseline 으로 생성하세요)")
+        return 0
+
+    regressions = compare_with_baseline(results, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print("성능 저하 감지:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("baseline 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# src/cli/calibrate_password_hash.py
+#
+# 비밀번호 해시 비용 보정 도구
+#
+# 이 서버에서 비용(bcrypt rounds 또는 argon2 time_cost)별 검증 시간을 측정하여
+# 목표 시간(--target-ms) 안에 들어오는 가장 높은 비용을 고르고 .env 설정을 출력합니다.
+# 설정을 바꾸면 기존 사용자의 해시는 다음 로그인/비밀번호 확인 때 백그라운드에서 새 비용으로 교체됩니다.
+#
+# 실행 (fastapi_id 디렉토리에서, 운영 서버와 같은 사양의 장비에서 부하가 없을 때):
+#   python -m src.cli.calibrate_password_hash --target-ms 250
+#   python -m src.cli.calibrate_password_hash --scheme argon2 --target-ms 250   (pip install argon2-cffi 필요)
+
+import argparse
+import statistics
+import sys
+import time
+
+from ..utils.password_hasher import (
+    PASSWORD_ARGON2_MEMORY_COST,
+    PASSWORD_ARGON2_PARALLELISM,
+    build_crypt_context,
+)
+
+SAMPLE_PASSWORD = "Calibrate!pass01"
+
+
+def measure_verify_ms(context, samples: int) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pick the password hash cost that fits a target verify time")
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="로그인 1회당 허용할 검증 시간 (중앙값)")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--min-cost", type=int, help="bcrypt rounds 기본 10, argon2 time_cost 기본 1")
+    parser.add_argument("--max-cost", type=int, help="bcrypt rounds 기본 16, argon2 time_cost 기본 10")
+    parser.add_argument("--memory-cost", type=int, default=PASSWORD_ARGON2_MEMORY_COST, help="argon2 메모리 (KiB)")
+    parser.add_argument("--parallelism", type=int, default=PASSWORD_ARGON2_PARALLELISM, help="argon2 병렬도")
+    args = parser.parse_args()
+
+    if args.scheme == "argon2":
+        try:
+            import argon2 # noqa: F401
+        except ImportError:
+            print("argon2 를 사용하려면 argon2-cffi 를 설치하세요: pip install argon2-cffi", file=sys.stderr)
+            return 2
+        min_cost, max_cost = args.min_cost or 1, args.max_cost or 10
+    else:
+        min_cost, max_cost = args.min_cost or 10, args.max_cost or 16
+
+    chosen, chosen_ms = None, None
+    print(f"{args.scheme}: target {args.target_ms:.0f}ms")
+    for cost in range(min_cost, max_cost + 1):
+        if args.scheme == "argon2":
+            context = build_crypt_context(
+                ["argon2"], argon2_time_cost=cost, argon2_memory_cost=args.memory_cost,
+                argon2_parallelism=args.parallelism,
+            )
+        else:
+            context = build_crypt_context(["bcrypt"], bcrypt_rounds=cost)
+        elapsed_ms = measure_verify_ms(context, args.samples)
+        print(f"  cost {cost:>2}: {elapsed_ms:8.1f} ms")
+        if elapsed_ms > args.target_ms:
+            break
+        chosen, chosen_ms = cost, elapsed_ms
+
+    if chosen is None:
+        chosen = min_cost
+        print(f"최소 비용({min_cost})도 목표 시간을 넘습니다. 최소 비용을 사용합니다.")
+    else:
+        print(f"선택: cost {chosen} ({chosen_ms:.1f} ms)")
+
+    # 여러 요청이 동시에 검증하면 PASSWORD_HASH_WORKERS 개를 넘는 만큼 대기 시간이 더해집니다.
+    print("\n.env 설정:")
+    if args.scheme == "argon2":
+        print("PASSWORD_HASH_SCHEMES=argon2,bcrypt")
+        print(f"PASSWORD_ARGON2_TIME_COST={chosen}")
+        print(f"PASSWORD_ARGON2_MEMORY_COST={args.memory_cost}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={args.parallelism}")
+    else:
+        print("PASSWORD_HASH_SCHEMES=bcrypt")
+        print(f"PASSWORD_BCRYPT_ROUNDS={chosen}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
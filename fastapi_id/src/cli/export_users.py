@@ -0,0 +1,49 @@
+# src/cli/export_users.py
+#
+# 사용자 전체 내보내기 CLI (GET /admin/users/export 와 같은 서비스를 사용)
+#
+# 실행 (fastapi_id 디렉토리에서):
+#   python -m src.cli.export_users --format csv -o users.csv
+#   python -m src.cli.export_users --format ndjson --gzip -o users.ndjson.gz
+#   python -m src.cli.export_users > users.ndjson
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+from ..database import get_database
+from ..models import user, password_reset_token, email_outbox # 모든 모델 등록 (relationship 해석)
+from ..services.user_export_service import EXPORT_FORMATS, export_users
+
+
+async def _run(fmt: str, compress: bool, is_deleted: Optional[bool], output: Optional[Path]) -> None:
+    out = output.open("wb") if output else sys.stdout.buffer
+    try:
+        async for chunk in export_users(fmt, get_settings().user_export_yield_per, is_deleted=is_deleted, compress=compress):
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+        await get_database().dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stream the Users table as NDJSON or CSV")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--deleted", choices=("true", "false"), help="탈퇴 여부로 필터 (기본: 전체)")
+    parser.add_argument("-o", "--output", type=Path, help="기본: 표준 출력")
+    args = parser.parse_args()
+
+    is_deleted = None if args.deleted is None else args.deleted == "true"
+    asyncio.run(_run(args.format, args.gzip, is_deleted, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# src/cli/import_users.py
+#
+# 사용자 대량 등록 CLI (POST /admin/users/import 와 같은 서비스를 사용)
+#
+# 실행 (fastapi_id 디렉토리에서):
+#   python -m src.cli.import_users users.csv
+#   python -m src.cli.import_users users.jsonl --report report.json
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal, get_database
+from ..migrations import ensure_schema
+from ..models import user, password_reset_token, email_outbox, revoked_token # 모든 모델 등록 (relationship 해석, 스키마 지문)
+from ..services.user_import_service import UserImportError, aiter_sync, import_users
+from ..utils.password_hasher import password_hasher
+
+
+async def _run(path: Path, fmt: str):
+    try:
+        async with AsyncSessionLocal() as db:
+            with path.open(encoding="utf-8-sig", newline="") as f:
+                settings = get_settings()
+                return await import_users(
+                    db,
+                    aiter_sync(f),
+                    fmt,
+                    batch_size=settings.user_import_batch_size,
+                    max_rows=settings.user_import_max_rows,
+                )
+    finally:
+        password_hasher.shutdown()
+        await get_database().dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import users from a CSV or JSONL file")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="기본: 파일 확장자로 판단")
+    parser.add_argument("--report", type=Path, help="행별 결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.file.suffix.lower() == ".csv" else "jsonl")
+    # 앱 시작과 같은 경로: 테이블 생성과 기존 DB 의 스키마 변경 단계(SCHEMA_UPGRADES)를 함께 적용합니다.
+    ensure_schema(get_database().engine)
+    try:
+        report = asyncio.run(_run(args.file, fmt))
+    except UserImportError as e:
+        print(f"가져오기 실패: {e}", file=sys.stderr)
+        return 2
+
+    if args.report:
+        args.report.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    for result in report.results:
+        if result.status != "created":
+            print(f"row {result.row}: {result.status} ({result.emp_number}) {result.detail or ''}")
+    print(json.dumps({"total": report.total, "created": report.created, "skipped": report.skipped}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
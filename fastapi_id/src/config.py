@@ -0,0 +1,248 @@
+# src/config.py
+#
+# .env 로드와 애플리케이션 설정. 환경 변수는 여기(Settings.from_env)에서만 읽고, .env 는 프로세스당 한 번만 읽습니다.
+# 요청 경로와 lifespan 은 create_app(settings) 에 넘긴 설정(request_settings)을 사용하고,
+# 워커 프로세스마다 하나인 구성 요소(해싱 풀, 인증 캐시, 백그라운드 작업)의 크기와 주기는 get_settings() 값을 사용합니다.
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from starlette.requests import HTTPConnection
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """.env 를 한 번만 읽습니다. (이미 설정된 환경 변수는 덮어쓰지 않음)"""
+    load_dotenv()
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+def _env_list(name: str, default: str = "") -> list[str]:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# 요청 제한 정책 기본값 ("<횟수>/<초>"). RATE_LIMIT_<이름> 환경 변수로 바꿉니다. (예: RATE_LIMIT_LOGIN="10/60")
+RATE_LIMIT_DEFAULTS = {
+    "login": "10/60", # 실패한 로그인만 집계
+    "verify_password": "10/60",
+    "withdrawal": "5/60",
+    "forgot_password": "5/300",
+}
+
+
+@dataclass(frozen=True)
+class Settings:
+    # --- 데이터베이스 ---
+    database_url: Optional[str]
+    async_database_url: Optional[str] # 없으면 database_url 에서 비동기 드라이버 URL 을 만듭니다.
+    db_pool_size: int            # 항상 유지하는 연결 수
+    db_max_overflow: int         # 풀이 가득 찼을 때 추가로 열 수 있는 연결 수
+    db_pool_timeout: float       # 연결을 얻기 위해 기다리는 최대 시간 (초)
+    db_pool_recycle: int         # 이 시간(초)보다 오래된 연결은 다시 연결
+    db_sync_pool_size: int       # 스크립트용 동기 엔진은 작은 풀로 충분합니다.
+    db_sync_max_overflow: int
+    database_replica_urls: tuple[str, ...] # 읽기 복제본 URL 목록 (없으면 모든 조회를 주 DB 로)
+    db_replica_retry_seconds: float # 연결에 실패한 복제본을 다시 사용하기까지 기다리는 시간 (초)
+    db_read_after_write_seconds: float # 이 워커에서 변경한 사용자는 이 시간(초) 동안 주 DB 에서 조회
+    db_pool_ready_max_saturation: float # 비동기 풀 사용률이 이 값 이상이면 /readyz 가 503
+    readyz_db_timeout_seconds: float
+    slow_query_ms: float         # 이 시간(ms) 이상 걸린 쿼리는 파라미터를 가린 채로 로그에 남깁니다.
+    query_budget_per_request: int # 요청 하나당 허용하는 최대 쿼리 수 (0 이면 검사하지 않음)
+    query_budget_strict: bool    # true 이면 예산 초과 시 QueryBudgetExceeded 를 발생시킵니다. (테스트 환경용)
+
+    # --- 인증 ---
+    secret_key: Optional[str]
+    admin_emp_numbers: frozenset[str] # 관리자 사번 목록 (ADMIN_EMP_NUMBERS=A0001,A0002)
+    agent_download_url_secret: Optional[str] # 서명된 다운로드 URL 의 서명 키 (없으면 SECRET_KEY, 둘 다 없으면 기능 비활성화)
+    principal_cache_ttl_seconds: float # 다른 워커에서 일어난 변경은 최대 이 시간만큼 늦게 반영됩니다.
+    principal_cache_max_entries: int
+    token_revocation_bucket_seconds: int # 만료 시각을 이 간격(초)으로 묶어 보관하고, 지난 묶음은 통째로 버립니다.
+    token_revocation_sync_seconds: float # 다른 워커에서 폐기한 토큰을 읽어오는 주기 (초). 워커 간 반영 지연의 최대값
+    token_revocation_compact_seconds: float # 만료된 폐기 기록을 메모리/테이블에서 정리하는 주기 (초)
+
+    # --- 비밀번호 해싱 ---
+    # 적절한 값은 python -m src.cli.calibrate_password_hash 로 측정합니다.
+    password_hash_workers: int   # bcrypt 를 실행하는 프로세스 수
+    password_hash_max_queue: int # 대기 + 실행 중 작업 최대 개수
+    password_hash_timeout_seconds: float # 호출당 최대 대기 시간
+    password_hash_schemes: tuple[str, ...] # 첫 번째 방식으로 새 해시를 만들고, 나머지는 검증만 합니다.
+    password_bcrypt_rounds: int  # passlib 기본값과 동일 (12)
+    password_argon2_time_cost: int
+    password_argon2_memory_cost: int # KiB
+    password_argon2_parallelism: int
+    password_hash_census_interval_seconds: float # 해시 방식/비용별 사용자 수를 다시 세는 주기 (초)
+
+    # --- 요청 제한 ---
+    rate_limit_backend: str      # "memory" (워커 프로세스별) 또는 "redis" (여러 워커/서버 공유)
+    rate_limit_redis_url: str
+    rate_limit_trust_forwarded: bool # 리버스 프록시 뒤에서만 true (X-Forwarded-For 의 첫 번째 주소를 클라이언트 IP 로 사용)
+    rate_limits: dict[str, str]  # 정책 이름 → "<횟수>/<초>" (RATE_LIMIT_DEFAULTS)
+
+    # --- 이메일 ---
+    smtp_server: str
+    smtp_port: int # 대부분의 SMTP는 587 (TLS) 또는 465 (SSL)
+    smtp_username: Optional[str]
+    smtp_password: Optional[str] # 앱 비밀번호 (앱 암호) 사용 권장
+    sender_email: str
+    smtp_use_tls: bool # 로컬 테스트용 aiosmtpd 등 TLS 를 지원하지 않는 서버에서는 false
+    smtp_idle_check_seconds: float # 재사용 중인 SMTP 연결을 이 시간(초) 이상 쓰지 않았으면 NOOP 으로 확인
+    email_dispatch_batch_size: int # 한 번에 가져올 메시지 수
+    email_dispatch_connections: int # 동시에 유지할 SMTP 연결 수
+    email_dispatch_poll_seconds: float # 새 메시지 확인 주기
+    email_dispatch_lease_seconds: int # 'sending' 점유 유지 시간
+    email_max_attempts: int
+    email_retry_base_seconds: int # 재시도 간격 (지수 백오프 시작값)
+    email_retry_max_seconds: int
+    reset_token_sweep_interval_seconds: float # 만료된 비밀번호 재설정 토큰 정리 주기
+    reset_token_sweep_batch_size: int # 한 번에 삭제할 최대 행 수
+
+    # --- 사용자 ---
+    user_filter_enabled: bool    # 가입/재설정 요청의 "없음" 판단용 존재 필터 사용 여부
+    user_filter_error_rate: float # "있을 수도 있음" 오탐률
+    user_filter_min_capacity: int
+    user_filter_sync_seconds: float # 새로 추가/변경된 사용자를 필터에 반영하는 주기 (초)
+    user_filter_rebuild_seconds: float # 전체를 다시 읽어 필터를 새로 만드는 주기 (초)
+    user_import_batch_size: int  # 한 번에 중복 검사/INSERT 하는 행 수
+    user_import_max_rows: int    # 한 번의 가져오기에서 처리할 최대 행 수
+    user_export_yield_per: int   # 서버 측 커서에서 한 번에 가져오는 행 수
+
+    # --- 에이전트 다운로드 ---
+    agent_download_dir: str      # 에이전트 설치 파일이 있는 디렉토리와 파일 이름
+    agent_download_file: str
+    agent_download_url_ttl_seconds: int # 서명된 다운로드 URL 의 유효 시간 (초)
+    agent_download_accel_redirect_prefix: str # nginx 뒤에서 설정하면 파일 전송을 nginx 에 넘깁니다. (예: /protected-downloads/)
+
+    # --- 대시보드 ---
+    dashboard_ingest_token: str  # 수집 API 인증용 공유 토큰 (설정하지 않으면 수집 API 는 503)
+    dashboard_stream_tick_seconds: float # 토픽별 계산 주기를 확인하는 간격 (초)
+    dashboard_stream_queue_size: int # 구독자별로 쌓아둘 수 있는 이벤트 수 (넘치면 전체 스냅샷을 다시 보냄)
+    dashboard_stream_heartbeat_seconds: float # 프록시의 유휴 연결 종료 시간보다 짧아야 합니다.
+    dashboard_traffic_second_buckets: int # 초 단위 트래픽 그래프에 보관하는 구간 수 (초)
+    dashboard_top_ports_minute_buckets: int # 상위 포트 집계: 분 단위 구간 수와 구간마다 추적하는 포트 수
+    dashboard_top_ports_sketch_capacity: int
+    dashboard_recent_attacks: int # 메모리에 보관하는 최근 공격/로그 수
+    dashboard_recent_logs: int
+    dashboard_max_clock_skew_seconds: float # 수집기 시계가 이만큼(초) 이상 앞선 값은 버립니다.
+
+    # --- 로깅 ---
+    log_level: str
+    log_format: str              # json 또는 text
+    log_queue_size: int          # 가득 차면 요청을 막지 않고 로그를 버립니다.
+    log_debug_sample_rate: float # DEBUG 로그 중 기록할 비율
+    log_requests: bool           # 요청마다 한 줄 접근 로그 기록 여부
+    log_library_level: str       # sqlalchemy 등 라이브러리 로거의 레벨
+
+    # --- 시작 ---
+    startup_skip_current_schema: bool # 스키마 지문이 같으면 create_all / 스키마 변경 확인을 건너뜀
+    startup_warm_db_connections: int  # 시작 시 미리 열어둘 비동기 DB 연결 수 (0 이면 사용 안 함)
+    startup_warm_password_hasher: bool # 시작 시 해싱 워커 프로세스를 모두 띄우고 bcrypt 를 한 번씩 실행
+
+    # --- 종료 ---
+    shutdown_drain_timeout_seconds: float # 종료 시 백그라운드 작업 마무리와 자원 정리에 쓰는 최대 시간 (초)
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_env()
+        return cls(
+            database_url=os.getenv("DATABASE_URL"),
+            async_database_url=os.getenv("ASYNC_DATABASE_URL"),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", 10)),
+            db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 20)),
+            db_pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+            db_sync_pool_size=int(os.getenv("DB_SYNC_POOL_SIZE", 2)),
+            db_sync_max_overflow=int(os.getenv("DB_SYNC_MAX_OVERFLOW", 3)),
+            database_replica_urls=tuple(_env_list("DATABASE_REPLICA_URLS")),
+            db_replica_retry_seconds=float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30)),
+            db_read_after_write_seconds=float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", 5)),
+            db_pool_ready_max_saturation=float(os.getenv("DB_POOL_READY_MAX_SATURATION", 0.9)),
+            readyz_db_timeout_seconds=float(os.getenv("READYZ_DB_TIMEOUT_SECONDS", 2)),
+            slow_query_ms=float(os.getenv("SLOW_QUERY_MS", 200)),
+            query_budget_per_request=int(os.getenv("QUERY_BUDGET_PER_REQUEST", 0)),
+            query_budget_strict=_env_bool("QUERY_BUDGET_STRICT", "false"),
+            secret_key=os.getenv("SECRET_KEY"),
+            admin_emp_numbers=frozenset(_env_list("ADMIN_EMP_NUMBERS")),
+            agent_download_url_secret=os.getenv("AGENT_DOWNLOAD_URL_SECRET") or os.getenv("SECRET_KEY"),
+            principal_cache_ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30)),
+            principal_cache_max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000)),
+            token_revocation_bucket_seconds=int(os.getenv("TOKEN_REVOCATION_BUCKET_SECONDS", 300)),
+            token_revocation_sync_seconds=float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", 5)),
+            token_revocation_compact_seconds=float(os.getenv("TOKEN_REVOCATION_COMPACT_SECONDS", 300)),
+            password_hash_workers=int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)),
+            password_hash_max_queue=int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 256)),
+            password_hash_timeout_seconds=float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", 5)),
+            password_hash_schemes=tuple(_env_list("PASSWORD_HASH_SCHEMES", "bcrypt")),
+            password_bcrypt_rounds=int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 12)),
+            password_argon2_time_cost=int(os.getenv("PASSWORD_ARGON2_TIME_COST", 3)),
+            password_argon2_memory_cost=int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", 65536)),
+            password_argon2_parallelism=int(os.getenv("PASSWORD_ARGON2_PARALLELISM", 4)),
+            password_hash_census_interval_seconds=float(os.getenv("PASSWORD_HASH_CENSUS_INTERVAL_SECONDS", 300)),
+            rate_limit_backend=os.getenv("RATE_LIMIT_BACKEND", "memory"),
+            rate_limit_redis_url=os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"),
+            rate_limit_trust_forwarded=_env_bool("RATE_LIMIT_TRUST_FORWARDED", "false"),
+            rate_limits={name: os.getenv(f"RATE_LIMIT_{name.upper()}", default) for name, default in RATE_LIMIT_DEFAULTS.items()},
+            smtp_server=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+            smtp_port=int(os.getenv("SMTP_PORT", 587)),
+            smtp_username=os.getenv("SMTP_USERNAME"),
+            smtp_password=os.getenv("SMTP_PASSWORD"),
+            sender_email=os.getenv("SENDER_EMAIL", "your_email@example.com"),
+            smtp_use_tls=_env_bool("SMTP_USE_TLS", "true"),
+            smtp_idle_check_seconds=float(os.getenv("SMTP_IDLE_CHECK_SECONDS", 30)),
+            email_dispatch_batch_size=int(os.getenv("EMAIL_DISPATCH_BATCH_SIZE", 50)),
+            email_dispatch_connections=int(os.getenv("EMAIL_DISPATCH_CONNECTIONS", 2)),
+            email_dispatch_poll_seconds=float(os.getenv("EMAIL_DISPATCH_POLL_SECONDS", 2)),
+            email_dispatch_lease_seconds=int(os.getenv("EMAIL_DISPATCH_LEASE_SECONDS", 300)),
+            email_max_attempts=int(os.getenv("EMAIL_MAX_ATTEMPTS", 5)),
+            email_retry_base_seconds=int(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30)),
+            email_retry_max_seconds=int(os.getenv("EMAIL_RETRY_MAX_SECONDS", 3600)),
+            reset_token_sweep_interval_seconds=float(os.getenv("RESET_TOKEN_SWEEP_INTERVAL_SECONDS", 60)),
+            reset_token_sweep_batch_size=int(os.getenv("RESET_TOKEN_SWEEP_BATCH_SIZE", 1000)),
+            user_filter_enabled=_env_bool("USER_FILTER_ENABLED", "true"),
+            user_filter_error_rate=float(os.getenv("USER_FILTER_ERROR_RATE", 0.01)),
+            user_filter_min_capacity=int(os.getenv("USER_FILTER_MIN_CAPACITY", 10000)),
+            user_filter_sync_seconds=float(os.getenv("USER_FILTER_SYNC_SECONDS", 10)),
+            user_filter_rebuild_seconds=float(os.getenv("USER_FILTER_REBUILD_SECONDS", 3600)),
+            user_import_batch_size=int(os.getenv("USER_IMPORT_BATCH_SIZE", 500)),
+            user_import_max_rows=int(os.getenv("USER_IMPORT_MAX_ROWS", 100000)),
+            user_export_yield_per=int(os.getenv("USER_EXPORT_YIELD_PER", 1000)),
+            agent_download_dir=os.getenv("AGENT_DOWNLOAD_DIR", "downloads"),
+            agent_download_file=os.getenv("AGENT_DOWNLOAD_FILE", "hello.exe"),
+            agent_download_url_ttl_seconds=int(os.getenv("AGENT_DOWNLOAD_URL_TTL_SECONDS", 300)),
+            agent_download_accel_redirect_prefix=os.getenv("AGENT_DOWNLOAD_ACCEL_REDIRECT_PREFIX", ""),
+            dashboard_ingest_token=os.getenv("DASHBOARD_INGEST_TOKEN", ""),
+            dashboard_stream_tick_seconds=float(os.getenv("DASHBOARD_STREAM_TICK_SECONDS", 1)),
+            dashboard_stream_queue_size=int(os.getenv("DASHBOARD_STREAM_QUEUE_SIZE", 32)),
+            dashboard_stream_heartbeat_seconds=float(os.getenv("DASHBOARD_STREAM_HEARTBEAT_SECONDS", 15)),
+            dashboard_traffic_second_buckets=int(os.getenv("DASHBOARD_TRAFFIC_SECOND_BUCKETS", 300)),
+            dashboard_top_ports_minute_buckets=int(os.getenv("DASHBOARD_TOP_PORTS_MINUTE_BUCKETS", 60)),
+            dashboard_top_ports_sketch_capacity=int(os.getenv("DASHBOARD_TOP_PORTS_SKETCH_CAPACITY", 200)),
+            dashboard_recent_attacks=int(os.getenv("DASHBOARD_RECENT_ATTACKS", 50)),
+            dashboard_recent_logs=int(os.getenv("DASHBOARD_RECENT_LOGS", 1000)),
+            dashboard_max_clock_skew_seconds=float(os.getenv("DASHBOARD_MAX_CLOCK_SKEW_SECONDS", 60)),
+            log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+            log_format=os.getenv("LOG_FORMAT", "json").lower(),
+            log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", 10000)),
+            log_debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0)),
+            log_requests=_env_bool("LOG_REQUESTS", "true"),
+            log_library_level=os.getenv("LOG_LIBRARY_LEVEL", "WARNING").upper(),
+            startup_skip_current_schema=_env_bool("STARTUP_SKIP_CURRENT_SCHEMA", "true"),
+            startup_warm_db_connections=int(os.getenv("STARTUP_WARM_DB_CONNECTIONS", 2)),
+            startup_warm_password_hasher=_env_bool("STARTUP_WARM_PASSWORD_HASHER", "true"),
+            shutdown_drain_timeout_seconds=float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", 20)),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings.from_env()
+
+
+def request_settings(connection: HTTPConnection) -> Settings:
+    """요청(또는 WebSocket)을 처리하는 앱의 설정 (create_app 이 app.state.settings 에 저장). 의존성으로도 사용합니다."""
+    settings = getattr(connection.app.state, "settings", None)
+    return settings if settings is not None else get_settings()
@@ -1,30 +1,244 @@
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from starlette.requests import HTTPConnection
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from typing import Annotated, AsyncGenerator, Callable, Generator, Optional
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
+import weakref
+from .config import Settings, get_settings
+from .utils.db_pool_monitor import PoolStats, monitored_pool_class, attach_pool_events
+from .utils.query_profiler import instrument_engine
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# PostreSQL DB 연결 URL 설정
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-if not SQLALCHEMY_DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set.")
+# 동기 드라이버 URL을 같은 DB의 비동기 드라이버 URL로 변환
+# 예: postgresql+psycopg2://... -> postgresql+asyncpg://..., sqlite:///... -> sqlite+aiosqlite:///...
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-# SQLAlchemy Engine 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True
-)
+def to_async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'.")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def pool_options(url: str, pool_class: type, stats: PoolStats, settings: Settings) -> dict:
+    # 메모리 SQLite 는 연결 하나를 공유하는 StaticPool 을 써야 하므로 풀 설정을 적용하지 않습니다.
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": monitored_pool_class(pool_class, stats),
+        "pool_size": stats.pool_size,
+        "max_overflow": stats.max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+class Database:
+    """
+    앱 하나(워커 프로세스 하나)가 사용하는 엔진과 세션 팩토리 묶음.
+    lifespan 에서 open_database(settings) 로 만들어 app.state.database 에 두고, 종료할 때 dispose() 로 정리합니다.
+    요청 경로의 세션은 get_db / get_async_db / UnitOfWork / get_read_db 가 app.state.database 에서 만듭니다.
+    """
+
+    def __init__(self, settings: Settings):
+        # PostreSQL DB 연결 URL 설정
+        if not settings.database_url:
+            raise ValueError("DATABASE_URL environment variable is not set.")
+        self.settings = settings
+        self.url = settings.database_url
+        # ASYNC_DATABASE_URL 을 따로 지정하지 않으면 DATABASE_URL 에서 자동으로 만듭니다.
+        self.async_url = settings.async_database_url or to_async_database_url(self.url)
+
+        # 풀 사용량 통계 (/healthz, /readyz 에서 사용)
+        self.sync_pool_stats = PoolStats("sync", settings.db_sync_pool_size, settings.db_sync_max_overflow)
+        self.async_pool_stats = PoolStats("async", settings.db_pool_size, settings.db_max_overflow)
+
+        # SQLAlchemy Engine 생성 (스크립트, 테이블 생성 등 동기 경로용)
+        self.engine = create_engine(
+            self.url,
+            pool_pre_ping=True,
+            **pool_options(self.url, QueuePool, self.sync_pool_stats, settings),
+        )
+        attach_pool_events(self.engine, self.sync_pool_stats)
+        instrument_engine(self.engine, "sync", settings.slow_query_ms)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        # SQLAlchemy AsyncEngine 생성 (라우트, 서비스 등 이벤트 루프 경로용)
+        self.async_engine = create_async_engine(
+            self.async_url,
+            pool_pre_ping=True,
+            **pool_options(self.async_url, AsyncAdaptedQueuePool, self.async_pool_stats, settings),
+        )
+        attach_pool_events(self.async_engine.sync_engine, self.async_pool_stats)
+        instrument_engine(self.async_engine.sync_engine, "async", settings.slow_query_ms)
+        # expire_on_commit=False: 커밋 후 속성 접근 시 암묵적인 (비동기에서 허용되지 않는) 재조회를 막습니다.
+        self.AsyncSessionLocal = async_sessionmaker(bind=self.async_engine, autoflush=False, expire_on_commit=False)
+
+        # 읽기 복제본 (read_replica.attach_replicas 가 설정). 없으면 조회도 주 DB 에서 합니다.
+        self.replica_engines: list[AsyncEngine] = []
+        self.replica_pool_stats: list[PoolStats] = []
+        self.ReadSessionLocal = self.AsyncSessionLocal
+
+        _databases.add(self)
+
+    def pool_report(self) -> dict:
+        return {
+            "async": self.async_pool_stats.snapshot(self.async_engine.pool),
+            "sync": self.sync_pool_stats.snapshot(self.engine.pool),
+            **{
+                stats.name: stats.snapshot(replica.pool)
+                for stats, replica in zip(self.replica_pool_stats, self.replica_engines)
+            },
+        }
+
+    async def warm_up(self, connections: int) -> int:
+        """
+        비동기 풀에 연결을 미리 열어 둡니다. (첫 요청들이 TCP/TLS 연결과 인증 비용을 떠안지 않도록)
+        동시에 열어야 서로 다른 연결이 만들어지며, 반환된 연결은 풀에 남습니다. 연 연결 수를 반환합니다.
+        """
+        connections = min(connections, self.async_pool_stats.pool_size)
+        if connections <= 0 or _is_memory_sqlite(self.async_url):
+            return 0
+
+        async def open_one() -> None:
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        await asyncio.gather(*[open_one() for _ in range(connections)])
+        return connections
+
+    def reset_after_fork(self) -> None:
+        # 부모의 연결을 닫지 않고 버립니다. (같은 소켓을 두 프로세스가 쓰지 않도록)
+        self.engine.dispose(close=False)
+        self.async_engine.sync_engine.dispose(close=False)
+        for replica in self.replica_engines:
+            replica.sync_engine.dispose(close=False)
+
+    async def dispose(self) -> None:
+        await self.async_engine.dispose()
+        for replica in self.replica_engines:
+            await replica.dispose()
+        self.engine.dispose()
+
+
+_databases: "weakref.WeakSet[Database]" = weakref.WeakSet()
+_active: Optional[Database] = None
+
+# 포크된 자식 프로세스(gunicorn --preload 워커, 해싱 프로세스 풀 등)는 부모가 열어둔 연결을 물려받습니다.
+# 같은 소켓을 두 프로세스가 쓰지 않도록 자식에서는 부모의 연결을 닫지 않고 버린 뒤 새 풀로 시작합니다.
+def _reset_pools_after_fork() -> None:
+    for database in list(_databases):
+        database.reset_after_fork()
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def open_database(settings: Settings) -> Database:
+    """주 DB 와 (설정된 경우) 읽기 복제본 엔진을 만듭니다."""
+    from .read_replica import attach_replicas # read_replica 가 이 모듈을 import 하므로 여기서 import
+
+    database = Database(settings)
+    attach_replicas(database)
+    return database
+
+def set_database(database: Optional[Database]) -> None:
+    """백그라운드 작업과 스크립트가 사용할 DB 를 지정합니다. (lifespan 시작 시 앱의 DB 로 지정)"""
+    global _active
+    _active = database
+
+def current_database() -> Optional[Database]:
+    return _active
+
+def get_database() -> Database:
+    """
+    현재 DB. lifespan 밖(CLI, 스크립트)에서 처음 호출하면 환경 변수 설정으로 만듭니다.
+    import 시점에는 엔진을 만들지 않으므로 create_app(Settings(...)) 의 설정이 그대로 적용됩니다.
+    """
+    if _active is None:
+        set_database(open_database(get_settings()))
+    return _active
+
+# 백그라운드 작업(발송, 정리, 동기화 등)과 스크립트용 세션. 요청 경로는 아래의 의존성을 사용합니다.
+def SessionLocal() -> Session:
+    return get_database().SessionLocal()
+
+def AsyncSessionLocal() -> AsyncSession:
+    return get_database().AsyncSessionLocal()
+
+def request_database(connection: HTTPConnection) -> Database:
+    """요청(또는 WebSocket)을 처리하는 앱의 DB (lifespan 이 app.state.database 에 저장)"""
+    database = getattr(connection.app.state, "database", None)
+    return database if database is not None else get_database()
 
 Base = declarative_base()
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+# 커밋 후 작업: 세션 info 에 모아 두었다가 최상위 트랜잭션이 커밋되면 실행하고, 롤백되면 버립니다.
+_AFTER_COMMIT = "after_commit_callbacks"
+
+def after_commit(db: Session | AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    현재 트랜잭션이 커밋된 뒤 실행할 작업(인증 캐시 무효화, 존재 필터 추가, 발송 알림 등)을 등록합니다.
+    커밋 전에 캐시를 비우면 그 사이 다른 요청이 변경 전 값을 다시 캐시할 수 있으므로 커밋 이후로 미룹니다.
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, ()):
+        try:
+            callback()
+        except Exception:
+            logger.exception("커밋 후 작업 실행 중 오류")
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None: # 세이브포인트 롤백은 바깥 트랜잭션의 작업을 그대로 둡니다.
+        session.info.pop(_AFTER_COMMIT, None)
+
+# 동기 경로도 요청 단위로 한 번 커밋합니다. (get_async_uow 참고)
+def get_db(request: Request) -> Generator[Session, None, None]:
+    db = request_database(request).SessionLocal()
     try:
         yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """트랜잭션을 직접 관리하는 세션 (배치마다 커밋하는 대량 등록 등). 일반적인 쓰기 엔드포인트는 UnitOfWork 를 사용합니다."""
+    async with request_database(request).AsyncSessionLocal() as db:
+        yield db
+
+# 요청 단위 트랜잭션 (Unit of Work)
+# 서비스 함수는 flush 까지만 하고, 엔드포인트가 정상 종료하면 여기서 한 번만 커밋합니다.
+# 엔드포인트에서 예외가 나면 (HTTPException 포함) 요청 중의 모든 변경을 롤백합니다.
+async def get_async_uow(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with request_database(request).AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+
+# scope="function": 응답을 보내기 전에 커밋이 끝나야 커밋 실패(UNIQUE 위반 등)가 오류 응답으로 전달됩니다.
+UnitOfWork = Annotated[AsyncSession, Depends(get_async_uow, scope="function")]
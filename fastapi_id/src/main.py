@@ -1,13 +1,38 @@
+from .utils.startup_timer import startup_timer # 가장 먼저 import: 이후 모듈 import 시간을 시작 보고에 포함
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse, Response # Response 임포트 추가
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError
-from .database import Base, engine 
-from .routes import auth 
-from fastapi.staticfiles import StaticFiles # 🚨 추가: StaticFiles 임포트
+from contextlib import asynccontextmanager
+from typing import Awaitable, Optional
+import asyncio
+import logging
+import time
+from .config import Settings, get_settings, request_settings
+from .database import current_database, open_database, set_database
+from .migrations import ensure_schema
+from .read_replica import replica_router
+from .routes import auth, admin, agent, dashboard, health, metrics
+from .utils.password_hasher import password_hasher, PasswordHasherUnavailableError
+from .services.email_outbox_service import email_dispatcher
+from .services.password_reset_service import reset_token_sweeper
+from .services.password_hash_service import password_hash_census, drain_rehash_tasks
+from .services.token_revocation_service import token_revocation_store
+from .services.user_existence_service import user_existence_filter
+from .services.agent_download_service import agent_artifact_store
+from .services.dashboard_stream_service import dashboard_hub
+from .services.dashboard_rollup_service import traffic_rollup, log_rollup, rollup_stats
+from .utils.rate_limit import RateLimitExceeded, rate_limiter
+from .utils.principal_cache import principal_cache
+from .utils.metrics import registry, HTTP_REQUESTS_TOTAL, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, route_label
+from .utils.query_profiler import profile_queries, finish_request_profile
+from .utils.conditional import ConditionalGetMiddleware, NotModified
+from .utils.db_errors import unique_violation_message
+from .utils import logging_config
+from .utils.logging_config import setup_logging, shutdown_logging, request_id_var, new_request_id, REQUEST_ID_HEADER
 
-app = FastAPI(title="FastAPI User Authentication API")
+logger = logging.getLogger(__name__)
 
 # CORS Middleware configuration
 # 🚨 수정된 부분: 허용할 오리진 목록에 'http://localhost:5173' 명확히 포함
@@ -19,57 +44,265 @@ origins = [
     # Add your frontend production URL here if deployed
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],  # 모든 HTTP 메서드 허용
-    allow_headers=["*"],  # 모든 헤더 허용
+# 컴포넌트별 stats() 를 /metrics 에 게이지로 노출
+registry.add_stats_collector("password_hasher", password_hasher.stats)
+registry.add_stats_collector("principal_cache", principal_cache.stats)
+registry.add_stats_collector("email_dispatcher", email_dispatcher.stats)
+registry.add_stats_collector("reset_token_sweeper", reset_token_sweeper.stats)
+registry.add_stats_collector("password_hash_census", password_hash_census.stats)
+registry.add_stats_collector("token_revocation", token_revocation_store.stats)
+registry.add_stats_collector("user_existence_filter", user_existence_filter.stats)
+registry.add_stats_collector("agent_download", agent_artifact_store.stats)
+registry.add_stats_collector("dashboard_stream", dashboard_hub.stats)
+registry.add_stats_collector("dashboard_rollup", rollup_stats)
+registry.add_stats_collector("rate_limit", rate_limiter.stats)
+registry.add_stats_collector("logging", logging_config.stats)
+registry.add_stats_collector("startup", startup_timer.stats)
+registry.add_stats_collector("db_replica", replica_router.stats)
+
+
+def _db_pool_stats() -> dict:
+    # 풀별 통계 (db_pool_async_*, db_pool_sync_*, db_pool_replica0_* ...). lifespan 시작 전에는 비어 있습니다.
+    database = current_database()
+    return database.pool_report() if database is not None else {}
+
+registry.add_stats_collector("db_pool", _db_pool_stats)
+
+# 대시보드 스트림 토픽: 구독자가 있을 때만 주기마다 한 번 계산하여 모든 연결에 나눠줍니다.
+dashboard_hub.register_topic(
+    "system",
+    lambda: {
+        "db_pool": _db_pool_stats().get("async", {}),
+        "password_hasher": password_hasher.stats(),
+        "rate_limit": rate_limiter.stats(),
+    },
+    interval_seconds=5,
 )
+dashboard_hub.register_topic("traffic", traffic_rollup.snapshot, interval_seconds=1) # 기존 3초 폴링 4개 API
+dashboard_hub.register_topic("logs", log_rollup.snapshot, interval_seconds=5) # 기존 5초 폴링 3개 API
 
-# 🚨 추가된 부분: 정적 파일 서비스 설정
-# 'downloads' 디렉토리의 파일을 '/downloads' 경로로 서비스합니다.
-# 이 경로는 클라이언트에서 파일을 요청할 때 사용됩니다.
-# 예: http://localhost:8000/downloads/sample_installer.exe
-app.mount("/downloads", StaticFiles(directory="downloads"), name="downloads")
 
+# ----------------------------------------------------
+# 1. 시작 / 종료 (lifespan)
+# ----------------------------------------------------
+async def _startup(app: FastAPI, settings: Settings) -> None:
+    startup_timer.begin()
+    with startup_timer.phase("database"):
+        # 엔진/세션 팩토리는 import 시점이 아니라 여기서 앱의 설정으로 만듭니다. (요청 세션은 app.state.database 에서)
+        database = open_database(settings)
+        app.state.database = database
+        set_database(database) # 백그라운드 작업(발송, 정리, 동기화 등)도 같은 DB 사용
+    with startup_timer.phase("schema"):
+        # 모델/스키마 변경 단계가 그대로면 create_all 과 테이블 조회를 건너뜁니다.
+        schema = ensure_schema(database.engine, skip_if_current=settings.startup_skip_current_schema)
+    with startup_timer.phase("background_services"):
+        rate_limiter.configure(settings) # 앱 설정의 요청 제한 저장소/정책
+        password_hasher.start() # bcrypt 해싱용 프로세스 풀 시작
+        email_dispatcher.configure(settings) # 앱 설정의 SMTP 서버로 연결
+        email_dispatcher.start() # 이메일 outbox 백그라운드 발송 시작
+        reset_token_sweeper.start() # 만료된 비밀번호 재설정 토큰 주기적 정리
+        password_hash_census.start() # 해시 방식/비용별 사용자 수 주기적 집계
+    await startup_timer.timed("token_revocation", token_revocation_store.start()) # 폐기된 토큰 목록 로드 후 주기적 동기화/정리
 
-# 데이터베이스 테이블 생성 (애플리케이션 시작 시)
-@app.on_event("startup")
-def on_startup():
-    print("DEBUG: Starting database table creation/check...")
-    Base.metadata.create_all(bind=engine)
-    print("DEBUG: Database table creation/check complete.")
+    # 첫 요청이 연결 생성과 워커 프로세스 생성 비용을 떠안지 않도록 미리 준비합니다. (동시에 실행)
+    warm_ups = []
+    if settings.startup_warm_db_connections > 0:
+        warm_ups.append(startup_timer.timed("warm_db_pool", database.warm_up(settings.startup_warm_db_connections)))
+    if settings.startup_warm_password_hasher:
+        warm_ups.append(startup_timer.timed("warm_password_hasher", password_hasher.warm_up()))
+    warm_ups.append(startup_timer.timed("user_existence_filter", user_existence_filter.start())) # 가입/재설정 요청의 "없음" 판단용
+    results = await asyncio.gather(*warm_ups, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException): # 미리 준비하지 못해도 첫 요청에서 다시 시도되므로 시작은 계속합니다.
+            logger.warning("Startup warm-up failed", exc_info=result)
 
-# 라우터 등록
-app.include_router(auth.router, prefix="/auth")
+    dashboard_hub.start() # 대시보드 토픽 계산 및 구독자 배포
+    startup_timer.finish(**schema)
 
-# 🚨 추가된 부분: OPTIONS 메서드에 대한 전역 핸들러
-# Preflight 요청에 대해 200 OK 응답을 보내도록 강제합니다.
-@app.options("/{path:path}")
-async def options_handler(request: Request, path: str):
-    # CORS 미들웨어가 이미 헤더를 처리하므로, 여기서는 단순히 빈 200 응답을 반환합니다.
-    # 이렇게 하면 브라우저의 Preflight 요청이 성공적으로 완료됩니다.
-    return Response(status_code=status.HTTP_200_OK)
 
+async def _shutdown(app: FastAPI, settings: Settings) -> None:
+    """
+    새 작업을 만드는 백그라운드 작업부터 멈추고, 진행 중인 작업을 마무리한 뒤 자원을 정리합니다.
+    전체 정리 시간은 SHUTDOWN_DRAIN_TIMEOUT_SECONDS 로 제한하며, 시간을 넘긴 단계는 기록하고 다음 단계로 넘어갑니다.
+    """
+    deadline = time.monotonic() + settings.shutdown_drain_timeout_seconds
+
+    async def drain(name: str, awaitable: Awaitable) -> None:
+        try:
+            await asyncio.wait_for(awaitable, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown step timed out", extra={"step": name})
+        except Exception:
+            logger.exception("Shutdown step failed", extra={"step": name})
 
-# 전역 예외 핸들러: 유효성 검사 오류
-@app.exception_handler(RequestValidationError)
+    await drain("dashboard_hub", dashboard_hub.stop())
+    await drain("token_revocation", token_revocation_store.stop())
+    await drain("user_existence_filter", user_existence_filter.stop())
+    await drain("password_hash_census", password_hash_census.stop())
+    await drain("reset_token_sweeper", reset_token_sweeper.stop())
+    await drain("email_dispatcher", email_dispatcher.stop()) # 발송 중인 묶음을 마친 뒤 SMTP 연결 종료
+    await drain("rehash_tasks", drain_rehash_tasks()) # 진행 중인 재해싱이 끝난 뒤 프로세스 풀 종료
+    await drain("password_hasher", asyncio.to_thread(password_hasher.shutdown))
+    database = app.state.database
+    await drain("database", database.dispose()) # 비동기/복제본/동기 커넥션 풀 정리
+    if current_database() is database:
+        set_database(None)
+    logger.info("shutdown complete")
+    shutdown_logging() # 큐에 남은 로그 출력 후 종료
+
+
+def _lifespan(settings: Settings):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await _startup(app, settings)
+        try:
+            yield
+        finally:
+            await _shutdown(app, settings)
+    return lifespan
+
+
+# ----------------------------------------------------
+# 2. 미들웨어
+# ----------------------------------------------------
+# 요청 메트릭 미들웨어: 라우트별 요청 수, 지연 시간, 처리 중인 요청 수, 요청당 SQL 문 수
+async def metrics_middleware(request: Request, call_next):
+    method = request.method
+    HTTP_REQUESTS_IN_FLIGHT.inc(method=method)
+    started = time.perf_counter()
+    status_code = 500
+    with profile_queries(label=f"{method} {request.url.path}") as query_profile:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec(method=method)
+            route_path = route_label(request.scope)
+            HTTP_REQUESTS_TOTAL.inc(method=method, route=route_path, status=status_code)
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route_path)
+    settings = request_settings(request)
+    # QUERY_BUDGET_STRICT=true 이면 예산 초과 시 예외 발생
+    finish_request_profile(query_profile, route_path, settings.query_budget_per_request, settings.query_budget_strict)
+    if settings.log_requests:
+        logger.info(
+            "request",
+            extra={"method": method, "route": route_path, "status": status_code, "duration_ms": round(elapsed * 1000, 2)},
+        )
+    return response
+
+# 요청 ID 미들웨어: X-Request-ID 헤더를 받거나 새로 만들어 이 요청에서 남기는 모든 로그에 붙이고 응답 헤더로 돌려줍니다.
+# (나중에 등록한 미들웨어가 바깥쪽에서 실행되므로 메트릭 미들웨어의 로그에도 요청 ID 가 붙습니다)
+async def request_id_middleware(request: Request, call_next):
+    request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+# ----------------------------------------------------
+# 3. 전역 예외 핸들러
+# ----------------------------------------------------
+# 유효성 검사 오류
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors(), "body": exc.body},
     )
 
-# 전역 예외 핸들러: 데이터베이스 무결성 오류 (예: UNIQUE 제약 조건 위반)
-@app.exception_handler(IntegrityError)
+# 데이터베이스 무결성 오류 (예: UNIQUE 제약 조건 위반). 알려진 제약이면 해당 항목의 메시지로 응답합니다.
 async def integrity_error_handler(request: Request, exc: IntegrityError):
     return JSONResponse(
-        status_code=status.HTTP_409_CONFLICT, 
-        content={"detail": "Database integrity error. This might be due to duplicate entry or constraint violation."},
+        status_code=status.HTTP_409_CONFLICT,
+        content={
+            "detail": unique_violation_message(exc)
+            or "Database integrity error. This might be due to duplicate entry or constraint violation."
+        },
+    )
+
+# 조건부 GET 에서 클라이언트의 캐시가 최신인 경우 (본문 없이 검증자 헤더만)
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=exc.headers)
+
+# 비밀번호 해싱 대기열 포화 또는 시간 초과
+async def password_hasher_unavailable_handler(request: Request, exc: PasswordHasherUnavailableError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy. Please try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+# 요청 횟수 제한 초과
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests. Please try again later."},
+        headers={"Retry-After": str(exc.retry_after)},
     )
 
+
+# ----------------------------------------------------
+# 4. 기타 엔드포인트
+# ----------------------------------------------------
+# 🚨 추가된 부분: OPTIONS 메서드에 대한 전역 핸들러
+# Preflight 요청에 대해 200 OK 응답을 보내도록 강제합니다.
+async def options_handler(request: Request, path: str):
+    # CORS 미들웨어가 이미 헤더를 처리하므로, 여기서는 단순히 빈 200 응답을 반환합니다.
+    # 이렇게 하면 브라우저의 Preflight 요청이 성공적으로 완료됩니다.
+    return Response(status_code=status.HTTP_200_OK)
+
 # 루트 엔드포인트 (선택 사항)
-@app.get("/")
 async def read_root():
-    return {"message": "Welcome to the FastAPI User Authentication API!"}
\ No newline at end of file
+    return {"message": "Welcome to the FastAPI User Authentication API!"}
+
+
+# ----------------------------------------------------
+# 5. 앱 팩토리
+# ----------------------------------------------------
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    앱을 만들고 미들웨어/라우터/예외 핸들러를 등록합니다.
+    DB 엔진(settings 의 DATABASE_URL), 해싱 프로세스 풀, 백그라운드 작업은 lifespan 에서 워커 프로세스마다 시작하고 종료 시 정리합니다.
+    (실행: uvicorn --factory src.main:create_app 또는 아래의 모듈 변수 app)
+    """
+    settings = settings or get_settings()
+    setup_logging(settings) # print 대신 큐 기반 로깅 사용 (출력은 백그라운드 스레드에서 처리)
+
+    app = FastAPI(title="FastAPI User Authentication API", lifespan=_lifespan(settings))
+    app.state.settings = settings
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],  # 모든 HTTP 메서드 허용
+        allow_headers=["*"],  # 모든 헤더 허용
+    )
+    # 조건부 GET: ETag/Last-Modified 가 붙은 GET 응답은 클라이언트의 검증자와 일치하면 본문 없이 304 로 응답합니다.
+    app.add_middleware(ConditionalGetMiddleware)
+    app.middleware("http")(metrics_middleware)
+    app.middleware("http")(request_id_middleware)
+
+    # 라우터 등록
+    app.include_router(auth.router, prefix="/auth")
+    app.include_router(admin.router, prefix="/admin")
+    app.include_router(agent.router, prefix="/api/v1/agent") # 설치 파일은 인증 후 이 경로로만 내려받습니다. (기존 /downloads 정적 경로 제거)
+    app.include_router(dashboard.router, prefix="/api/dashboard")
+    app.include_router(health.router)
+    app.include_router(metrics.router)
+    app.options("/{path:path}")(options_handler)
+    app.get("/")(read_root)
+
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(IntegrityError, integrity_error_handler)
+    app.add_exception_handler(NotModified, not_modified_handler)
+    app.add_exception_handler(PasswordHasherUnavailableError, password_hasher_unavailable_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,188 @@
+# src/migrations.py
+#
+# create_all 은 없는 테이블만 만들고 기존 테이블에 컬럼을 추가하지 않으므로,
+# 이미 운영 중인 DB 에 필요한 변경은 여기에 순서대로 추가합니다. 각 단계는 여러 번 실행해도 안전해야 합니다.
+#
+# 시작할 때마다 create_all / 스키마 변경 확인(테이블·컬럼 조회)을 하지 않도록, 모델 정의와 변경 단계로 만든
+# 지문(fingerprint)을 schema_version 테이블에 저장해 두고 지문이 같으면 DDL 확인을 건너뜁니다.
+
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def _add_users_updated_at(conn: Connection) -> bool:
+    """Users.updated_at 추가. 기존 행은 created_at 으로 채웁니다."""
+    columns = {column["name"] for column in inspect(conn).get_columns("Users")}
+    if "updated_at" in columns:
+        return False
+    if conn.dialect.name == "postgresql":
+        conn.execute(text('ALTER TABLE "Users" ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE'))
+        conn.execute(text('UPDATE "Users" SET updated_at = created_at'))
+        conn.execute(text(
+            'ALTER TABLE "Users" ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL'
+        ))
+    else:
+        # SQLite 는 상수가 아닌 기본값을 가진 컬럼을 ALTER TABLE 로 추가할 수 없습니다. (값은 ORM 이 넣음)
+        conn.execute(text('ALTER TABLE "Users" ADD COLUMN updated_at DATETIME'))
+        conn.execute(text('UPDATE "Users" SET updated_at = created_at'))
+    return True
+
+
+def _password_reset_tokens_one_per_user(conn: Connection) -> bool:
+    """
+    password_reset_tokens.user_id 에 UNIQUE 인덱스 추가 (발급 시 INSERT ... ON CONFLICT (user_id) 에 필요).
+    이전 코드가 남긴 사용자별 중복 토큰은 가장 최근 것만 남기고 지웁니다. expires_at 인덱스도 함께 만듭니다.
+    """
+    indexes = {index["name"]: index for index in inspect(conn).get_indexes("password_reset_tokens")}
+    user_id_index = indexes.get("ix_password_reset_tokens_user_id")
+    if user_id_index is not None and user_id_index["unique"]:
+        return False
+
+    conn.execute(text(
+        "DELETE FROM password_reset_tokens WHERE id IN ("
+        " SELECT id FROM ("
+        "  SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn"
+        "  FROM password_reset_tokens"
+        " ) ranked WHERE rn > 1"
+        ")"
+    ))
+    if user_id_index is not None:
+        conn.execute(text("DROP INDEX ix_password_reset_tokens_user_id"))
+    conn.execute(text("CREATE UNIQUE INDEX ix_password_reset_tokens_user_id ON password_reset_tokens (user_id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_password_reset_tokens_expires_at ON password_reset_tokens (expires_at)"
+    ))
+    return True
+
+
+def _password_reset_tokens_timestamptz(conn: Connection) -> bool:
+    """
+    PostgreSQL: expires_at / created_at 을 TIMESTAMP WITH TIME ZONE 으로 변경. 기존 값은 UTC 로 저장되어 있었습니다.
+    (SQLite 는 시간대 정보를 저장하지 않으므로 변경할 것이 없음)
+    """
+    if conn.dialect.name != "postgresql":
+        return False
+    columns = {column["name"]: column for column in inspect(conn).get_columns("password_reset_tokens")}
+    if getattr(columns["expires_at"]["type"], "timezone", False):
+        return False
+    conn.execute(text(
+        "ALTER TABLE password_reset_tokens"
+        " ALTER COLUMN expires_at TYPE TIMESTAMP WITH TIME ZONE USING expires_at AT TIME ZONE 'UTC',"
+        " ALTER COLUMN created_at TYPE TIMESTAMP WITH TIME ZONE USING created_at AT TIME ZONE 'UTC'"
+    ))
+    conn.execute(text("UPDATE password_reset_tokens SET created_at = now() WHERE created_at IS NULL"))
+    conn.execute(text(
+        "ALTER TABLE password_reset_tokens"
+        " ALTER COLUMN created_at SET DEFAULT now(), ALTER COLUMN created_at SET NOT NULL"
+    ))
+    return True
+
+
+def _users_list_indexes(conn: Connection) -> bool:
+    """
+    관리자 사용자 목록/검색 인덱스 (models.user 의 PostgreSQL 전용 인덱스).
+    PostgreSQL 은 기존 테이블에 없으면 만들고, 다른 DB 는 이전 create_all 이 만든 중복 인덱스를 지웁니다.
+    """
+    from .models.user import User # models 가 database 를 import 하므로 여기서 import
+
+    existing = {index["name"] for index in inspect(conn).get_indexes("Users")}
+    postgresql = conn.dialect.name == "postgresql"
+    changed = False
+    for index in User.__table__.indexes:
+        if index._ddl_if is None: # email/emp_number UNIQUE 인덱스 등 모든 DB 공통 인덱스
+            continue
+        # index.create()/drop() 는 ddl_if 조건을 다시 확인하므로 DDL 을 직접 실행합니다.
+        if postgresql and index.name not in existing:
+            conn.execute(CreateIndex(index))
+            changed = True
+        elif not postgresql and index.name in existing:
+            conn.execute(DropIndex(index))
+            changed = True
+    return changed
+
+
+SCHEMA_UPGRADES = [
+    ("users_updated_at", _add_users_updated_at),
+    ("password_reset_tokens_one_per_user", _password_reset_tokens_one_per_user),
+    ("password_reset_tokens_timestamptz", _password_reset_tokens_timestamptz),
+    ("users_list_indexes", _users_list_indexes),
+]
+
+
+def apply_schema_upgrades(engine: Engine) -> list[str]:
+    """적용이 필요한 단계만 실행하고, 실제로 적용한 단계 이름을 반환합니다."""
+    applied = []
+    with engine.begin() as conn:
+        for name, upgrade in SCHEMA_UPGRADES:
+            if upgrade(conn):
+                applied.append(name)
+                logger.info("스키마 변경 적용", extra={"upgrade": name})
+    return applied
+
+
+def schema_fingerprint(metadata: MetaData = Base.metadata) -> str:
+    """테이블/컬럼/인덱스 정의와 변경 단계 이름으로 만든 SHA-256. 모델이나 SCHEMA_UPGRADES 가 바뀌면 달라집니다."""
+    digest = hashlib.sha256()
+    for table in sorted(metadata.sorted_tables, key=lambda t: t.name):
+        digest.update(f"T:{table.name}\n".encode())
+        for column in table.columns:
+            digest.update(
+                f"C:{column.name}:{column.type!r}:{column.nullable}:{column.unique}:{column.primary_key}\n".encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(f"I:{index.name}:{index.unique}:{[c.name for c in index.columns]}\n".encode())
+    for name, _ in SCHEMA_UPGRADES:
+        digest.update(f"U:{name}\n".encode())
+    return digest.hexdigest()
+
+
+def _stored_fingerprint(engine: Engine) -> Optional[str]:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(schema_version.c.fingerprint).where(schema_version.c.id == 1)).scalar()
+    except DBAPIError: # 처음 실행하는 DB 에는 schema_version 테이블이 없습니다.
+        return None
+
+
+def ensure_schema(engine: Engine, skip_if_current: bool = True) -> dict:
+    """
+    저장된 지문이 현재 지문과 같으면 아무것도 하지 않고, 다르면 create_all 과 변경 단계를 실행한 뒤 지문을 저장합니다.
+    결과는 시작 로그용 dict 로 반환합니다.
+    """
+    fingerprint = schema_fingerprint()
+    if skip_if_current and _stored_fingerprint(engine) == fingerprint:
+        return {"schema": "current", "applied": []}
+
+    Base.metadata.create_all(bind=engine)
+    applied = apply_schema_upgrades(engine)
+    now = datetime.now(timezone.utc)
+    try:
+        with engine.begin() as conn:
+            updated = conn.execute(
+                schema_version.update().where(schema_version.c.id == 1).values(fingerprint=fingerprint, updated_at=now)
+            ).rowcount
+            if not updated:
+                conn.execute(schema_version.insert().values(id=1, fingerprint=fingerprint, updated_at=now))
+    except IntegrityError:
+        pass # 여러 워커가 동시에 시작하여 다른 워커가 먼저 저장함
+    logger.info("스키마 지문 저장", extra={"fingerprint": fingerprint[:12], "applied": applied})
+    return {"schema": "updated", "applied": applied}
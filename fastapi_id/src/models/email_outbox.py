@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, func
+import uuid
+
+from ..database import Base
+
+# 발송 상태 값
+OUTBOX_PENDING = "pending"   # 발송 대기 (재시도 대기 포함)
+OUTBOX_SENDING = "sending"   # 디스패처가 가져가서 발송 중
+OUTBOX_SENT = "sent"         # 발송 완료
+OUTBOX_FAILED = "failed"     # 최대 재시도 횟수 초과
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+
+    status = Column(String(20), nullable=False, default=OUTBOX_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    # 다음 발송 시도 가능 시각. 'sending' 상태에서는 디스패처의 점유 만료 시각으로 사용됩니다.
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
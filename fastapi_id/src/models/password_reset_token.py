@@ -1,7 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 import uuid
-from datetime import datetime
 
 from ..database import Base
 
@@ -11,7 +10,14 @@ class PasswordResetToken(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))  # ← UUID 대신 문자열로 저장
     user_id = Column(String(50), ForeignKey("Users.user_id"), nullable=False)
     token = Column(String, unique=True, index=True, nullable=False)
-    expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user = relationship("User", back_populates="reset_tokens")
+
+    __table_args__ = (
+        # 사용자당 토큰은 하나만 유지합니다. (발급 시 INSERT ... ON CONFLICT (user_id) DO UPDATE)
+        Index("ix_password_reset_tokens_user_id", "user_id", unique=True),
+        # 만료 토큰 정리(sweeper)용
+        Index("ix_password_reset_tokens_expires_at", "expires_at"),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
+
+from ..database import Base
+
+class RevokedToken(Base):
+    """로그아웃/탈퇴로 폐기된 JWT (jti) 목록. 각 워커는 seq 순서대로 새 행을 읽어 메모리 목록을 갱신합니다."""
+    __tablename__ = "revoked_tokens"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True) # 워커 간 동기화 기준 (이 값보다 큰 행만 읽음)
+    jti = Column(String(64), nullable=False, unique=True)
+    user_id = Column(String(50), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False) # 토큰 exp. 지난 행은 정리(compaction) 대상
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
@@ -1,10 +1,11 @@
 # src/models/user.py
 
-from sqlalchemy import Column, String, DateTime, Boolean, func
+from sqlalchemy import Column, String, DateTime, Boolean, Index, func
 from sqlalchemy.orm import relationship # relationship 임포트 추가
 from ..database import Base
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
+from datetime import datetime, timezone
 
 class User(Base):
     __tablename__ = "Users"
@@ -18,10 +19,37 @@ class User(Base):
     
     is_deleted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 행이 바뀔 때마다 갱신 (ORM/Core UPDATE 모두). /auth/mypage 의 ETag / Last-Modified 에 사용
+    # 같은 초 안의 변경도 구분되도록 DB 의 now() 대신 마이크로초까지 있는 파이썬 시각을 넣습니다.
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
 
     # PasswordResetToken과의 관계 설정
     reset_tokens = relationship("PasswordResetToken", back_populates="user") # 'user'는 PasswordResetToken에서 정의될 이름
 
+    # 관리자 사용자 목록/검색용 인덱스는 PostgreSQL(운영 DB)에서만 만듭니다. (기존 DB 는 migrations 의 users_list_indexes 단계)
+    # 다른 DB 에서는 email/emp_number 의 UNIQUE 인덱스와 겹치고, SQLite 의 LIKE 는 일반 인덱스를 쓰지 않습니다.
+    __table_args__ = (
+        # 관리자 사용자 목록: (created_at, user_id) 키셋 페이지네이션 (is_deleted 필터 포함)
+        Index("ix_users_created_at_user_id", "created_at", "user_id").ddl_if(dialect="postgresql"),
+        Index("ix_users_is_deleted_created_at_user_id", "is_deleted", "created_at", "user_id").ddl_if(dialect="postgresql"),
+        # 접두어 검색 (LIKE 'abc%'). 로케일과 무관하게 인덱스를 쓰도록 pattern_ops 사용
+        Index("ix_users_name_prefix", "name", postgresql_ops={"name": "varchar_pattern_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_email_prefix", "email", postgresql_ops={"email": "varchar_pattern_ops"}).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_emp_number_prefix", "emp_number", postgresql_ops={"emp_number": "varchar_pattern_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    # flush 때 서버 기본값(created_at 등)을 INSERT ... RETURNING 으로 함께 받아옵니다. (커밋 후 refresh 조회 없이 응답 생성)
+    # RETURNING 을 지원하지 않는 DB 에서는 flush 직후 한 번 조회합니다.
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return (
             f"<User(user_id={self.user_id}, emp_number='{self.emp_number}', name='{self.name}', "
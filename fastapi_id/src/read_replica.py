@@ -0,0 +1,197 @@
+# src/read_replica.py
+#
+# 읽기 복제본 라우팅 (선택). DATABASE_REPLICA_URLS 를 설정하면 get_read_db 세션의 조회는 복제본으로,
+# 쓰기(INSERT/UPDATE/DELETE, flush, SELECT ... FOR UPDATE)와 그 이후의 조회는 주 DB 로 보냅니다.
+# 복제본 연결에 실패하면 해당 복제본을 DB_REPLICA_RETRY_SECONDS 동안 제외하고 같은 조회를 주 DB 에서 다시 실행합니다.
+# 복제본을 설정하지 않으면 get_read_db 는 get_async_db 와 같습니다.
+
+import logging
+import threading
+import time
+from typing import AsyncGenerator, Optional
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .database import Database, pool_options, request_database, to_async_database_url
+from .utils.db_pool_monitor import PoolStats, attach_pool_events
+from .utils.query_profiler import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# 세션 info 키: 주 DB 고정 여부 / 이 세션이 사용 중인 복제본
+_USE_PRIMARY = "read_replica_use_primary"
+_REPLICA = "read_replica_engine"
+
+# 복제본 연결 실패로 보는 오류 (잘못된 쿼리 등은 주 DB 에서도 실패하므로 다시 시도하지 않음)
+_CONNECTION_ERRORS = (OperationalError, InterfaceError, OSError)
+
+
+def _async_url(url: str) -> str:
+    # 동기 드라이버 URL 을 넣어도 되도록 DATABASE_URL 과 같은 규칙으로 변환합니다.
+    return url if make_url(url).get_dialect().is_async else to_async_database_url(url)
+
+
+class ReplicaRouter:
+    """
+    정상 복제본을 돌아가며 고르고, 연결에 실패한 복제본은 잠시 제외합니다.
+    이 워커에서 방금 변경한 사용자는 복제 지연 동안 주 DB 에서 읽도록 표시해 둡니다.
+    """
+
+    def __init__(self):
+        self.engines: list[AsyncEngine] = []
+        self.retry_seconds = 30.0
+        self.read_after_write_seconds = 5.0
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until: dict[int, float] = {} # 복제본 인덱스 → 다시 사용할 시각 (monotonic)
+        self._pinned: dict[str, float] = {} # 사용자 ID → 주 DB 고정 만료 시각 (monotonic)
+        self.replica_reads = 0
+        self.unavailable = 0 # 모든 복제본이 제외되어 주 DB 에서 조회한 횟수
+        self.fallbacks = 0
+
+    def configure(self, engines: list[AsyncEngine], retry_seconds: float, read_after_write_seconds: float) -> None:
+        """앱의 DB 를 열 때 복제본 목록을 바꿉니다. (제외/고정 상태는 새 목록 기준으로 초기화)"""
+        with self._lock:
+            self.engines = engines
+            self.retry_seconds = retry_seconds
+            self.read_after_write_seconds = read_after_write_seconds
+            self._next = 0
+            self._down_until.clear()
+            self._pinned.clear()
+
+    def pick(self) -> Optional[AsyncEngine]:
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = self._next % len(self.engines)
+                self._next += 1
+                if self._down_until.get(index, 0.0) <= now:
+                    self.replica_reads += 1
+                    return self.engines[index]
+            self.unavailable += 1
+            return None
+
+    def mark_failed(self, replica: AsyncEngine, error: BaseException) -> None:
+        index = self.engines.index(replica)
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+            self.fallbacks += 1
+        logger.warning(
+            "복제본 연결 실패, 주 DB 로 전환",
+            extra={"replica": index, "retry_seconds": self.retry_seconds, "error": str(error)},
+        )
+
+    def pin_primary(self, user_id: str) -> None:
+        """사용자 행을 변경한 직후 호출합니다. 복제 지연 동안 이 사용자의 인증 조회는 주 DB 에서 합니다."""
+        if not self.engines:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pinned) >= 10000:
+                self._pinned = {key: until for key, until in self._pinned.items() if until > now}
+            self._pinned[str(user_id)] = now + self.read_after_write_seconds
+
+    def is_pinned(self, user_id: str) -> bool:
+        until = self._pinned.get(str(user_id))
+        return until is not None and until > time.monotonic()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "replicas": len(self.engines),
+            "replicas_down": sum(1 for until in self._down_until.values() if until > now),
+            "replica_reads": self.replica_reads,
+            "unavailable": self.unavailable,
+            "fallbacks": self.fallbacks,
+            "pinned_users": sum(1 for until in self._pinned.values() if until > now),
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+def _is_write(clause) -> bool:
+    return clause is not None and (
+        getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+    )
+
+
+class RoutingSession(Session):
+    """조회는 복제본, 쓰기와 쓰기 이후의 조회는 주 DB 로 보내는 세션 (AsyncSession 내부에서 사용)"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        # self.bind: 세션 팩토리에 지정한 주 DB 엔진
+        if self.info.get(_USE_PRIMARY) or self._flushing or _is_write(clause):
+            self.info[_USE_PRIMARY] = True # 같은 세션에서 자신이 쓴 내용을 읽을 수 있도록 이후 조회도 주 DB 로
+            return self.bind
+        replica = self.info.get(_REPLICA) or replica_router.pick()
+        if replica is None:
+            return self.bind
+        self.info[_REPLICA] = replica # 한 세션 안에서는 같은 복제본을 사용
+        return replica.sync_engine
+
+
+class RoutingAsyncSession(AsyncSession):
+    async def execute(self, statement, *args, **kwargs):
+        try:
+            return await super().execute(statement, *args, **kwargs)
+        except _CONNECTION_ERRORS as e:
+            replica = self.sync_session.info.get(_REPLICA)
+            if replica is None or self.sync_session.info.get(_USE_PRIMARY):
+                raise
+            replica_router.mark_failed(replica, e)
+            await read_from_primary(self)
+            return await super().execute(statement, *args, **kwargs)
+
+
+def attach_replicas(database: Database) -> None:
+    """DATABASE_REPLICA_URLS 의 복제본 엔진을 만들고, 조회 전용 세션이 복제본으로 라우팅되도록 설정합니다."""
+    settings = database.settings
+    for index, url in enumerate(settings.database_replica_urls):
+        stats = PoolStats(f"replica{index}", settings.db_pool_size, settings.db_max_overflow)
+        replica_engine = create_async_engine(
+            _async_url(url),
+            pool_pre_ping=True,
+            **pool_options(_async_url(url), AsyncAdaptedQueuePool, stats, settings),
+        )
+        attach_pool_events(replica_engine.sync_engine, stats)
+        instrument_engine(replica_engine.sync_engine, f"replica{index}", settings.slow_query_ms)
+        database.replica_pool_stats.append(stats)
+        database.replica_engines.append(replica_engine)
+
+    replica_router.configure(
+        database.replica_engines, settings.db_replica_retry_seconds, settings.db_read_after_write_seconds
+    )
+    if database.replica_engines:
+        database.ReadSessionLocal = async_sessionmaker(
+            bind=database.async_engine,
+            class_=RoutingAsyncSession,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+
+async def read_from_primary(db: AsyncSession) -> bool:
+    """
+    복제본에서 읽던 세션을 주 DB 로 전환합니다. 복제 지연으로 방금 쓴 행이 보이지 않을 때 다시 조회하기 위해 사용하며,
+    복제본 트랜잭션을 롤백하므로 이전에 읽은 객체는 만료됩니다. 실제로 전환했으면 True (다시 조회할 의미가 있음)
+    """
+    info = db.sync_session.info
+    if info.get(_USE_PRIMARY) or info.get(_REPLICA) is None:
+        return False
+    await db.rollback()
+    info.pop(_REPLICA, None)
+    info[_USE_PRIMARY] = True
+    return True
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """조회 전용 경로(인증, 로그인 조회, 목록)에 사용하는 세션. 쓰기가 필요한 경로는 UnitOfWork 를 사용합니다."""
+    async with request_database(request).ReadSessionLocal() as db:
+        yield db
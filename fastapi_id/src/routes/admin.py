@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from typing import Annotated, Literal, Optional
+
+from ..config import Settings, request_settings
+from ..database import get_async_db
+from ..read_replica import get_read_db
+from ..schemas.user import UserImportReport, UserListResponse, UserResponse
+from ..services import email_outbox_service, user_export_service, user_import_service, user_service
+from ..utils.auth import require_admin
+
+# 모든 관리자 API 는 ADMIN_EMP_NUMBERS 에 등록된 사번으로 로그인한 사용자만 호출할 수 있습니다.
+router = APIRouter(tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _import_format(request: Request, format: Optional[str]) -> str:
+    if format:
+        return format
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return "jsonl"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Specify ?format=csv|jsonl or send Content-Type text/csv or application/x-ndjson",
+    )
+
+
+# ----------------------------------------------------
+# 1. 사용자 대량 등록 (POST /admin/users/import)
+# ----------------------------------------------------
+# 요청 본문(CSV 또는 JSONL)을 스트리밍으로 읽으며 배치 단위로 등록하고, 행별 결과를 반환합니다.
+# 예) curl -X POST "http://localhost:8000/admin/users/import?format=csv" \
+#         -H "Authorization: Bearer <token>" -H "Content-Type: text/csv" --data-binary @users.csv
+@router.post("/users/import", response_model=UserImportReport)
+async def import_users(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    settings: Annotated[Settings, Depends(request_settings)],
+    format: Optional[str] = None,
+):
+    fmt = _import_format(request, format)
+    try:
+        return await user_import_service.import_users(
+            db,
+            user_import_service.aiter_lines(request.stream()),
+            fmt,
+            batch_size=settings.user_import_batch_size,
+            max_rows=settings.user_import_max_rows,
+        )
+    except user_import_service.UserImportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ----------------------------------------------------
+# 2. 사용자 목록 / 검색 (GET /admin/users)
+# ----------------------------------------------------
+# 최근 가입 순으로 반환하며, 응답의 next_cursor 를 다음 요청의 cursor 로 넘겨 다음 페이지를 조회합니다.
+# 검색은 접두어 일치입니다. (예: ?name=홍 → '홍'으로 시작하는 이름)
+@router.get("/users", response_model=UserListResponse)
+async def list_users(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None,
+    is_deleted: Optional[bool] = None,
+    name: Annotated[Optional[str], Query(min_length=1, max_length=100)] = None,
+    email: Annotated[Optional[str], Query(min_length=1, max_length=255)] = None,
+    emp_number: Annotated[Optional[str], Query(min_length=1, max_length=20)] = None,
+):
+    try:
+        users, next_cursor = await user_service.list_users_async(
+            db,
+            limit=limit,
+            cursor=cursor,
+            is_deleted=is_deleted,
+            name_prefix=name,
+            email_prefix=email,
+            emp_number_prefix=emp_number,
+        )
+    except user_service.InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UserListResponse(items=[UserResponse.model_validate(u) for u in users], next_cursor=next_cursor)
+
+
+# ----------------------------------------------------
+# 3. 사용자 전체 내보내기 (GET /admin/users/export)
+# ----------------------------------------------------
+# 서버 측 커서로 읽으며 바로 스트리밍하므로 테이블 크기와 무관하게 메모리 사용량이 일정합니다.
+# 예) curl -H "Authorization: Bearer <token>" "http://localhost:8000/admin/users/export?format=csv&gzip=true" -o users.csv.gz
+@router.get("/users/export")
+async def export_users(
+    settings: Annotated[Settings, Depends(request_settings)],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    is_deleted: Optional[bool] = None,
+):
+    filename = f"users-{datetime.now(timezone.utc):%Y%m%d%H%M%S}.{format}"
+    media_type = user_export_service.EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        user_export_service.export_users(format, settings.user_export_yield_per, is_deleted=is_deleted, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ----------------------------------------------------
+# 4. 이메일 발송 대기열 상태 (GET /admin/email-outbox)
+# ----------------------------------------------------
+# 상태별 메시지 수를 반환합니다. pending/failed 가 계속 늘어나면 SMTP 설정이나 디스패처 상태(/metrics 의 email_dispatcher_*)를 확인합니다.
+@router.get("/email-outbox")
+async def email_outbox_status(db: Annotated[AsyncSession, Depends(get_read_db)]) -> dict:
+    return await email_outbox_service.get_outbox_status_counts_async(db)
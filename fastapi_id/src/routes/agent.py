@@ -0,0 +1,139 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from mimetypes import guess_type
+from typing import Annotated
+
+from ..config import Settings, request_settings
+from ..read_replica import get_read_db, read_from_primary
+from ..schemas.agent import AgentDownloadUrlResponse
+from ..services.agent_download_service import (
+    AGENT_DOWNLOADS_TOTAL,
+    AgentArtifact,
+    agent_artifact_store,
+    download_urls_enabled,
+    is_not_modified,
+    sign_download,
+    verify_download_signature,
+)
+from ..services import user_service
+from ..utils.auth import AuthenticatedUser, get_current_user
+
+router = APIRouter(tags=["agent"])
+
+
+def _download_response(request: Request, settings: Settings, artifact: AgentArtifact) -> Response:
+    """
+    조건부 GET(304)은 여기서 처리하고, 나머지는 FileResponse 에 맡깁니다.
+    FileResponse 는 Range/If-Range(이어받기), HEAD 를 처리하며 서버가 지원하면 http.response.pathsend 로 파일을 직접 전송합니다.
+    """
+    headers = {
+        "ETag": artifact.etag,
+        "Last-Modified": artifact.last_modified,
+        "Cache-Control": "private, no-cache", # 캐시는 하되 매번 ETag 로 재검증
+        "Vary": "Accept-Encoding",
+    }
+    if artifact.encoding is not None:
+        headers["Content-Encoding"] = artifact.encoding
+
+    if is_not_modified(artifact, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        AGENT_DOWNLOADS_TOTAL.inc(result="not_modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    filename = settings.agent_download_file
+    media_type = guess_type(filename)[0] or "application/octet-stream"
+    accel_prefix = settings.agent_download_accel_redirect_prefix
+    if accel_prefix:
+        # 인증만 여기서 하고 파일 전송(sendfile, Range 처리)은 nginx 가 담당하므로 워커가 바로 반환됩니다.
+        AGENT_DOWNLOADS_TOTAL.inc(result="accel_redirect")
+        headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + artifact.path.rsplit("/", 1)[-1]
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return Response(headers=headers, media_type=media_type)
+
+    AGENT_DOWNLOADS_TOTAL.inc(result="partial" if "range" in request.headers else "full")
+    return FileResponse(
+        artifact.path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=artifact.stat_result, # 이미 stat 한 결과를 넘겨 다시 조회하지 않음
+    )
+
+
+async def _resolve_artifact(request: Request, settings: Settings) -> AgentArtifact:
+    artifact = await agent_artifact_store.resolve(
+        settings.agent_download_dir, settings.agent_download_file, request.headers.get("accept-encoding")
+    )
+    if artifact is None:
+        AGENT_DOWNLOADS_TOTAL.inc(result="missing")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent installer is not available")
+    return artifact
+
+
+async def _is_active_user(db: AsyncSession, user_id: str) -> bool:
+    """서명된 URL 을 발급받은 뒤 탈퇴한 (또는 없는) 사용자의 URL 은 만료 전이라도 사용할 수 없습니다."""
+    user = await user_service.get_user_by_id_async(db, user_id)
+    # 복제 지연 대비: 복제본에 아직 없는 사용자 (방금 가입) 는 주 DB 에서 다시 조회
+    if user is None and await read_from_primary(db):
+        user = await user_service.get_user_by_id_async(db, user_id)
+    return user is not None and not user.is_deleted
+
+
+# ----------------------------------------------------
+# 1. 에이전트 다운로드 (GET /api/v1/agent/download)
+# ----------------------------------------------------
+# Authorization 헤더의 토큰을 한 번 확인한 뒤 설치 파일을 전송합니다.
+# 예) curl -H "Authorization: Bearer <token>" -H "Range: bytes=1048576-" -o agent.part http://localhost:8000/api/v1/agent/download
+@router.api_route("/download", methods=["GET", "HEAD"])
+async def download_agent(
+    request: Request,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    settings: Annotated[Settings, Depends(request_settings)],
+):
+    return _download_response(request, settings, await _resolve_artifact(request, settings))
+
+
+# ----------------------------------------------------
+# 2. 서명된 다운로드 URL 발급 (POST /api/v1/agent/download-url)
+# ----------------------------------------------------
+# 많은 에이전트가 설치 파일을 받을 때 토큰 검증 없이 URL 만으로 내려받을 수 있도록 짧은 유효 시간의 URL 을 발급합니다.
+# 서명 키(AGENT_DOWNLOAD_URL_SECRET 또는 SECRET_KEY)가 없으면 발급과 서명된 다운로드 모두 503 입니다.
+async def require_download_url_secret(settings: Annotated[Settings, Depends(request_settings)]) -> None:
+    if not download_urls_enabled(settings.agent_download_url_secret):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Signed download URLs are not configured")
+
+
+@router.post("/download-url", response_model=AgentDownloadUrlResponse, dependencies=[Depends(require_download_url_secret)])
+async def create_agent_download_url(
+    request: Request,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    settings: Annotated[Settings, Depends(request_settings)],
+):
+    expires, sig = sign_download(settings, current_user.user_id)
+    url = request.url_for("download_agent_signed").include_query_params(uid=current_user.user_id, expires=expires, sig=sig)
+    return AgentDownloadUrlResponse(url=str(url), expires_at=datetime.fromtimestamp(expires, tz=timezone.utc))
+
+
+# ----------------------------------------------------
+# 3. 서명된 URL 로 다운로드 (GET /api/v1/agent/download/signed)
+# ----------------------------------------------------
+@router.api_route("/download/signed", methods=["GET", "HEAD"], dependencies=[Depends(require_download_url_secret)])
+async def download_agent_signed(
+    request: Request,
+    settings: Annotated[Settings, Depends(request_settings)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    uid: str,
+    expires: int,
+    sig: str,
+):
+    if not verify_download_signature(settings, uid, expires, sig):
+        AGENT_DOWNLOADS_TOTAL.inc(result="bad_signature")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link is invalid or expired")
+    # 서명 확인(메모리 연산)을 통과한 요청만 DB 를 조회합니다.
+    active = await _is_active_user(db, uid)
+    await db.close() # 파일을 전송하는 동안 DB 연결을 붙잡지 않도록 먼저 반환
+    if not active:
+        AGENT_DOWNLOADS_TOTAL.inc(result="inactive_user")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link is invalid or expired")
+    return _download_response(request, settings, await _resolve_artifact(request, settings))
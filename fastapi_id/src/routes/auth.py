@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta, datetime
 from typing import Annotated 
 
@@ -17,14 +17,22 @@ from ..schemas.user import (
 )
 from ..models.user import User 
 from ..utils.auth import (
-    get_password_hash,
-    verify_password,
+    verify_password_async,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     get_current_user, 
+    get_current_token_claims,
+    revoke_token,
+    AuthenticatedUser,
 )
-from ..database import get_db 
+from ..config import request_settings
+from ..database import UnitOfWork # 요청 단위 트랜잭션 (엔드포인트가 끝나면 한 번 커밋, 예외 시 롤백)
+from ..read_replica import get_read_db, read_from_primary, replica_router # 조회 전용 세션 (복제본 설정 시 복제본에서 조회)
+from ..utils.rate_limit import get_client_ip, rate_limiter, rate_limit_by_ip
+from ..utils.password_hasher import PasswordHasherUnavailableError
+from ..utils.conditional import check_not_modified, version_validators
 from ..services import user_service 
+from ..services.password_hash_service import schedule_rehash_if_needed # 오래된 해시를 백그라운드에서 교체
 
 router = APIRouter(tags=["authentication"])
 
@@ -32,42 +40,67 @@ router = APIRouter(tags=["authentication"])
 # 1. 회원가입 엔드포인트 (POST /auth/signup)
 # ----------------------------------------------------
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_create: UserCreate, db: Annotated[Session, Depends(get_db)]):
-    db_user = user_service.get_user_by_email(db, user_create.email)
-    if db_user:
+async def signup(user_create: UserCreate, db: UnitOfWork):
+    # 이메일/사번 중복을 한 번에 확인 (둘 다 존재 필터에서 "없음" 이면 조회 생략)
+    conflict = await user_service.find_signup_conflict_async(db, user_create.email, user_create.emp_number)
+    if conflict == "email":
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, 
             detail="Email already registered"
         )
-    
-    db_user_by_emp = user_service.get_user_by_emp_number(db, user_create.emp_number)
-    if db_user_by_emp:
+    if conflict == "emp_number":
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, 
             detail="Employee number already registered"
         )
 
-    new_user = user_service.create_user(db, user_create)
+    # 확인 이후 다른 요청이 같은 값을 먼저 등록했다면 IntegrityError 가 발생하고, 전역 핸들러가 제약 이름에 맞는 409 로 응답합니다.
+    new_user = await user_service.create_user_async(db, user_create)
     return UserResponse.model_validate(new_user)
 
 
 # ----------------------------------------------------
 # 2. 로그인 엔드포인트 (POST /auth/login)
 # ----------------------------------------------------
-@router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Annotated[Session, Depends(get_db)]):
-    user = user_service.get_user_by_emp_number(db, user_credentials.emp_number)
+# 요청 제한은 실패한 로그인만 셉니다. (같은 NAT 뒤의 여러 사용자가 정상 로그인해도 IP 한도를 소모하지 않음)
+# 비밀번호 확인 전에 자리를 먼저 차지하고 성공하면 돌려주므로, IP 또는 사번별 실패와 진행 중인 시도의 합이
+# RATE_LIMIT_LOGIN 에 이르면 (동시에 보낸 요청 포함) 비밀번호 확인 없이 429 를 반환합니다.
+# 사번과 비밀번호가 맞는 사용자를 반환합니다. (없거나 비밀번호가 틀리면 None)
+async def _authenticate_login(db: AsyncSession, user_credentials: UserLogin) -> User | None:
+    user = await user_service.get_user_by_emp_number_async(db, user_credentials.emp_number)
+    # 복제 지연 대비: 복제본에 아직 없거나 (방금 가입) 이 워커에서 방금 변경한 사용자는 주 DB 에서 다시 조회
+    if (user is None or replica_router.is_pinned(user.user_id)) and await read_from_primary(db):
+        user = await user_service.get_user_by_emp_number_async(db, user_credentials.emp_number)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="사번 또는 비밀번호가 올바르지 않습니다.", 
-        )
+        return None
 
-    if not verify_password(user_credentials.password, user.password_hash):
-        raise HTTPException(
+    if await verify_password_async(user_credentials.password, user.password_hash):
+        return user
+    # 다른 워커에서 방금 비밀번호를 바꿨다면 복제본의 해시가 오래되었을 수 있으므로 주 DB 의 해시로 한 번 더 확인
+    stale_hash = user.password_hash
+    if await read_from_primary(db):
+        user = await user_service.get_user_by_emp_number_async(db, user_credentials.emp_number)
+        if user is not None and user.password_hash != stale_hash:
+            if await verify_password_async(user_credentials.password, user.password_hash):
+                return user
+    return None
+
+
+@router.post("/login", response_model=Token)
+async def login(request: Request, user_credentials: UserLogin, db: Annotated[AsyncSession, Depends(get_read_db)]):
+    attempt = {"ip": get_client_ip(request), "emp_number": user_credentials.emp_number}
+    await rate_limiter.reserve("login", **attempt)
+    try:
+        user = await _authenticate_login(db, user_credentials)
+    except PasswordHasherUnavailableError:
+        await rate_limiter.refund("login", **attempt) # 과부하로 확인하지 못한 시도는 실패로 세지 않음
+        raise
+    if not user:
+        raise HTTPException( # 차지한 자리는 돌려주지 않고 실패로 남깁니다.
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사번 또는 비밀번호가 올바르지 않습니다.", 
         )
+    await rate_limiter.refund("login", **attempt)
     
     if user.is_deleted:
         raise HTTPException(
@@ -75,9 +108,12 @@ async def login(user_credentials: UserLogin, db: Annotated[Session, Depends(get_
             detail="Account is deactivated or deleted",
         )
 
+    schedule_rehash_if_needed(user.user_id, user_credentials.password, user.password_hash)
+
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.emp_number}, 
+        secret_key=request_settings(request).secret_key,
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -86,29 +122,53 @@ async def login(user_credentials: UserLogin, db: Annotated[Session, Depends(get_
 # ----------------------------------------------------
 # 3. 현재 사용자 정보 조회 엔드포인트 (GET /auth/me)
 # ----------------------------------------------------
+# 프로필이 바뀌지 않았으면 (ETag/Last-Modified 일치) 직렬화 없이 304 를 반환합니다.
 @router.get("/mypage", response_model=UserResponse)
-async def get_user_me(current_user: Annotated[User, Depends(get_current_user)]):
+async def get_user_me(
+    request: Request,
+    response: Response,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+):
+    validators = {
+        **version_validators(current_user.user_id, current_user.updated_at), # SQLite/PostgreSQL 모두 같은 UTC 기준 값
+        "Cache-Control": "private, no-cache", # 브라우저에 저장하되 매번 재검증
+        "Vary": "Authorization",
+    }
+    check_not_modified(request.headers, validators)
+    response.headers.update(validators)
     return UserResponse.model_validate(current_user)
 
 
 # ----------------------------------------------------
 # 4. 로그아웃 엔드포인트 (POST /auth/logout)
 # ----------------------------------------------------
+# 현재 토큰을 폐기하여 만료 전이라도 다시 사용할 수 없게 합니다.
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(current_user: Annotated[User, Depends(get_current_user)]):
+async def logout(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    claims: Annotated[dict, Depends(get_current_token_claims)],
+    db: UnitOfWork,
+):
+    await revoke_token(db, claims, current_user.user_id)
     return 
 
 
 # ----------------------------------------------------
 # 5. 회원 탈퇴 엔드포인트 (DELETE /auth/withdrawal)
 # ----------------------------------------------------
-@router.delete("/withdrawal", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/withdrawal",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit_by_ip("withdrawal"))],
+)
 async def withdraw_user(
     user_delete: UserDelete, 
-    current_user: Annotated[User, Depends(get_current_user)], 
-    db: Annotated[Session, Depends(get_db)] 
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)], 
+    claims: Annotated[dict, Depends(get_current_token_claims)],
+    db: UnitOfWork 
 ):
-    if not verify_password(user_delete.password, current_user.password_hash):
+    await rate_limiter.check("withdrawal", emp_number=current_user.emp_number)
+    if not await verify_password_async(user_delete.password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password",
@@ -120,18 +180,29 @@ async def withdraw_user(
             detail="Account is already deactivated",
         )
 
-    user_service.deactivate_user(db, current_user)
+    db_user = await user_service.get_user_by_id_async(db, current_user.user_id)
+    await user_service.deactivate_user_async(db, db_user)
+    # 현재 토큰은 즉시 폐기하고, 같은 사용자의 다른 토큰은 is_deleted 확인으로 거부됩니다. (인증 캐시는 커밋 후 무효화)
+    # 탈퇴 처리와 토큰 폐기는 요청이 끝날 때 한 번에 커밋됩니다.
+    await revoke_token(db, claims, current_user.user_id)
     return 
 
 # ----------------------------------------------------
 # 6. 비밀번호 재설정 요청 엔드포인트 (POST /auth/forgot_password)
 # ----------------------------------------------------
-@router.post("/forgot_password", response_model=PasswordResetResponse)
+@router.post(
+    "/forgot_password",
+    response_model=PasswordResetResponse,
+    dependencies=[Depends(rate_limit_by_ip("forgot_password"))],
+)
 async def forgot_password(
     request: ForgotPasswordRequest,
-    db: Annotated[Session, Depends(get_db)]
+    db: UnitOfWork
 ):
-    user = user_service.get_user_by_email(db, request.email)
+    await rate_limiter.check("forgot_password", email=request.email)
+    # 존재 필터는 워커별로 주기적으로 동기화되므로 다른 워커에서 방금 가입/변경한 이메일을 "없음" 으로 볼 수 있습니다.
+    # 재설정 메일이 누락되지 않도록 여기서는 필터를 쓰지 않고 항상 (인덱스) 조회합니다.
+    user = await user_service.get_user_by_email_async(db, request.email)
     if not user:
         return PasswordResetResponse(
             message="If an account with that email exists, a password reset link has been sent."
@@ -143,13 +214,8 @@ async def forgot_password(
             detail="Cannot reset password for a deactivated account."
         )
 
-    reset_token = password_reset_service.create_password_reset_token(db, user)
-    
-    if not reset_token:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send password reset email."
-        )
+    # 토큰 발급과 이메일 발송 대기열 등록만 하고, 실제 전송은 백그라운드에서 처리됩니다.
+    await password_reset_service.create_password_reset_token_async(db, user)
 
     return PasswordResetResponse(
         message="If an account with that email exists, a password reset link has been sent.",
@@ -163,16 +229,16 @@ async def forgot_password(
 @router.post("/reset_password", response_model=UserResponse)
 async def reset_password_confirm(
     request: ResetPasswordRequest,
-    db: Annotated[Session, Depends(get_db)]
+    db: UnitOfWork
 ):
-    user_to_reset = password_reset_service.verify_password_reset_token(db, request.token)
+    user_to_reset = await password_reset_service.verify_password_reset_token_async(db, request.token)
     if not user_to_reset:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired reset token."
         )
     
-    updated_user = password_reset_service.reset_password(db, user_to_reset, request.new_password)
+    updated_user = await password_reset_service.reset_password_async(db, user_to_reset, request.new_password)
 
     return UserResponse.model_validate(updated_user)
 
@@ -182,10 +248,10 @@ async def reset_password_confirm(
 @router.put("/change-password", response_model=UserResponse)
 async def change_password(
     password_change: PasswordChangeRequest, 
-    current_user: Annotated[User, Depends(get_current_user)], 
-    db: Annotated[Session, Depends(get_db)]
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)], 
+    db: UnitOfWork
 ):
-    if not verify_password(password_change.current_password, current_user.password_hash):
+    if not await verify_password_async(password_change.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="현재 비밀번호가 올바르지 않습니다.",
@@ -210,7 +276,7 @@ async def change_password(
             detail="새 비밀번호는 영문, 숫자, 특수문자를 포함하고 10자 이상이어야 합니다."
         )
 
-    updated_user = user_service.update_user_password(
+    updated_user = await user_service.update_user_password_async(
         db, user_id=current_user.user_id, new_password=password_change.new_password
     )
     
@@ -226,11 +292,16 @@ async def change_password(
 # ----------------------------------------------------
 # 9. 비밀번호 확인 엔드포인트 (POST /auth/verify-password)
 # ----------------------------------------------------
-@router.post("/verify-password", status_code=status.HTTP_200_OK)
+@router.post(
+    "/verify-password",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(rate_limit_by_ip("verify_password"))],
+)
 async def verify_user_password(
     payload: dict,
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
 ):
+    await rate_limiter.check("verify_password", emp_number=current_user.emp_number)
     password = payload.get("password")
     if not password:
         raise HTTPException(
@@ -238,10 +309,11 @@ async def verify_user_password(
             detail="비밀번호가 누락되었습니다."
         )
 
-    if not verify_password(password, current_user.password_hash):
+    if not await verify_password_async(password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="비밀번호가 일치하지 않습니다."
         )
 
+    schedule_rehash_if_needed(current_user.user_id, password, current_user.password_hash)
     return {"message": "비밀번호 확인 성공"}
\ No newline at end of file
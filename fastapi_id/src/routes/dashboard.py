@@ -0,0 +1,238 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Optional
+import anyio
+import hmac
+import json
+import time
+
+from ..config import Settings, request_settings
+from ..database import request_database
+from ..read_replica import get_read_db
+from ..schemas.dashboard import (
+    AttacksResponse,
+    IngestResponse,
+    LogCount24hResponse,
+    LogEntry,
+    LogStatsResponse,
+    SystemLogIn,
+    TopPortResponse,
+    TrafficFlowIn,
+    TrafficOverTimeResponse,
+    TrafficStatsResponse,
+)
+from ..services.dashboard_rollup_service import (
+    RECENT_ATTACKS,
+    RECENT_LOGS,
+    TOP_PORTS_MINUTE_BUCKETS,
+    TRAFFIC_SECOND_BUCKETS,
+    log_rollup,
+    traffic_rollup,
+)
+from ..services.dashboard_stream_service import dashboard_hub
+from ..services.token_revocation_service import token_revocation_store
+from ..utils.auth import AuthenticatedUser, authenticate_token, get_current_token_claims, get_current_user
+
+router = APIRouter(tags=["dashboard"])
+
+
+def _parse_topics(topics: Optional[str]) -> list[str]:
+    """쉼표로 구분된 토픽 목록 (없으면 전체). 알 수 없는 토픽이 있으면 400"""
+    if not topics:
+        return dashboard_hub.topic_names
+    names = [name.strip() for name in topics.split(",") if name.strip()]
+    unknown = set(names) - set(dashboard_hub.topic_names)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown topics: {', '.join(sorted(unknown))} (available: {', '.join(dashboard_hub.topic_names)})",
+        )
+    return names
+
+
+# 스트림은 연결할 때 한 번만 인증하므로, 연결할 때 확인한 토큰의 만료 시각(exp)과 jti 로
+# 이벤트/하트비트를 보낼 때마다 토큰이 만료되었거나 (로그아웃/탈퇴로) 폐기되었는지 확인하여 연결을 닫습니다.
+def _token_invalid(claims: dict) -> bool:
+    exp = claims.get("exp")
+    return (exp is not None and exp <= time.time()) or token_revocation_store.is_revoked(claims.get("jti"))
+
+
+def _next_wait_seconds(claims: dict, heartbeat_seconds: float) -> float:
+    # 만료 시각이 다음 하트비트보다 먼저 오면 그때 깨어나 연결을 닫습니다.
+    exp = claims.get("exp")
+    return heartbeat_seconds if exp is None else max(0.0, min(heartbeat_seconds, exp - time.time()))
+
+
+# ----------------------------------------------------
+# 1. 대시보드 SSE 스트림 (GET /api/dashboard/stream?topics=traffic,logs)
+# ----------------------------------------------------
+# 폴링 대신 연결 하나로 구독한 토픽의 스냅샷/변경분을 받습니다. 각 이벤트의 data 는
+# {"topic", "type": "snapshot"|"delta", "seq", "data"} JSON 이며, delta 의 data 는 {"changed": {...}, "removed": [...]} 입니다.
+@router.get("/stream")
+async def dashboard_stream(
+    request: Request,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    claims: Annotated[dict, Depends(get_current_token_claims)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    topics: Annotated[Optional[str], Query(description="쉼표로 구분된 토픽 (기본: 전체)")] = None,
+):
+    # 인증에 사용한 세션(get_current_user 와 같은 세션)의 DB 연결을 스트림이 열려 있는 동안 붙잡지 않도록 먼저 반환합니다.
+    await db.close()
+    # 보낼 이벤트가 없을 때 DASHBOARD_STREAM_HEARTBEAT_SECONDS 마다 하트비트 (프록시의 유휴 연결 종료 시간보다 짧아야 함)
+    heartbeat_seconds = request_settings(request).dashboard_stream_heartbeat_seconds
+    subscriber = dashboard_hub.subscribe(_parse_topics(topics))
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n" # 연결이 끊기면 3초 뒤 재연결
+            while not await request.is_disconnected():
+                event = await subscriber.next_event(_next_wait_seconds(claims, heartbeat_seconds))
+                if _token_invalid(claims):
+                    # 클라이언트는 이 이벤트를 받으면 재연결하지 말고 토큰을 갱신한 뒤 다시 연결합니다.
+                    yield 'event: auth_expired\ndata: {"type": "auth_expired"}\n\n'
+                    break
+                yield ": ping\n\n" if event is None else f"data: {event}\n\n"
+        finally:
+            dashboard_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}, # nginx 가 이벤트를 모아두지 않도록
+    )
+
+
+# ----------------------------------------------------
+# 2. 대시보드 WebSocket (WS /api/dashboard/ws?token=<access_token>)
+# ----------------------------------------------------
+# 브라우저 WebSocket 은 Authorization 헤더를 보낼 수 없으므로 토큰을 쿼리로 받습니다.
+# 연결 후 {"subscribe": ["system"]} / {"unsubscribe": ["system"]} 메시지로 구독 토픽을 바꿀 수 있습니다.
+@router.websocket("/ws")
+async def dashboard_ws(websocket: WebSocket, token: str = "", topics: Optional[str] = None):
+    settings = request_settings(websocket)
+    try:
+        async with request_database(websocket).ReadSessionLocal() as db:
+            claims, _ = await authenticate_token(token, db, settings.secret_key)
+        names = _parse_topics(topics)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    subscriber = dashboard_hub.subscribe(names)
+
+    async def send_events():
+        try:
+            while True:
+                event = await subscriber.next_event(_next_wait_seconds(claims, settings.dashboard_stream_heartbeat_seconds))
+                if _token_invalid(claims):
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired or revoked")
+                    break
+                await websocket.send_text(event if event is not None else '{"type": "ping"}')
+        except WebSocketDisconnect:
+            pass
+        task_group.cancel_scope.cancel()
+
+    async def receive_commands():
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                dashboard_hub.remove_topics(subscriber, message.get("unsubscribe") or [])
+                dashboard_hub.add_topics(subscriber, message.get("subscribe") or [])
+        except WebSocketDisconnect:
+            pass
+        task_group.cancel_scope.cancel() # 한쪽이 끝나면 (연결 종료) 다른 쪽도 멈춤
+
+    try:
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(send_events)
+            task_group.start_soon(receive_commands)
+    finally:
+        dashboard_hub.unsubscribe(subscriber)
+
+
+# ----------------------------------------------------
+# 3. 트래픽/로그 수집 (POST /api/dashboard/traffic/ingest, /api/dashboard/logs/ingest)
+# ----------------------------------------------------
+# 수집기가 흐름/로그를 배치로 보내면 메모리 집계(구간 카운터, 상위 포트 스케치)만 갱신합니다.
+# 수집기는 사용자 토큰 대신 X-Ingest-Token 헤더에 DASHBOARD_INGEST_TOKEN 값을 보냅니다. (설정하지 않으면 수집 API 는 503)
+# 집계는 워커 프로세스별이므로 수집기는 한 워커(또는 단일 워커로 실행한 수집용 인스턴스)로 보내야 합니다.
+
+
+async def require_ingest_token(
+    settings: Annotated[Settings, Depends(request_settings)],
+    x_ingest_token: Annotated[str, Header()] = "",
+) -> None:
+    if not settings.dashboard_ingest_token:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Ingest is not configured")
+    if not hmac.compare_digest(x_ingest_token, settings.dashboard_ingest_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ingest token")
+
+
+@router.post("/traffic/ingest", response_model=IngestResponse, dependencies=[Depends(require_ingest_token)])
+async def ingest_traffic(flows: list[TrafficFlowIn]):
+    return IngestResponse(accepted=traffic_rollup.ingest(flows))
+
+
+@router.post("/logs/ingest", response_model=IngestResponse, dependencies=[Depends(require_ingest_token)])
+async def ingest_logs(logs: list[SystemLogIn]):
+    return IngestResponse(accepted=log_rollup.ingest(logs))
+
+
+# ----------------------------------------------------
+# 4. 트래픽 조회 (GET /api/dashboard/traffic/...)
+# ----------------------------------------------------
+# 로그인한 사용자만 조회할 수 있습니다. (Authorization: Bearer <access_token>) 모두 메모리 집계에서 O(구간 수) 로 응답합니다.
+# 집계는 수집 요청을 받은 워커에만 있으므로 다중 워커에서는 수집기가 보내는 워커와 같은 워커에서 조회해야 합니다. (/readyz 의 dashboard_rollups 참고)
+@router.get(
+    "/traffic/traffic-over-time",
+    response_model=TrafficOverTimeResponse,
+    dependencies=[Depends(get_current_user)],
+)
+async def traffic_over_time(seconds: Annotated[int, Query(ge=1, le=TRAFFIC_SECOND_BUCKETS)] = 1):
+    return traffic_rollup.over_time(seconds)
+
+
+@router.get("/traffic/stats", response_model=TrafficStatsResponse, dependencies=[Depends(get_current_user)])
+async def traffic_stats():
+    return traffic_rollup.stats()
+
+
+@router.get("/traffic/top-ports", response_model=list[TopPortResponse], dependencies=[Depends(get_current_user)])
+async def traffic_top_ports(
+    minutes: Annotated[int, Query(ge=1, le=TOP_PORTS_MINUTE_BUCKETS)] = 5,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+):
+    return traffic_rollup.top_ports_in(minutes, limit)
+
+
+@router.get("/traffic/attacks", response_model=AttacksResponse, dependencies=[Depends(get_current_user)])
+async def traffic_attacks(limit: Annotated[int, Query(ge=1, le=RECENT_ATTACKS)] = RECENT_ATTACKS):
+    return traffic_rollup.recent_attacks(limit)
+
+
+# ----------------------------------------------------
+# 5. 로그 조회 (GET /api/dashboard/logs/...)
+# ----------------------------------------------------
+@router.get("/logs/stats", response_model=LogStatsResponse, dependencies=[Depends(get_current_user)])
+async def log_stats():
+    return log_rollup.stats()
+
+
+@router.get("/logs/count-24h", response_model=LogCount24hResponse, dependencies=[Depends(get_current_user)])
+async def log_count_24h():
+    return log_rollup.count_24h()
+
+
+@router.get("/logs/list", response_model=list[LogEntry], dependencies=[Depends(get_current_user)])
+async def log_list(
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=RECENT_LOGS)] = 100,
+):
+    return log_rollup.recent_logs(skip, limit)
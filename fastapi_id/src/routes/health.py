@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+import asyncio
+import os
+
+from ..config import request_settings
+from ..database import request_database
+
+router = APIRouter(tags=["health"])
+
+
+def _dashboard_rollups() -> dict:
+    # 대시보드 집계(/api/dashboard/traffic, /logs)는 워커 프로세스 메모리에만 있으므로
+    # 어느 워커가 응답했는지 알 수 있도록 pid 를 함께 보여줍니다. 수집과 조회는 같은 워커(단일 워커 인스턴스)로 보내야 합니다.
+    return {"scope": "per_worker", "pid": os.getpid()}
+
+
+# ----------------------------------------------------
+# 1. Liveness (GET /healthz) - 프로세스가 살아있는지만 확인
+# ----------------------------------------------------
+@router.get("/healthz")
+async def healthz(request: Request):
+    return {"status": "ok", "db_pool": request_database(request).pool_report()}
+
+
+# ----------------------------------------------------
+# 2. Readiness (GET /readyz) - 풀 포화 여부와 DB 연결 확인
+# ----------------------------------------------------
+@router.get("/readyz")
+async def readyz(request: Request):
+    database = request_database(request)
+    settings = request_settings(request)
+    report = database.pool_report()
+
+    # 풀이 포화 상태라면 DB 확인 쿼리도 풀을 기다리게 되므로 먼저 판단합니다.
+    # 비동기 풀 사용률이 DB_POOL_READY_MAX_SATURATION 이상이면 503 을 반환하여 로드밸런서가 트래픽을 다른 워커로 보내도록 합니다.
+    if database.async_pool_stats.saturation >= settings.db_pool_ready_max_saturation:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "saturated", "db_pool": report, "dashboard_rollups": _dashboard_rollups()},
+        )
+
+    try:
+        async def ping():
+            async with database.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await asyncio.wait_for(ping(), timeout=settings.readyz_db_timeout_seconds)
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "db_unavailable",
+                "error": str(e),
+                "db_pool": report,
+                "dashboard_rollups": _dashboard_rollups(),
+            },
+        )
+
+    return {"status": "ready", "db_pool": report, "dashboard_rollups": _dashboard_rollups()}
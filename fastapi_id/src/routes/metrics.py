@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..utils.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+# ----------------------------------------------------
+# Prometheus 스크랩 엔드포인트 (GET /metrics)
+# ----------------------------------------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,9 @@
+# src/schemas/agent.py
+
+from datetime import datetime
+from pydantic import BaseModel
+
+# 1. 서명된 에이전트 다운로드 URL 발급 응답
+class AgentDownloadUrlResponse(BaseModel):
+    url: str             # Authorization 헤더 없이 내려받을 수 있는 URL
+    expires_at: datetime # 이 시각 이후에는 403
@@ -0,0 +1,80 @@
+# src/schemas/dashboard.py
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+# --- 수집 (수집기 → 서버) ---
+
+# 1. 네트워크 흐름(flow) 한 건
+class TrafficFlowIn(BaseModel):
+    timestamp: Optional[datetime] = None # 없으면 수신 시각
+    src_ip: str
+    dst_port: int
+    protocol: int
+    packets: int = 0
+    bytes: int = 0
+    is_attack: bool = False
+    flow_pkts_per_s: float = 0
+    flow_byts_per_s: float = 0
+
+# 2. 시스템 탐지 로그 한 건
+class SystemLogIn(BaseModel):
+    detected_at: Optional[datetime] = None # 없으면 수신 시각
+    attack_type: Optional[str] = None # 공격이 아니면 None
+    source_address: Optional[str] = None
+    hostname: Optional[str] = None
+    process_name: Optional[str] = None
+
+class IngestResponse(BaseModel):
+    accepted: int
+
+# --- 조회 (프론트엔드 대시보드) ---
+
+class TrafficOverTimeResponse(BaseModel):
+    timestamps: list[datetime]
+    packets_per_second: list[float]
+    bytes_per_second: list[float]
+
+class TrafficStatsResponse(BaseModel):
+    total_packets: int
+    total_bytes: int
+    last_second_packets: int
+    last_second_bytes: int
+    latest_data_timestamp: Optional[datetime] = None
+
+class TopPortResponse(BaseModel):
+    port: int
+    count: int
+
+class AttackItem(BaseModel):
+    timestamp: datetime
+    src_ip: str
+    dst_port: int
+    protocol: int
+    flow_pkts_per_s: float
+    flow_byts_per_s: float
+
+class AttacksResponse(BaseModel):
+    attacks_list: list[AttackItem] # 최신 순
+    count_all_time: int
+
+class ThreatDistributionItem(BaseModel):
+    type: str
+    count: int
+
+class LogStatsResponse(BaseModel):
+    total_threats: int
+    top_threat_type: str # 탐지된 위협이 없으면 "-"
+    distribution: list[ThreatDistributionItem]
+    threat_type_count: int
+
+class LogCount24hResponse(BaseModel):
+    log_count_24h: int
+
+class LogEntry(BaseModel):
+    detected_at: datetime
+    attack_type: Optional[str] = None
+    source_address: Optional[str] = None
+    hostname: Optional[str] = None
+    process_name: Optional[str] = None
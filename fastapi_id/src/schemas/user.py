@@ -44,8 +44,7 @@ class UserResponse(BaseModel):
     phone: str
     created_at: datetime
     is_deleted: bool
-    # 만약 User 모델에 updated_at 컬럼이 있다면 추가하는 것이 좋습니다.
-    # updated_at: datetime
+    updated_at: datetime
     # 만약 User 모델에 last_password_change 컬럼이 있다면 추가하는 것이 좋습니다.
     # last_password_change: Optional[datetime] = None
 
@@ -71,4 +70,23 @@ class UserDelete(BaseModel):
 class PasswordChangeRequest(BaseModel):
     current_password: str # 현재 비밀번호
     new_password: str     # 새 비밀번호
-    confirm_password: str # 새 비밀번호 확인 (프론트엔드와 백엔드 모두에서 유효성 검사)
\ No newline at end of file
+    confirm_password: str # 새 비밀번호 확인 (프론트엔드와 백엔드 모두에서 유효성 검사)
+
+# 대량 등록(관리자) 결과: 행별 처리 결과
+class UserImportRowResult(BaseModel):
+    row: int # 데이터 행 번호 (1부터, CSV 헤더 제외)
+    status: str # created / invalid / duplicate_in_file / exists
+    emp_number: Optional[str] = None
+    detail: Optional[str] = None
+
+# 대량 등록(관리자) 결과 전체
+class UserImportReport(BaseModel):
+    total: int
+    created: int
+    skipped: int
+    results: list[UserImportRowResult]
+
+# 관리자 사용자 목록 응답 (키셋 페이지네이션)
+class UserListResponse(BaseModel):
+    items: list[UserResponse]
+    next_cursor: Optional[str] = None # 다음 페이지 요청 시 cursor 로 전달 (없으면 마지막 페이지)
@@ -0,0 +1,148 @@
+# src/services/agent_download_service.py
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from ..config import Settings
+from ..utils.conditional import http_date, validators_match
+from ..utils.metrics import registry
+
+# 설치 파일 위치(AGENT_DOWNLOAD_DIR, AGENT_DOWNLOAD_FILE), 서명 키와 URL 유효 시간은 앱 설정(Settings)에서 넘겨받습니다.
+
+# 미리 압축해 둔 파일 (<파일>.br, <파일>.gz) 을 선호 순서대로 확인합니다.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+DIGEST_CHUNK_BYTES = 1024 * 1024
+
+AGENT_DOWNLOADS_TOTAL = registry.counter(
+    "agent_downloads_total", "Agent installer download responses by result.", ("result",)
+)
+
+
+@dataclass(frozen=True)
+class AgentArtifact:
+    path: str
+    stat_result: os.stat_result
+    etag: str # 강한 ETag (파일 내용의 SHA-256)
+    encoding: Optional[str] # br / gzip / None(원본)
+
+    @property
+    def last_modified(self) -> str:
+        return http_date(datetime.fromtimestamp(self.stat_result.st_mtime, tz=timezone.utc))
+
+
+def _parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(DIGEST_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AgentArtifactStore:
+    """
+    설치 파일과 미리 압축된 변형을 찾아 강한 ETag 와 함께 반환합니다.
+    ETag 계산(SHA-256)은 (경로, 수정 시각, 크기) 가 바뀔 때만 스레드에서 한 번 수행하고 결과를 재사용하므로,
+    요청마다 드는 비용은 stat 호출뿐입니다. (경로별로 캐시하므로 앱마다 다른 디렉토리를 설정해도 함께 사용할 수 있습니다)
+    """
+
+    def __init__(self):
+        self._etags: dict[str, tuple[int, int, str]] = {} # 경로 → (mtime_ns, size, etag)
+        self._lock = asyncio.Lock()
+        self._digests_computed = 0
+
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat_result if os.path.isfile(path) else None
+
+    async def _etag(self, path: str, stat_result: os.stat_result) -> str:
+        cached = self._etags.get(path)
+        if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+            return cached[2]
+        async with self._lock: # 같은 파일을 여러 요청이 동시에 해싱하지 않도록
+            cached = self._etags.get(path)
+            if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+                return cached[2]
+            etag = f'"{await asyncio.to_thread(_sha256_file, path)}"'
+            self._etags[path] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+            self._digests_computed += 1
+            return etag
+
+    async def resolve(
+        self, directory: str, filename: str, accept_encoding: Optional[str] = None
+    ) -> Optional[AgentArtifact]:
+        """directory/filename 의 Accept-Encoding 에 맞는 변형(없으면 원본)을 반환합니다. 원본 파일이 없으면 None"""
+        base_path = os.path.join(directory, filename)
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if accepted.get(encoding, 0) > 0:
+                stat_result = self._stat(base_path + suffix)
+                if stat_result is not None:
+                    return AgentArtifact(base_path + suffix, stat_result, await self._etag(base_path + suffix, stat_result), encoding)
+        stat_result = self._stat(base_path)
+        if stat_result is None:
+            return None
+        return AgentArtifact(base_path, stat_result, await self._etag(base_path, stat_result), None)
+
+    def stats(self) -> dict:
+        return {"digests_computed": self._digests_computed, "cached_etags": len(self._etags)}
+
+
+def is_not_modified(artifact: AgentArtifact, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    return validators_match(artifact.etag, artifact.last_modified, if_none_match, if_modified_since)
+
+
+# ----------------------------------------------------
+# 서명된 다운로드 URL
+# ----------------------------------------------------
+def download_urls_enabled(secret: Optional[str]) -> bool:
+    """서명 키가 비어 있으면 누구나 서명을 만들 수 있으므로 서명된 URL 의 발급과 사용을 모두 막습니다."""
+    return bool(secret)
+
+
+def _signature(secret: str, filename: str, user_id: str, expires: int) -> str:
+    message = f"{filename}:{user_id}:{expires}".encode()
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def sign_download(settings: Settings, user_id: str) -> tuple[int, str]:
+    """(만료 시각 epoch 초, 서명) 을 반환합니다. URL 은 AGENT_DOWNLOAD_URL_TTL_SECONDS 동안 유효합니다."""
+    expires = int(time.time()) + settings.agent_download_url_ttl_seconds
+    return expires, _signature(settings.agent_download_url_secret or "", settings.agent_download_file, user_id, expires)
+
+
+def verify_download_signature(settings: Settings, user_id: str, expires: int, sig: str) -> bool:
+    secret = settings.agent_download_url_secret
+    if not download_urls_enabled(secret) or expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(secret, settings.agent_download_file, user_id, expires), sig)
+
+
+agent_artifact_store = AgentArtifactStore()
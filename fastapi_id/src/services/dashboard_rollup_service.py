@@ -0,0 +1,194 @@
+# src/services/dashboard_rollup_service.py
+
+import time
+from collections import Counter, deque
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from ..config import get_settings
+from ..schemas.dashboard import SystemLogIn, TrafficFlowIn
+from ..utils.rollups import RingCounter, WindowedTopK
+
+# 초 단위 트래픽 그래프에 보관하는 구간 수 (초)
+TRAFFIC_SECOND_BUCKETS = get_settings().dashboard_traffic_second_buckets
+# 상위 포트 집계: 분 단위 구간 수와 구간마다 추적하는 포트 수
+TOP_PORTS_MINUTE_BUCKETS = get_settings().dashboard_top_ports_minute_buckets
+TOP_PORTS_SKETCH_CAPACITY = get_settings().dashboard_top_ports_sketch_capacity
+# 메모리에 보관하는 최근 공격/로그 수
+RECENT_ATTACKS = get_settings().dashboard_recent_attacks
+RECENT_LOGS = get_settings().dashboard_recent_logs
+# 수집기 시계가 이만큼(초) 이상 앞선 값은 버립니다. 먼 미래 값이 구간 카운터의 최신 구간을 옮기면 이후의 정상 값이 모두 오래된 값으로 처리됩니다.
+DASHBOARD_MAX_CLOCK_SKEW_SECONDS = get_settings().dashboard_max_clock_skew_seconds
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    if value is None:
+        return time.time()
+    if value.tzinfo is None: # 시간대가 없으면 UTC 로 간주
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _is_future(epoch: float, now: float) -> bool:
+    return epoch > now + DASHBOARD_MAX_CLOCK_SKEW_SECONDS
+
+
+def _isoformat(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+class TrafficRollup:
+    """
+    네트워크 흐름을 받을 때마다 초/분 단위 구간 카운터와 포트 스케치를 갱신합니다.
+    조회는 원본 흐름을 다시 읽지 않고 구간만 합산하므로 O(구간 수) 입니다.
+    """
+
+    def __init__(self):
+        self.per_second = RingCounter(1, TRAFFIC_SECOND_BUCKETS, fields=2) # (패킷, 바이트)
+        self.top_ports = WindowedTopK(60, TOP_PORTS_MINUTE_BUCKETS, TOP_PORTS_SKETCH_CAPACITY)
+        self.attacks: deque[dict] = deque(maxlen=RECENT_ATTACKS)
+        self.total_packets = 0
+        self.total_bytes = 0
+        self.attack_count = 0
+        self.latest_timestamp: Optional[float] = None
+        self.flows_ingested = 0
+        self.flows_late = 0
+        self.flows_future = 0
+
+    def ingest(self, flows: Iterable[TrafficFlowIn]) -> int:
+        count = 0
+        now = time.time()
+        for flow in flows:
+            ts = _epoch(flow.timestamp)
+            if _is_future(ts, now):
+                self.flows_future += 1 # 수집기 시계 오류: 집계하지 않음
+                continue
+            if not self.per_second.add(ts, flow.packets, flow.bytes):
+                self.flows_late += 1 # 그래프 범위보다 오래된 흐름은 합계에만 반영
+            self.top_ports.add(ts, flow.dst_port)
+            self.total_packets += flow.packets
+            self.total_bytes += flow.bytes
+            if self.latest_timestamp is None or ts > self.latest_timestamp:
+                self.latest_timestamp = ts
+            if flow.is_attack:
+                self.attack_count += 1
+                self.attacks.appendleft({
+                    "timestamp": _isoformat(ts),
+                    "src_ip": flow.src_ip,
+                    "dst_port": flow.dst_port,
+                    "protocol": flow.protocol,
+                    "flow_pkts_per_s": flow.flow_pkts_per_s,
+                    "flow_byts_per_s": flow.flow_byts_per_s,
+                })
+            count += 1
+        self.flows_ingested += count
+        return count
+
+    def over_time(self, seconds: int = 1, now: Optional[float] = None) -> dict:
+        """최근 seconds 개의 완료된 초 구간 (진행 중인 현재 초는 값이 덜 쌓였으므로 제외)"""
+        series = self.per_second.series(now or time.time(), seconds, include_current=False)
+        return {
+            "timestamps": [_isoformat(start) for start, _ in series],
+            "packets_per_second": [values[0] for _, values in series],
+            "bytes_per_second": [values[1] for _, values in series],
+        }
+
+    def stats(self, now: Optional[float] = None) -> dict:
+        series = self.per_second.series(now or time.time(), 1, include_current=False)
+        last_packets, last_bytes = series[-1][1] if series else (0, 0)
+        return {
+            "total_packets": self.total_packets,
+            "total_bytes": self.total_bytes,
+            "last_second_packets": last_packets,
+            "last_second_bytes": last_bytes,
+            "latest_data_timestamp": _isoformat(self.latest_timestamp) if self.latest_timestamp is not None else None,
+        }
+
+    def top_ports_in(self, minutes: int = 5, limit: int = 10, now: Optional[float] = None) -> list[dict]:
+        return [
+            {"port": port, "count": int(count)}
+            for port, count in self.top_ports.top(now or time.time(), minutes, limit)
+        ]
+
+    def recent_attacks(self, limit: int = RECENT_ATTACKS) -> dict:
+        return {"attacks_list": list(islice(self.attacks, limit)), "count_all_time": self.attack_count}
+
+    def snapshot(self) -> dict:
+        """대시보드 스트림의 traffic 토픽 (프론트엔드가 3초마다 호출하던 네 API 의 응답을 한 번에)"""
+        now = time.time()
+        return {
+            "stats": self.stats(now),
+            "over_time": self.over_time(1, now),
+            "top_ports": self.top_ports_in(5, now=now),
+            "attacks": self.recent_attacks(),
+        }
+
+
+class LogRollup:
+    """탐지 로그를 받을 때마다 위협 유형별 누적 수와 분 단위 24시간 카운터를 갱신합니다."""
+
+    def __init__(self):
+        self.per_minute = RingCounter(60, MINUTES_PER_DAY + 1)
+        self.threats_by_type: Counter = Counter()
+        self.recent: deque[dict] = deque(maxlen=RECENT_LOGS)
+        self.logs_ingested = 0
+        self.logs_future = 0
+
+    def ingest(self, logs: Iterable[SystemLogIn]) -> int:
+        count = 0
+        now = time.time()
+        for log in logs:
+            ts = _epoch(log.detected_at)
+            if _is_future(ts, now):
+                self.logs_future += 1
+                continue
+            self.per_minute.add(ts, 1)
+            if log.attack_type:
+                self.threats_by_type[log.attack_type] += 1
+            self.recent.appendleft({
+                "detected_at": _isoformat(ts),
+                "attack_type": log.attack_type,
+                "source_address": log.source_address,
+                "hostname": log.hostname,
+                "process_name": log.process_name,
+            })
+            count += 1
+        self.logs_ingested += count
+        return count
+
+    def stats(self) -> dict:
+        distribution = [{"type": name, "count": count} for name, count in self.threats_by_type.most_common()]
+        return {
+            "total_threats": sum(self.threats_by_type.values()),
+            "top_threat_type": distribution[0]["type"] if distribution else "-",
+            "distribution": distribution,
+            "threat_type_count": len(distribution),
+        }
+
+    def count_24h(self, now: Optional[float] = None) -> dict:
+        # 현재 진행 중인 분을 포함하므로 24시간 + 최대 1분 범위입니다.
+        return {"log_count_24h": int(self.per_minute.total(now or time.time(), MINUTES_PER_DAY + 1)[0])}
+
+    def recent_logs(self, skip: int = 0, limit: int = 100) -> list[dict]:
+        return list(islice(self.recent, skip, skip + limit))
+
+    def snapshot(self) -> dict:
+        """대시보드 스트림의 logs 토픽"""
+        return {"stats": self.stats(), "count_24h": self.count_24h(), "recent": self.recent_logs(0, 100)}
+
+
+traffic_rollup = TrafficRollup()
+log_rollup = LogRollup()
+
+
+def rollup_stats() -> dict:
+    return {
+        "flows_ingested": traffic_rollup.flows_ingested,
+        "flows_late": traffic_rollup.flows_late,
+        "flows_future": traffic_rollup.flows_future,
+        "logs_ingested": log_rollup.logs_ingested,
+        "logs_future": log_rollup.logs_future,
+    }
@@ -0,0 +1,215 @@
+# src/services/dashboard_stream_service.py
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 토픽별 계산 주기를 확인하는 간격 (초). 토픽의 interval 은 이 값의 배수로 맞추는 것이 좋습니다.
+DASHBOARD_STREAM_TICK_SECONDS = get_settings().dashboard_stream_tick_seconds
+# 구독자별로 쌓아둘 수 있는 이벤트 수. 넘치면 밀린 변경분을 버리고 전체 스냅샷을 다시 보냅니다.
+DASHBOARD_STREAM_QUEUE_SIZE = get_settings().dashboard_stream_queue_size
+
+EVENT_SNAPSHOT = "snapshot"
+EVENT_DELTA = "delta"
+
+
+class _Topic:
+    def __init__(self, name: str, provider: Callable[[], Any], interval_seconds: float):
+        self.name = name
+        self.provider = provider
+        self.interval_seconds = interval_seconds
+        self.next_due = 0.0
+        self.seq = 0
+        self.snapshot: Optional[dict] = None
+        self.snapshot_event: Optional[str] = None # 마지막 스냅샷을 인코딩해 둔 것 (새 구독자/재동기화용)
+        self.subscribers: set["DashboardSubscriber"] = set()
+        self.computed = 0
+        self.last_compute_ms = 0.0
+
+
+def _encode(topic: str, event_type: str, seq: int, data: dict) -> str:
+    return json.dumps({"topic": topic, "type": event_type, "seq": seq, "data": data}, ensure_ascii=False, default=str)
+
+
+class DashboardSubscriber:
+    """
+    연결 하나(SSE 또는 WebSocket)의 구독 상태입니다. 허브가 인코딩된 이벤트 문자열을 큐에 넣고, 연결은 큐에서 꺼내 보내기만 합니다.
+    """
+
+    def __init__(self, hub: "DashboardHub", queue_size: int):
+        self.hub = hub
+        self.topics: set[str] = set()
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+    async def next_event(self, timeout: Optional[float] = None) -> Optional[str]:
+        """다음 이벤트를 기다립니다. timeout 안에 없으면 None (하트비트용)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _offer(self, event: str) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._resync()
+
+    def _resync(self) -> None:
+        # 느린 클라이언트: 밀린 변경분은 더 이상 의미가 없으므로 비우고 구독 중인 토픽의 최신 스냅샷만 남깁니다.
+        self.overflows += 1
+        self.hub._overflows += 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        for name in self.topics:
+            event = self.hub._topics[name].snapshot_event
+            if event is not None:
+                self.queue.put_nowait(event)
+
+
+class DashboardHub:
+    """
+    대시보드 데이터를 토픽별로 한 번만 계산하여 모든 구독자에게 나눠줍니다.
+    구독자가 있는 토픽만 주기마다 계산하며, 직전 스냅샷과 비교해 바뀐 최상위 키만 delta 이벤트로 보냅니다.
+    새 구독자와 큐가 넘친 구독자는 전체 스냅샷을 받습니다.
+    """
+
+    def __init__(self, tick_seconds: float = DASHBOARD_STREAM_TICK_SECONDS, queue_size: int = DASHBOARD_STREAM_QUEUE_SIZE):
+        self.tick_seconds = tick_seconds
+        self.queue_size = queue_size
+        self._topics: dict[str, _Topic] = {}
+        self._subscribers: set[DashboardSubscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._ticks = 0
+        self._events_published = 0
+        self._overflows = 0
+        self._errors = 0
+
+    # --- 토픽 ---
+    def register_topic(self, name: str, provider: Callable[[], Any], interval_seconds: float) -> None:
+        """provider 는 JSON 으로 바꿀 수 있는 dict 를 반환하는 함수 또는 코루틴 함수입니다."""
+        self._topics[name] = _Topic(name, provider, interval_seconds)
+
+    @property
+    def topic_names(self) -> list[str]:
+        return list(self._topics)
+
+    # --- 구독 ---
+    def subscribe(self, topics: Iterable[str]) -> DashboardSubscriber:
+        # 토픽 수보다 큐가 작으면 재동기화 스냅샷조차 넣을 수 없으므로 최소 크기를 보장합니다.
+        subscriber = DashboardSubscriber(self, max(self.queue_size, len(self._topics)))
+        self._subscribers.add(subscriber)
+        self.add_topics(subscriber, topics)
+        return subscriber
+
+    def add_topics(self, subscriber: DashboardSubscriber, topics: Iterable[str]) -> list[str]:
+        """알 수 없는 토픽 이름은 무시하고, 실제로 추가된 토픽을 반환합니다."""
+        added = []
+        for name in topics:
+            topic = self._topics.get(name)
+            if topic is None or name in subscriber.topics:
+                continue
+            if not topic.subscribers:
+                topic.next_due = 0.0 # 아무도 보지 않던 토픽은 오래된 값일 수 있으므로 다음 틱에 바로 계산
+            topic.subscribers.add(subscriber)
+            subscriber.topics.add(name)
+            if topic.snapshot_event is not None:
+                subscriber._offer(topic.snapshot_event)
+            added.append(name)
+        return added
+
+    def remove_topics(self, subscriber: DashboardSubscriber, topics: Iterable[str]) -> None:
+        for name in topics:
+            topic = self._topics.get(name)
+            if topic is not None:
+                topic.subscribers.discard(subscriber)
+            subscriber.topics.discard(name)
+
+    def unsubscribe(self, subscriber: DashboardSubscriber) -> None:
+        self.remove_topics(subscriber, list(subscriber.topics))
+        self._subscribers.discard(subscriber)
+
+    # --- 계산 / 배포 ---
+    async def _compute(self, topic: _Topic) -> None:
+        started = time.perf_counter()
+        snapshot = topic.provider()
+        if inspect.isawaitable(snapshot):
+            snapshot = await snapshot
+        topic.last_compute_ms = (time.perf_counter() - started) * 1000
+        topic.computed += 1
+        self.publish(topic.name, snapshot)
+
+    def publish(self, name: str, snapshot: dict) -> None:
+        """새 스냅샷을 저장하고 구독자에게 변경분(처음이면 전체)을 보냅니다. 이벤트는 토픽당 한 번만 인코딩합니다."""
+        topic = self._topics[name]
+        previous = topic.snapshot
+        topic.seq += 1
+        topic.snapshot = snapshot
+        topic.snapshot_event = _encode(name, EVENT_SNAPSHOT, topic.seq, snapshot)
+        if previous is None:
+            event = topic.snapshot_event
+        else:
+            changed = {key: value for key, value in snapshot.items() if previous.get(key) != value}
+            removed = [key for key in previous if key not in snapshot]
+            if not changed and not removed:
+                return
+            event = _encode(name, EVENT_DELTA, topic.seq, {"changed": changed, "removed": removed})
+        for subscriber in list(topic.subscribers):
+            subscriber._offer(event)
+        self._events_published += 1
+
+    async def tick_once(self) -> None:
+        now = time.monotonic()
+        self._ticks += 1
+        for topic in self._topics.values():
+            if not topic.subscribers or now < topic.next_due:
+                continue
+            topic.next_due = now + topic.interval_seconds
+            try:
+                await self._compute(topic)
+            except Exception:
+                self._errors += 1
+                logger.exception("대시보드 토픽 계산 중 오류", extra={"topic": topic.name})
+
+    # --- 백그라운드 작업 ---
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.tick_once()
+            await asyncio.sleep(self.tick_seconds)
+
+    def stats(self) -> dict:
+        stats = {
+            "subscribers": len(self._subscribers),
+            "topics": len(self._topics),
+            "ticks": self._ticks,
+            "events_published": self._events_published,
+            "overflows": self._overflows,
+            "errors": self._errors,
+        }
+        for topic in self._topics.values():
+            stats[f"{topic.name}_subscribers"] = len(topic.subscribers)
+            stats[f"{topic.name}_last_compute_ms"] = topic.last_compute_ms
+        return stats
+
+
+dashboard_hub = DashboardHub()
@@ -0,0 +1,236 @@
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+import asyncio
+import logging
+from ..config import Settings, get_settings
+
+from ..database import AsyncSessionLocal
+from ..models.email_outbox import (
+    EmailOutbox,
+    OUTBOX_PENDING,
+    OUTBOX_SENDING,
+    OUTBOX_SENT,
+    OUTBOX_FAILED,
+)
+from ..utils.email_sender import PersistentSMTPSender
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DISPATCH_BATCH_SIZE = get_settings().email_dispatch_batch_size # 한 번에 가져올 메시지 수
+EMAIL_DISPATCH_CONNECTIONS = get_settings().email_dispatch_connections # 동시에 유지할 SMTP 연결 수
+EMAIL_DISPATCH_POLL_SECONDS = get_settings().email_dispatch_poll_seconds # 새 메시지 확인 주기
+EMAIL_DISPATCH_LEASE_SECONDS = get_settings().email_dispatch_lease_seconds # 'sending' 점유 유지 시간
+EMAIL_MAX_ATTEMPTS = get_settings().email_max_attempts
+EMAIL_RETRY_BASE_SECONDS = get_settings().email_retry_base_seconds # 재시도 간격 (지수 백오프 시작값)
+EMAIL_RETRY_MAX_SECONDS = get_settings().email_retry_max_seconds
+
+
+# 1. 발송 대기열에 메시지 추가
+# 커밋은 호출자의 트랜잭션에서 수행하며, add() 는 I/O 가 없으므로 AsyncSession 에도 그대로 사용할 수 있습니다.
+# 커밋 후 email_dispatcher.notify() 를 호출하면 다음 폴링 주기를 기다리지 않고 바로 발송합니다.
+def enqueue_email(db: Session | AsyncSession, to_email: str, subject: str, body: str) -> EmailOutbox:
+    message = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    db.add(message)
+    return message
+
+# 2. 발송 상태 조회 (GET /admin/email-outbox)
+async def get_outbox_status_counts_async(db: AsyncSession) -> dict:
+    """상태별 메시지 개수를 반환합니다. (예: {"pending": 3, "sent": 120})"""
+    result = await db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status))
+    return {status: count for status, count in result.all()}
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = min(EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), EMAIL_RETRY_MAX_SECONDS)
+    return timedelta(seconds=seconds)
+
+
+# 3. 백그라운드 디스패처
+class EmailDispatcher:
+    """
+    email_outbox 테이블에서 발송할 메시지를 배치로 가져와 재사용 SMTP 연결로 전송합니다.
+    실패한 메시지는 지수 백오프로 재시도하고, 최대 횟수를 넘으면 'failed' 로 표시합니다.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = EMAIL_DISPATCH_BATCH_SIZE,
+        connections: int = EMAIL_DISPATCH_CONNECTIONS,
+        poll_seconds: float = EMAIL_DISPATCH_POLL_SECONDS,
+        sender_factory: Optional[Callable[[], PersistentSMTPSender]] = None,
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.connections = max(1, connections)
+        # sender_factory 가 없으면 configure() 에 넘긴 앱 설정의 SMTP 서버로 연결합니다.
+        self._senders = [sender_factory() for _ in range(self.connections)] if sender_factory else []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+        self._batches = 0
+        self._last_error: Optional[str] = None
+
+    def configure(self, settings: Settings) -> None:
+        """설정의 SMTP 서버로 발송 연결을 만듭니다. (lifespan 이 start() 전에 앱의 설정으로 호출)"""
+        self._senders = [PersistentSMTPSender.from_settings(settings) for _ in range(self.connections)]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            self.notify()
+            await self._task
+            self._task = None
+        for sender in self._senders:
+            await asyncio.to_thread(sender.close)
+
+    def notify(self) -> None:
+        """새 메시지가 추가되었음을 알려 다음 폴링 주기를 기다리지 않고 바로 발송합니다."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                dispatched = await self.dispatch_once()
+            except Exception as e:
+                self._last_error = str(e)
+                logger.exception("이메일 디스패처 오류")
+                dispatched = 0
+            if dispatched >= self.batch_size:
+                continue # 남은 메시지가 더 있을 수 있으므로 바로 다음 배치 처리
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """발송 가능한 메시지 한 배치를 처리하고 처리한 개수를 반환합니다."""
+        messages = await self._claim_batch()
+        if not messages:
+            return 0
+        if not self._senders: # lifespan 밖(스크립트)에서는 환경 변수 설정 사용
+            self.configure(get_settings())
+
+        # 배치를 SMTP 연결 수만큼 나누어 각 연결에서 동시에 전송
+        chunks = [messages[i::len(self._senders)] for i in range(len(self._senders))]
+        results = await asyncio.gather(*[
+            asyncio.to_thread(self._send_chunk, sender, chunk)
+            for sender, chunk in zip(self._senders, chunks) if chunk
+        ])
+        outcomes = {message_id: error for chunk_result in results for message_id, error in chunk_result}
+
+        await self._record_outcomes(messages, outcomes)
+        self._batches += 1
+        return len(messages)
+
+    async def _claim_batch(self) -> list[EmailOutbox]:
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            # 여러 워커가 같은 메시지를 가져가지 않도록 SKIP LOCKED 로 점유 (PostgreSQL)
+            result = await db.execute(
+                select(EmailOutbox)
+                .where(EmailOutbox.status.in_([OUTBOX_PENDING, OUTBOX_SENDING]))
+                .where(EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list(result.scalars().all())
+            if not messages:
+                return []
+            # 점유 만료 시각까지 다른 워커가 가져가지 않으며, 프로세스가 죽으면 만료 후 다시 발송됩니다.
+            # SKIP LOCKED 가 없는 DB(SQLite)에서는 두 워커가 같은 행을 읽을 수 있으므로, 조회 조건을 다시 걸어
+            # 그 사이 다른 워커가 점유하지 않은 행만 갱신하고 실제로 갱신된 행만 발송합니다.
+            result = await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_([m.id for m in messages]))
+                .where(EmailOutbox.status.in_([OUTBOX_PENDING, OUTBOX_SENDING]))
+                .where(EmailOutbox.next_attempt_at <= now)
+                .values(status=OUTBOX_SENDING, next_attempt_at=now + timedelta(seconds=EMAIL_DISPATCH_LEASE_SECONDS))
+                .returning(EmailOutbox.id)
+                .execution_options(synchronize_session=False)
+            )
+            claimed = set(result.scalars().all())
+            await db.commit()
+            return [m for m in messages if m.id in claimed]
+
+    @staticmethod
+    def _send_chunk(sender: PersistentSMTPSender, chunk: list[EmailOutbox]) -> list[tuple[str, Optional[str]]]:
+        outcomes = []
+        for message in chunk:
+            try:
+                sender.send(message.to_email, message.subject, message.body)
+                outcomes.append((message.id, None))
+            except Exception as e:
+                outcomes.append((message.id, str(e) or e.__class__.__name__))
+        return outcomes
+
+    async def _record_outcomes(self, messages: list[EmailOutbox], outcomes: dict) -> None:
+        now = datetime.now(timezone.utc)
+        sent_ids = [m.id for m in messages if outcomes.get(m.id) is None]
+        async with AsyncSessionLocal() as db:
+            if sent_ids:
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(sent_ids))
+                    .values(status=OUTBOX_SENT, sent_at=now, attempts=EmailOutbox.attempts + 1, last_error=None)
+                )
+                self._sent += len(sent_ids)
+
+            for message in messages:
+                error = outcomes.get(message.id)
+                if error is None:
+                    continue
+                attempts = message.attempts + 1
+                self._last_error = error
+                if attempts >= EMAIL_MAX_ATTEMPTS:
+                    values = dict(status=OUTBOX_FAILED, attempts=attempts, last_error=error)
+                    self._failed += 1
+                else:
+                    values = dict(
+                        status=OUTBOX_PENDING,
+                        attempts=attempts,
+                        last_error=error,
+                        next_attempt_at=now + _retry_delay(attempts),
+                    )
+                    self._retried += 1
+                await db.execute(update(EmailOutbox).where(EmailOutbox.id == message.id).values(**values))
+                logger.warning(
+                    "이메일 전송 실패",
+                    extra={"outbox_id": message.id, "attempts": attempts, "max_attempts": EMAIL_MAX_ATTEMPTS, "error": error},
+                )
+
+            await db.commit()
+
+    def stats(self) -> dict:
+        """디스패처의 발송 통계를 반환합니다."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "batches": self._batches,
+            "sent": self._sent,
+            "retried": self._retried,
+            "failed": self._failed,
+            "smtp_connections_opened": sum(sender.connections_opened for sender in self._senders),
+            "last_error": self._last_error,
+        }
+
+
+email_dispatcher = EmailDispatcher()
@@ -0,0 +1,158 @@
+# src/services/password_hash_service.py
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import select, update
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from ..models.user import User
+from ..utils.metrics import registry
+from ..utils.password_hasher import PasswordHasherUnavailableError, describe_hash, password_hasher, pwd_context
+from ..utils.principal_cache import principal_cache
+
+logger = logging.getLogger(__name__)
+
+# 해시 방식/비용별 사용자 수를 다시 세는 주기 (초)
+PASSWORD_HASH_CENSUS_INTERVAL_SECONDS = get_settings().password_hash_census_interval_seconds
+PASSWORD_HASH_CENSUS_YIELD_PER = 1000
+
+PASSWORD_HASHES = registry.gauge(
+    "password_hashes", "Active users by password hash scheme and cost.", ("scheme", "cost")
+)
+PASSWORD_REHASH_TOTAL = registry.counter(
+    "password_rehash_total", "Background rehashes of outdated password hashes after login.", ("result",)
+)
+
+
+# ----------------------------------------------------
+# 로그인 후 백그라운드 재해싱
+# ----------------------------------------------------
+_rehash_tasks: set[asyncio.Task] = set()
+_rehashing_users: set[str] = set()
+
+
+def schedule_rehash_if_needed(user_id: str, plain_password: str, hashed_password: str) -> bool:
+    """
+    비밀번호 검증에 성공한 뒤 호출합니다. 해시가 현재 설정(방식/비용)과 다르면 응답을 기다리게 하지 않고
+    백그라운드에서 새 해시로 교체합니다. 예약했으면 True 를 반환합니다.
+    """
+    if not pwd_context.needs_update(hashed_password) or user_id in _rehashing_users:
+        return False
+    _rehashing_users.add(user_id)
+    task = asyncio.create_task(_rehash(user_id, plain_password, hashed_password))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+    return True
+
+
+async def _rehash(user_id: str, plain_password: str, old_hash: str) -> None:
+    try:
+        new_hash = await password_hasher.hash(plain_password)
+        async with AsyncSessionLocal() as db:
+            # 그 사이 비밀번호가 바뀌었으면 덮어쓰지 않도록 기존 해시가 그대로일 때만 갱신합니다.
+            result = await db.execute(
+                update(User)
+                .where(User.user_id == user_id, User.password_hash == old_hash)
+                .values(password_hash=new_hash)
+            )
+            await db.commit()
+        if result.rowcount:
+            principal_cache.invalidate_user(user_id)
+            PASSWORD_REHASH_TOTAL.inc(result="updated")
+        else:
+            PASSWORD_REHASH_TOTAL.inc(result="conflict")
+    except PasswordHasherUnavailableError:
+        PASSWORD_REHASH_TOTAL.inc(result="skipped") # 해싱 대기열이 바쁘면 다음 로그인 때 다시 시도
+    except Exception:
+        PASSWORD_REHASH_TOTAL.inc(result="error")
+        logger.exception("비밀번호 재해싱 실패", extra={"user_id": user_id})
+    finally:
+        _rehashing_users.discard(user_id)
+
+
+async def drain_rehash_tasks(timeout_seconds: float = 5) -> None:
+    """종료 시 진행 중인 재해싱이 끝날 때까지 잠시 기다립니다."""
+    if _rehash_tasks:
+        await asyncio.wait(set(_rehash_tasks), timeout=timeout_seconds)
+
+
+# ----------------------------------------------------
+# 해시 방식/비용별 사용자 수 집계
+# ----------------------------------------------------
+class PasswordHashCensus:
+    """
+    활성 사용자의 해시 방식/비용 분포를 주기적으로 집계하여 password_hashes 게이지로 내보냅니다.
+    (스크랩마다 테이블을 읽지 않도록 백그라운드에서 password_hash 컬럼만 서버 측 커서로 읽습니다)
+    """
+
+    def __init__(self, interval_seconds: float = PASSWORD_HASH_CENSUS_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._last_duration_ms = 0.0
+        self._outdated = 0
+        self._labels: set[tuple[str, str]] = set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.count_once()
+            except Exception:
+                logger.exception("비밀번호 해시 분포 집계 중 오류")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def count_once(self) -> dict[tuple[str, str], int]:
+        started = time.perf_counter()
+        counts: dict[tuple[str, str], int] = {}
+        outdated = 0
+        stmt = (
+            select(User.password_hash)
+            .where(User.is_deleted == False) # noqa: E712
+            .execution_options(yield_per=PASSWORD_HASH_CENSUS_YIELD_PER)
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(stmt)
+            async for hashed_password in result:
+                key = describe_hash(hashed_password)
+                counts[key] = counts.get(key, 0) + 1
+                if pwd_context.needs_update(hashed_password):
+                    outdated += 1
+
+        for scheme, cost in self._labels - set(counts):
+            PASSWORD_HASHES.set(0, scheme=scheme, cost=cost) # 더 이상 없는 방식/비용은 0 으로
+        for (scheme, cost), count in counts.items():
+            PASSWORD_HASHES.set(count, scheme=scheme, cost=cost)
+        self._labels |= set(counts)
+
+        self._runs += 1
+        self._outdated = outdated
+        self._last_duration_ms = (time.perf_counter() - started) * 1000
+        return counts
+
+    def stats(self) -> dict:
+        return {
+            "runs": self._runs,
+            "outdated_hashes": self._outdated,
+            "last_duration_ms": self._last_duration_ms,
+            "rehash_in_flight": len(_rehash_tasks),
+        }
+
+
+password_hash_census = PasswordHashCensus()
@@ -1,42 +1,36 @@
-
-
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import asyncio
+import logging
+import time
 import uuid
+from ..config import get_settings
 
+from ..database import AsyncSessionLocal, after_commit
 from ..models.user import User # User ORM 모델
 from ..models.password_reset_token import PasswordResetToken # 새로 정의한 토큰 모델
-from ..utils.email_sender import send_email # 이메일 전송 유틸리티
-from ..utils.auth import get_password_hash # 비밀번호 해싱 유틸리티
+from .email_outbox_service import enqueue_email, email_dispatcher # 이메일 발송 대기열 (outbox)
+from ..utils.auth import get_password_hash, get_password_hash_async # 비밀번호 해싱 유틸리티
+from ..utils.principal_cache import principal_cache # 비밀번호 변경 시 인증 캐시 무효화
+from ..read_replica import replica_router # 변경 직후 인증 조회는 주 DB 에서 (복제 지연 대비)
 
 RESET_TOKEN_EXPIRE_MINUTES = 15 # 비밀번호 재설정 토큰 유효 시간 (분)
 PASSWORD_RESET_BASE_URL = "http://localhost:3000/reset-password" # TODO: 실제 프론트엔드 URL로 변경
 
-# 1. 비밀번호 재설정 토큰 생성 및 이메일 전송
-def create_password_reset_token(db: Session, user: User) -> Optional[PasswordResetToken]:
-    # 기존 토큰이 있다면 삭제 (옵션)
-    existing_token = db.query(PasswordResetToken).filter(PasswordResetToken.user_id == user.emp_number).first()
-    if existing_token:
-        db.delete(existing_token)
-        db.commit()
+logger = logging.getLogger(__name__)
+RESET_TOKEN_SWEEP_INTERVAL_SECONDS = get_settings().reset_token_sweep_interval_seconds # 만료 토큰 정리 주기
+RESET_TOKEN_SWEEP_BATCH_SIZE = get_settings().reset_token_sweep_batch_size # 한 번에 삭제할 최대 행 수
 
-    token = str(uuid.uuid4()) # 고유한 UUID를 토큰으로 사용
-    # now() 대신 utcnow()를 사용했듯이, now(timezone.utc)를 사용하여 시간대 인식 객체로 만듭니다.
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
-    # 또는 datetime.utcnow().replace(tzinfo=timezone.utc) 로 명시적으로 UTC 타임존 정보 추가
-    # Pydantic v2에서 datetime.utcnow()는 deprecated 되었으므로 datetime.now(timezone.utc)를 권장합니다.
+# DB 드라이버에 따라 timezone 정보가 빠진 datetime 이 반환될 수 있으므로 UTC 로 간주하여 비교합니다.
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
-    db_token = PasswordResetToken(
-        token=token,
-        user_id=user.emp_number,
-        expires_at=expires_at # 이제 expires_at은 offset-aware 입니다.
-    )
-    db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
-
-    # 이메일 전송
+def _build_reset_email(user: User, token: str) -> tuple[str, str]:
     reset_link = f"{PASSWORD_RESET_BASE_URL}?token={token}"
     subject = "[당신의 서비스 이름] 비밀번호 재설정 링크 안내"
     body = f"""
@@ -46,19 +40,39 @@ def create_password_reset_token(db: Session, user: User) -> Optional[PasswordRes
     <p>이 링크는 {RESET_TOKEN_EXPIRE_MINUTES}분 동안 유효합니다. 만약 본인이 요청하지 않았다면, 이 이메일을 무시해주세요.</p>
     <p>감사합니다.</p>
     """
-    
-    # 실제 이메일 전송
-    email_sent = send_email(user.email, subject, body)
-    
-    if not email_sent:
-        # 이메일 전송 실패 시, 생성된 토큰을 삭제하거나 별도 로깅
-        db.delete(db_token)
-        db.commit()
-        return None # 토큰 생성 실패로 간주
+    return subject, body
+
+# 재설정 토큰 발급 UPSERT 문 생성
+# 사용자당 토큰은 하나이므로 (user_id 유니크 인덱스) 기존 토큰 조회/삭제 없이 한 문장으로 교체합니다.
+def _build_token_upsert(dialect_name: str, user: User, token: str, expires_at: datetime):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Reset token upsert is not supported for dialect '{dialect_name}'.")
+
+    stmt = insert(PasswordResetToken).values(
+        id=str(uuid.uuid4()),
+        user_id=user.user_id, # Users.user_id 를 참조하는 외래 키
+        token=token,
+        expires_at=expires_at,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[PasswordResetToken.user_id],
+        set_={
+            "token": stmt.excluded.token,
+            "expires_at": stmt.excluded.expires_at,
+            "created_at": func.now(),
+        },
+    )
 
-    return db_token
+# 아래 서비스 함수들은 커밋하지 않습니다. 토큰 UPSERT, outbox INSERT, 비밀번호 변경은
+# 요청 단위 트랜잭션(get_db / UnitOfWork)이 요청이 끝날 때 한 번에 커밋합니다.
 
-# 2. 토큰 유효성 검증
+# 1. 토큰 유효성 검증 (조회만 합니다)
+# 만료되었거나 탈퇴한 사용자의 토큰은 여기서 지우지 않고 거절만 하며, 행은 reset_token_sweeper 가 만료 후 정리합니다.
+# (검증 실패 응답은 요청 트랜잭션을 롤백하므로 여기서의 삭제는 어차피 남지 않습니다)
 def verify_password_reset_token(db: Session, token: str) -> Optional[User]:
     db_token = db.query(PasswordResetToken).filter(PasswordResetToken.token == token).first()
 
@@ -67,31 +81,174 @@ def verify_password_reset_token(db: Session, token: str) -> Optional[User]:
 
     # 현재 시간을 UTC 기준으로 시간대 인식 객체로 만듭니다.
     # db_token.expires_at (offset-aware)와 datetime.now(timezone.utc) (offset-aware)를 비교합니다.
-    if db_token.expires_at < datetime.now(timezone.utc): # <-- 이 부분을 수정
-        db.delete(db_token) # 만료된 토큰 삭제
-        db.commit()
+    if _as_utc(db_token.expires_at) < datetime.now(timezone.utc): # <-- 이 부분을 수정
         return None
 
     # 토큰에 연결된 사용자 조회
-    user = db.query(User).filter(User.emp_number == db_token.emp_number).first()
+    user = db.query(User).filter(User.user_id == db_token.user_id).first()
     
     # 사용자가 없거나, 삭제된 계정이라면 토큰 무효화
     if not user or user.is_deleted:
-        db.delete(db_token) # 유효하지 않은 사용자이므로 토큰 삭제
-        db.commit()
         return None
 
     return user # 유효한 토큰에 해당하는 사용자 반환
 
-# 3. 비밀번호 재설정 (실제 비밀번호 업데이트)
-def reset_password(db: Session, user: User, new_password: str) -> User:
-    hashed_password = get_password_hash(new_password)
+# 커밋되면 인증 캐시를 비우고, 복제 지연 동안 이 사용자의 인증 조회를 주 DB 로 보냅니다.
+def _after_password_reset(db: Session | AsyncSession, user: User) -> None:
+    user_id = user.user_id
+
+    def invalidate() -> None:
+        principal_cache.invalidate_user(user_id)
+        replica_router.pin_primary(user_id)
+
+    after_commit(db, invalidate)
+
+# 2. 비밀번호 재설정 (실제 비밀번호 업데이트)
+def reset_password(db: Session, user: User, new_password: str, password_hash: Optional[str] = None) -> User:
+    hashed_password = password_hash or get_password_hash(new_password)
     user.password_hash = hashed_password
     db.add(user) # 변경 감지
     
     # 비밀번호 재설정 후 모든 관련 토큰 삭제 (보안 강화)
-    db.query(PasswordResetToken).filter(PasswordResetToken.user_id == user.emp_number).delete()
+    db.query(PasswordResetToken).filter(PasswordResetToken.user_id == user.user_id).delete()
     
-    db.commit()
-    db.refresh(user)
-    return user
\ No newline at end of file
+    db.flush()
+    _after_password_reset(db, user)
+    return user
+
+
+# ----------------------------------------------------
+# 비동기 버전 (AsyncSession) - async 라우트에서 사용
+# ----------------------------------------------------
+
+# 1. 비밀번호 재설정 토큰 발급 및 이메일 발송 대기열 등록 (비동기)
+async def create_password_reset_token_async(db: AsyncSession, user: User) -> str:
+    token = str(uuid.uuid4())
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
+
+    await db.execute(_build_token_upsert(db.get_bind().dialect.name, user, token, expires_at))
+    subject, body = _build_reset_email(user, token)
+    enqueue_email(db, user.email, subject, body)
+    after_commit(db, email_dispatcher.notify) # 커밋 후에 깨워야 발송기가 새 메시지를 읽을 수 있습니다.
+    return token
+
+# 2. 토큰 유효성 검증 (비동기, 조회만 합니다)
+async def verify_password_reset_token_async(db: AsyncSession, token: str) -> Optional[User]:
+    result = await db.execute(select(PasswordResetToken).where(PasswordResetToken.token == token).limit(1))
+    db_token = result.scalars().first()
+
+    if not db_token:
+        return None
+
+    if _as_utc(db_token.expires_at) < datetime.now(timezone.utc):
+        return None
+
+    result = await db.execute(select(User).where(User.user_id == db_token.user_id).limit(1))
+    user = result.scalars().first()
+
+    if not user or user.is_deleted:
+        return None
+
+    return user
+
+# 3. 비밀번호 재설정 (비동기)
+async def reset_password_async(db: AsyncSession, user: User, new_password: str) -> User:
+    user.password_hash = await get_password_hash_async(new_password)
+    db.add(user)
+
+    # 비밀번호 재설정 후 모든 관련 토큰 삭제
+    await db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.user_id))
+
+    await db.flush()
+    _after_password_reset(db, user)
+    return user
+
+
+
+# ----------------------------------------------------
+# 만료 토큰 정리 (백그라운드 sweeper)
+# ----------------------------------------------------
+class ResetTokenSweeper:
+    """
+    만료된 password_reset_tokens 행을 주기적으로 배치 단위로 삭제합니다.
+    배치마다 트랜잭션을 나누어 긴 잠금 없이 정리하며, 정리 후 테이블 크기를 기록합니다.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = RESET_TOKEN_SWEEP_INTERVAL_SECONDS,
+        batch_size: int = RESET_TOKEN_SWEEP_BATCH_SIZE,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._deleted_total = 0
+        self._last_deleted = 0
+        self._last_duration_ms = 0.0
+        self._table_rows = 0
+        self._max_table_rows = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("만료 토큰 정리 중 오류")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def sweep_once(self) -> int:
+        """만료된 토큰을 모두 삭제하고 삭제한 행 수를 반환합니다."""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        deleted = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                expired_ids = (
+                    select(PasswordResetToken.id)
+                    .where(PasswordResetToken.expires_at < now)
+                    .limit(self.batch_size)
+                    .scalar_subquery()
+                )
+                result = await db.execute(delete(PasswordResetToken).where(PasswordResetToken.id.in_(expired_ids)))
+                await db.commit()
+                deleted += result.rowcount
+                if result.rowcount < self.batch_size:
+                    break
+                await asyncio.sleep(0) # 배치 사이에 다른 요청이 실행될 수 있도록 양보
+
+            self._table_rows = (await db.execute(select(func.count()).select_from(PasswordResetToken))).scalar_one()
+
+        self._runs += 1
+        self._deleted_total += deleted
+        self._last_deleted = deleted
+        self._last_duration_ms = (time.perf_counter() - started) * 1000
+        self._max_table_rows = max(self._max_table_rows, self._table_rows)
+        return deleted
+
+    def stats(self) -> dict:
+        """정리 작업 통계 및 최근 테이블 크기를 반환합니다."""
+        return {
+            "runs": self._runs,
+            "deleted_total": self._deleted_total,
+            "last_deleted": self._last_deleted,
+            "last_duration_ms": self._last_duration_ms,
+            "table_rows": self._table_rows,
+            "max_table_rows_seen": self._max_table_rows,
+        }
+
+
+reset_token_sweeper = ResetTokenSweeper()
@@ -0,0 +1,193 @@
+# src/services/token_revocation_service.py
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal, after_commit
+from ..models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# 만료 시각을 이 간격(초)으로 묶어 보관하고, 지난 묶음은 통째로 버립니다.
+TOKEN_REVOCATION_BUCKET_SECONDS = get_settings().token_revocation_bucket_seconds
+# 다른 워커에서 폐기한 토큰을 읽어오는 주기 (초). 워커 간 반영 지연의 최대값입니다.
+TOKEN_REVOCATION_SYNC_SECONDS = get_settings().token_revocation_sync_seconds
+# 만료된 폐기 기록을 메모리/테이블에서 정리하는 주기 (초)
+TOKEN_REVOCATION_COMPACT_SECONDS = get_settings().token_revocation_compact_seconds
+TOKEN_REVOCATION_COMPACT_BATCH_SIZE = 1000
+# PostgreSQL 에서는 seq 가 커밋 순서와 다를 수 있으므로 최근 이 시간(초) 안에 폐기된 행은 seq 와 관계없이 다시 읽습니다.
+TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS = 60
+
+
+def _build_revocation_insert(dialect_name: str, jti: str, user_id: str, expires_at: datetime):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Token revocation insert is not supported for dialect '{dialect_name}'.")
+
+    stmt = insert(RevokedToken).values(jti=jti, user_id=user_id, expires_at=expires_at)
+    return stmt.on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+
+
+class TokenRevocationStore:
+    """
+    폐기된 JWT 의 jti 를 메모리에 보관하여 요청마다 DB 조회 없이 O(1) 로 확인합니다.
+    jti 는 토큰 만료 시각 기준 묶음(bucket)에 들어가며, 만료된 묶음은 한 번에 제거됩니다.
+    revoked_tokens 테이블이 원본이며, 각 워커는 seq 가 증가한 행만 주기적으로 읽어 다른 워커의 폐기를 반영합니다.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = TOKEN_REVOCATION_BUCKET_SECONDS,
+        sync_seconds: float = TOKEN_REVOCATION_SYNC_SECONDS,
+        compact_seconds: float = TOKEN_REVOCATION_COMPACT_SECONDS,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.sync_seconds = sync_seconds
+        self.compact_seconds = compact_seconds
+        self._bucket_by_jti: dict[str, int] = {}
+        self._buckets: dict[int, set[str]] = {}
+        self._last_seq = 0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_compact = 0.0
+        self._revoked_total = 0
+        self._synced_total = 0
+        self._compacted_total = 0
+        self._deleted_rows_total = 0
+
+    # --- 메모리 목록 ---
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._bucket_by_jti
+
+    def _add(self, jti: str, expires_at: float) -> bool:
+        bucket = int(expires_at // self.bucket_seconds) + 1 # 묶음의 끝이 만료 시각보다 늦도록 올림
+        with self._lock:
+            if jti in self._bucket_by_jti:
+                return False
+            self._bucket_by_jti[jti] = bucket
+            self._buckets.setdefault(bucket, set()).add(jti)
+            return True
+
+    def _drop_expired_buckets(self) -> int:
+        current = int(time.time() // self.bucket_seconds)
+        dropped = 0
+        with self._lock:
+            for bucket in [b for b in self._buckets if b <= current]:
+                for jti in self._buckets.pop(bucket):
+                    self._bucket_by_jti.pop(jti, None)
+                    dropped += 1
+        return dropped
+
+    # --- 폐기 ---
+    async def revoke(self, db: AsyncSession, jti: str, user_id: str, expires_at: datetime) -> None:
+        """
+        토큰 폐기 기록을 요청 트랜잭션에 추가합니다. 커밋되면 이 워커에는 즉시, 다른 워커에는 다음 동기화 때 반영됩니다.
+        (탈퇴처럼 다른 변경과 함께 하나의 커밋으로 처리됩니다)
+        """
+        await db.execute(_build_revocation_insert(db.bind.dialect.name, jti, user_id, expires_at))
+
+        def apply() -> None:
+            self._add(jti, expires_at.timestamp())
+            self._revoked_total += 1
+
+        after_commit(db, apply)
+
+    # --- 동기화 / 정리 ---
+    async def sync_once(self) -> int:
+        """마지막으로 읽은 seq 이후에 추가된 (아직 만료되지 않은) 폐기 기록을 메모리에 반영합니다. 반환값은 새로 추가된 수"""
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RevokedToken.seq, RevokedToken.jti, RevokedToken.expires_at)
+                .where(or_(
+                    RevokedToken.seq > self._last_seq,
+                    RevokedToken.revoked_at > now - timedelta(seconds=TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS),
+                ))
+                .order_by(RevokedToken.seq)
+            )
+            rows = result.all()
+        added = 0
+        for seq, jti, expires_at in rows:
+            self._last_seq = max(self._last_seq, seq)
+            if expires_at.tzinfo is None: # SQLite 는 시간대 정보 없이 반환
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at > now and self._add(jti, expires_at.timestamp()):
+                added += 1
+        self._synced_total += added
+        return added
+
+    async def compact_once(self) -> int:
+        """메모리에서 만료된 묶음을 버리고, 테이블에서 만료된 행을 배치 단위로 삭제합니다."""
+        self._compacted_total += self._drop_expired_buckets()
+        now = datetime.now(timezone.utc)
+        deleted = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                expired = (
+                    select(RevokedToken.seq)
+                    .where(RevokedToken.expires_at < now)
+                    .limit(TOKEN_REVOCATION_COMPACT_BATCH_SIZE)
+                    .scalar_subquery()
+                )
+                result = await db.execute(delete(RevokedToken).where(RevokedToken.seq.in_(expired)))
+                await db.commit()
+                deleted += result.rowcount
+                if result.rowcount < TOKEN_REVOCATION_COMPACT_BATCH_SIZE:
+                    break
+                await asyncio.sleep(0)
+        self._deleted_rows_total += deleted
+        self._last_compact = time.monotonic()
+        return deleted
+
+    # --- 백그라운드 작업 ---
+    async def start(self) -> None:
+        """테이블에서 유효한 폐기 기록을 모두 읽은 뒤 주기적인 동기화/정리를 시작합니다."""
+        if self._task is None:
+            await self.sync_once()
+            self._last_compact = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync_once()
+                if time.monotonic() - self._last_compact >= self.compact_seconds:
+                    await self.compact_once()
+            except Exception:
+                logger.exception("토큰 폐기 목록 동기화/정리 중 오류")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "revoked_in_memory": len(self._bucket_by_jti),
+                "buckets": len(self._buckets),
+                "last_seq": self._last_seq,
+                "revoked_total": self._revoked_total,
+                "synced_total": self._synced_total,
+                "compacted_total": self._compacted_total,
+                "deleted_rows_total": self._deleted_rows_total,
+            }
+
+
+token_revocation_store = TokenRevocationStore()
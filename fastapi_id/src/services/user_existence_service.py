@@ -0,0 +1,179 @@
+# src/services/user_existence_service.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from ..models.user import User
+from ..utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+USER_FILTER_ENABLED = get_settings().user_filter_enabled
+USER_FILTER_ERROR_RATE = get_settings().user_filter_error_rate # "있을 수도 있음" 오탐률
+USER_FILTER_MIN_CAPACITY = get_settings().user_filter_min_capacity
+# 다른 워커에서 가입/변경한 사용자를 읽어오는 주기 (초). 이 시간 동안은 다른 워커의 신규 값이 "없음" 으로 보일 수 있으므로
+# "없음" 은 틀려도 안전한 경우(가입 중복 사전 확인: UNIQUE 제약이 최종 확인)에만 사용합니다.
+USER_FILTER_SYNC_SECONDS = get_settings().user_filter_sync_seconds
+# 전체를 다시 읽어 필터를 새로 만드는 주기 (초). 변경/삭제로 남은 값을 정리하고 크기를 다시 맞춥니다.
+USER_FILTER_REBUILD_SECONDS = get_settings().user_filter_rebuild_seconds
+USER_FILTER_LOAD_BATCH_SIZE = 10000
+# 커밋 순서와 updated_at 순서가 다를 수 있으므로 마지막으로 읽은 시각보다 이만큼(초) 앞부터 다시 읽습니다.
+USER_FILTER_SYNC_OVERLAP_SECONDS = 60
+
+
+class UserExistenceFilter:
+    """
+    가입된 이메일/사번의 Bloom 필터. 가입 시 둘 다 "없음" 이면 중복 확인 조회를 건너뜁니다.
+    (다른 워커의 변경은 동기화 전까지 보이지 않으므로, 놓친 중복은 INSERT 의 UNIQUE 제약이 409 로 막습니다)
+    탈퇴(소프트 삭제)한 사용자도 UNIQUE 제약에 남아 있으므로 필터에서 빼지 않습니다.
+    필터가 준비되기 전에는 항상 "있을 수도 있음" 을 반환하므로 결과가 달라지지 않고 DB 조회만 합니다.
+    """
+
+    def __init__(self, error_rate: float = USER_FILTER_ERROR_RATE, min_capacity: int = USER_FILTER_MIN_CAPACITY):
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self._emails: Optional[BloomFilter] = None
+        self._emp_numbers: Optional[BloomFilter] = None
+        self._watermark: Optional[datetime] = None # 마지막으로 읽은 updated_at (가입과 이메일/사번 변경 모두 갱신)
+        self._rebuilding: Optional[list[tuple[str, str]]] = None # 다시 만드는 동안 추가된 값 (교체 후 다시 반영)
+        self._last_rebuild = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._skipped = 0 # "없음" 으로 DB 조회를 건너뛴 횟수
+        self._checked = 0
+        self._rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._emails is not None
+
+    # --- 조회 ---
+    def might_have_email(self, email: str) -> bool:
+        return self._check(self._emails, email)
+
+    def might_have_emp_number(self, emp_number: str) -> bool:
+        return self._check(self._emp_numbers, emp_number)
+
+    def _check(self, bloom: Optional[BloomFilter], value: str) -> bool:
+        self._checked += 1
+        if bloom is None or value in bloom:
+            return True
+        self._skipped += 1
+        return False
+
+    # --- 갱신 ---
+    def add(self, email: str, emp_number: str) -> None:
+        """사용자 생성/이메일·사번 변경 후 호출합니다."""
+        if self._rebuilding is not None:
+            self._rebuilding.append((email, emp_number))
+        if self._emails is not None:
+            self._add_to(self._emails, self._emp_numbers, [(email, emp_number)])
+
+    def add_many(self, pairs: Iterable[tuple[str, str]]) -> None:
+        for email, emp_number in pairs:
+            self.add(email, emp_number)
+
+    @staticmethod
+    def _add_to(emails: BloomFilter, emp_numbers: BloomFilter, pairs: Iterable[tuple[str, str]]) -> None:
+        # 이미 있는 값은 다시 넣지 않아야 count(용량 판단 기준)가 실제 항목 수에 가깝게 유지됩니다.
+        for email, emp_number in pairs:
+            if email not in emails:
+                emails.add(email)
+            if emp_number not in emp_numbers:
+                emp_numbers.add(emp_number)
+
+    async def rebuild(self) -> int:
+        """Users 전체(탈퇴 포함)를 배치로 읽어 새 필터를 만든 뒤 교체합니다. 읽은 행 수를 반환합니다."""
+        self._rebuilding = []
+        try:
+            async with AsyncSessionLocal() as db:
+                total = (await db.execute(select(func.count()).select_from(User))).scalar_one()
+                capacity = max(self.min_capacity, total * 2) # 다음 재생성까지의 가입을 고려해 여유 있게
+                emails = BloomFilter(capacity, self.error_rate)
+                emp_numbers = BloomFilter(capacity, self.error_rate)
+                watermark = self._watermark
+                rows = 0
+                result = await db.stream(
+                    select(User.email, User.emp_number, User.updated_at)
+                    .execution_options(yield_per=USER_FILTER_LOAD_BATCH_SIZE)
+                )
+                async for partition in result.partitions():
+                    for email, emp_number, updated_at in partition:
+                        emails.add(email)
+                        emp_numbers.add(emp_number)
+                        if watermark is None or updated_at > watermark:
+                            watermark = updated_at
+                    rows += len(partition)
+                    await asyncio.sleep(0) # 큰 테이블을 읽는 동안 다른 요청 처리
+            self._add_to(emails, emp_numbers, self._rebuilding)
+            self._emails, self._emp_numbers, self._watermark = emails, emp_numbers, watermark
+        finally:
+            self._rebuilding = None
+        self._last_rebuild = time.monotonic()
+        self._rebuilds += 1
+        return rows
+
+    async def sync_once(self) -> int:
+        """마지막으로 읽은 updated_at 이후에 가입하거나 이메일/사번을 바꾼 (다른 워커의) 사용자를 반영합니다."""
+        if self._emails is None:
+            return await self.rebuild()
+        query = select(User.email, User.emp_number, User.updated_at)
+        if self._watermark is not None:
+            query = query.where(User.updated_at > self._watermark - timedelta(seconds=USER_FILTER_SYNC_OVERLAP_SECONDS))
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+        self._add_to(self._emails, self._emp_numbers, [(email, emp_number) for email, emp_number, _ in rows])
+        for _, _, updated_at in rows:
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+        return len(rows)
+
+    # --- 백그라운드 작업 ---
+    async def start(self) -> None:
+        """필터를 만든 뒤 주기적인 동기화/재생성을 시작합니다."""
+        if not USER_FILTER_ENABLED or self._task is not None:
+            return
+        await self.rebuild()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(USER_FILTER_SYNC_SECONDS)
+            try:
+                saturated = self._emails.saturated or self._emp_numbers.saturated
+                if saturated or time.monotonic() - self._last_rebuild >= USER_FILTER_REBUILD_SECONDS:
+                    await self.rebuild()
+                else:
+                    await self.sync_once()
+            except Exception:
+                logger.exception("사용자 존재 필터 동기화 중 오류")
+
+    def stats(self) -> dict:
+        stats = {
+            "ready": int(self.ready),
+            "checked": self._checked,
+            "skipped_db": self._skipped,
+            "rebuilds": self._rebuilds,
+        }
+        if self._emails is not None:
+            stats["emails"] = self._emails.stats()
+            stats["emp_numbers"] = self._emp_numbers.stats()
+        return stats
+
+
+user_existence_filter = UserExistenceFilter()
@@ -0,0 +1,81 @@
+# src/services/user_export_service.py
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from ..database import AsyncSessionLocal
+from ..models.user import User
+
+EXPORT_CHUNK_BYTES = 64 * 1024 # 이 크기만큼 모아서 내보냅니다.
+
+EXPORT_FORMATS = ("ndjson", "csv")
+# 비밀번호 해시 등 민감한 컬럼은 내보내지 않습니다.
+EXPORT_COLUMNS = (User.user_id, User.emp_number, User.email, User.name, User.phone, User.created_at, User.is_deleted)
+EXPORT_FIELD_NAMES = tuple(column.key for column in EXPORT_COLUMNS)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def iter_user_rows(yield_per: int, is_deleted: Optional[bool] = None) -> AsyncIterator[tuple]:
+    """
+    필요한 컬럼만 서버 측 커서로 yield_per(USER_EXPORT_YIELD_PER) 행씩 읽어 한 행씩 반환합니다.
+    ORM 객체를 만들지 않고 전체 결과를 메모리에 올리지 않으므로 테이블 크기와 무관하게 메모리 사용량이 일정합니다.
+    스트리밍 응답은 요청 의존성(get_async_db)보다 오래 살아있으므로 세션을 직접 엽니다.
+    """
+    stmt = select(*EXPORT_COLUMNS).order_by(User.created_at, User.user_id).execution_options(yield_per=yield_per)
+    if is_deleted is not None:
+        stmt = stmt.where(User.is_deleted == is_deleted)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for row in result:
+            yield tuple(row)
+
+
+async def iter_export_chunks(rows: AsyncIterator[tuple], fmt: str) -> AsyncIterator[bytes]:
+    """행 스트림을 NDJSON 또는 CSV 바이트 청크로 변환합니다."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(EXPORT_FIELD_NAMES)
+
+    async for row in rows:
+        if writer is not None:
+            writer.writerow([_serialize(value) for value in row])
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_FIELD_NAMES, map(_serialize, row))), ensure_ascii=False))
+            buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """청크 스트림을 gzip 형식으로 압축합니다. (전체를 모으지 않고 청크마다 압축)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31: gzip 헤더 포함
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_users(
+    fmt: str, yield_per: int, is_deleted: Optional[bool] = None, compress: bool = False
+) -> AsyncIterator[bytes]:
+    """사용자 테이블을 fmt(ndjson/csv) 형식으로 내보내는 바이트 스트림을 반환합니다."""
+    chunks = iter_export_chunks(iter_user_rows(yield_per, is_deleted), fmt)
+    return gzip_chunks(chunks) if compress else chunks
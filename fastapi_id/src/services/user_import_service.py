@@ -0,0 +1,216 @@
+# src/services/user_import_service.py
+
+import codecs
+import csv
+import json
+import logging
+import uuid
+from typing import AsyncIterator, Iterable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.user import User
+from ..schemas.user import UserCreate, UserImportReport, UserImportRowResult
+from ..utils.password_hasher import password_hasher
+from .user_existence_service import user_existence_filter
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CREATED = "created"
+IMPORT_INVALID = "invalid"
+IMPORT_DUPLICATE_IN_FILE = "duplicate_in_file"
+IMPORT_EXISTS = "exists"
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+class UserImportError(Exception):
+    """가져오기 파일 자체를 처리할 수 없을 때 (형식 오류, 헤더 누락, 행 수 초과) 발생합니다."""
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 청크 스트림을 UTF-8 텍스트 줄 단위로 나눕니다. (요청 본문을 메모리에 모두 올리지 않음)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def aiter_sync(lines: Iterable[str]) -> AsyncIterator[str]:
+    """CLI 에서 파일 객체를 aiter_lines 와 같은 형태로 넘기기 위한 어댑터"""
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+async def _iter_records(
+    lines: AsyncIterator[str], fmt: str, max_rows: int
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """(행 번호, 레코드, 파싱 오류) 를 순서대로 반환합니다. CSV 는 한 줄에 한 레코드여야 합니다."""
+    header: Optional[list[str]] = None
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            missing = {"email", "password", "name", "phone"} - set(header)
+            if missing or not ({"emp_number", "empNumber"} & set(header)):
+                raise UserImportError(f"CSV header must contain email, password, name, phone, emp_number: {header}")
+            continue
+
+        row_number += 1
+        if row_number > max_rows:
+            raise UserImportError(f"Import is limited to {max_rows} rows.")
+        try:
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+                record = dict(zip(header, values))
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("each line must be a JSON object")
+        except (ValueError, csv.Error) as e:
+            yield row_number, None, str(e)
+            continue
+        yield row_number, record, None
+
+
+class _ImportState:
+    def __init__(self):
+        self.results: list[UserImportRowResult] = []
+        self.seen_emails: set[str] = set()
+        self.seen_emp_numbers: set[str] = set()
+        self.created = 0
+
+
+async def _process_batch(db: AsyncSession, batch: list[tuple[int, UserCreate]], state: _ImportState) -> None:
+    # 1) 파일 안에서 중복된 이메일/사번 제외 (먼저 나온 행을 우선)
+    candidates: list[tuple[int, UserCreate]] = []
+    for row_number, user in batch:
+        if user.email in state.seen_emails or user.emp_number in state.seen_emp_numbers:
+            state.results.append(UserImportRowResult(
+                row=row_number, status=IMPORT_DUPLICATE_IN_FILE, emp_number=user.emp_number,
+                detail="Email or employee number appears earlier in the file",
+            ))
+            continue
+        state.seen_emails.add(user.email)
+        state.seen_emp_numbers.add(user.emp_number)
+        candidates.append((row_number, user))
+    if not candidates:
+        return
+
+    # 2) 이미 등록된 이메일/사번을 한 번의 쿼리로 조회
+    emails = [user.email for _, user in candidates]
+    emp_numbers = [user.emp_number for _, user in candidates]
+    existing = await db.execute(
+        select(User.email, User.emp_number).where(or_(User.email.in_(emails), User.emp_number.in_(emp_numbers)))
+    )
+    existing_emails, existing_emp_numbers = set(), set()
+    for email, emp_number in existing:
+        existing_emails.add(email)
+        existing_emp_numbers.add(emp_number)
+
+    new_users: list[tuple[int, UserCreate]] = []
+    for row_number, user in candidates:
+        if user.email in existing_emails:
+            state.results.append(UserImportRowResult(
+                row=row_number, status=IMPORT_EXISTS, emp_number=user.emp_number, detail="Email already registered",
+            ))
+        elif user.emp_number in existing_emp_numbers:
+            state.results.append(UserImportRowResult(
+                row=row_number, status=IMPORT_EXISTS, emp_number=user.emp_number,
+                detail="Employee number already registered",
+            ))
+        else:
+            new_users.append((row_number, user))
+    if not new_users:
+        return
+
+    # 3) 비밀번호를 프로세스 풀에서 병렬 해싱한 뒤 한 번의 INSERT (executemany) 로 저장
+    hashes = await password_hasher.hash_many([user.password for _, user in new_users])
+    rows = [
+        {
+            "user_id": str(uuid.uuid4()),
+            "password_hash": password_hash,
+            "email": user.email,
+            "name": user.name,
+            "phone": user.phone,
+            "emp_number": user.emp_number,
+            "is_deleted": False,
+        }
+        for (_, user), password_hash in zip(new_users, hashes)
+    ]
+    try:
+        await db.execute(insert(User), rows)
+        await db.commit()
+        user_existence_filter.add_many((row["email"], row["emp_number"]) for row in rows)
+        for row_number, user in new_users:
+            state.results.append(UserImportRowResult(row=row_number, status=IMPORT_CREATED, emp_number=user.emp_number))
+        state.created += len(new_users)
+        return
+    except IntegrityError:
+        # 조회와 INSERT 사이에 다른 요청이 같은 값을 등록한 경우: 행 단위로 다시 시도하여 충돌 행만 제외
+        await db.rollback()
+
+    for (row_number, user), row in zip(new_users, rows):
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(User), [row])
+            user_existence_filter.add(row["email"], row["emp_number"]) # 실패해도 "있을 수도 있음" 일 뿐이므로 커밋 전에 추가
+        except IntegrityError:
+            state.results.append(UserImportRowResult(
+                row=row_number, status=IMPORT_EXISTS, emp_number=user.emp_number,
+                detail="Email or employee number already registered",
+            ))
+            continue
+        state.results.append(UserImportRowResult(row=row_number, status=IMPORT_CREATED, emp_number=user.emp_number))
+        state.created += 1
+    await db.commit()
+
+
+async def import_users(
+    db: AsyncSession, lines: AsyncIterator[str], fmt: str, *, batch_size: int, max_rows: int
+) -> UserImportReport:
+    """
+    CSV(헤더 포함) 또는 JSONL 줄 스트림에서 사용자를 batch_size(USER_IMPORT_BATCH_SIZE) 개씩 등록합니다.
+    충돌/오류가 있는 행은 건너뛰고 행별 결과를 보고하며, 배치마다 커밋합니다.
+    max_rows(USER_IMPORT_MAX_ROWS) 행을 넘으면 UserImportError 를 발생시킵니다.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise UserImportError(f"Unsupported format: {fmt} (use one of {', '.join(IMPORT_FORMATS)})")
+
+    state = _ImportState()
+    batch: list[tuple[int, UserCreate]] = []
+    total = 0
+    async for row_number, record, error in _iter_records(lines, fmt, max_rows):
+        total += 1
+        if error is None:
+            try:
+                batch.append((row_number, UserCreate.model_validate(record)))
+            except ValidationError as e:
+                error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+        if error is not None:
+            emp_number = (record or {}).get("emp_number") or (record or {}).get("empNumber")
+            state.results.append(UserImportRowResult(
+                row=row_number, status=IMPORT_INVALID, emp_number=str(emp_number) if emp_number else None, detail=error,
+            ))
+        if len(batch) >= batch_size:
+            await _process_batch(db, batch, state)
+            batch = []
+    if batch:
+        await _process_batch(db, batch, state)
+
+    state.results.sort(key=lambda result: result.row)
+    logger.info("사용자 대량 등록 완료", extra={"total": total, "created": state.created})
+    return UserImportReport(total=total, created=state.created, skipped=total - state.created, results=state.results)
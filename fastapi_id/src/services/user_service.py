@@ -1,20 +1,43 @@
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from ..database import after_commit # 커밋 이후에 캐시 무효화 등 실행
 from ..models.user import User 
 from ..schemas.user import UserCreate, UserUpdate 
-from ..utils.auth import get_password_hash # get_password_hash 임포트 확인
+from ..utils.auth import get_password_hash, get_password_hash_async # get_password_hash 임포트 확인
+from ..utils.principal_cache import principal_cache # 사용자 정보 변경 시 인증 캐시 무효화
+from ..read_replica import replica_router # 변경 직후 인증 조회는 주 DB 에서 (복제 지연 대비)
+from .user_existence_service import user_existence_filter # 가입된 이메일/사번 존재 필터
 from typing import Optional
 import uuid 
-from datetime import datetime # datetime 임포트 추가
+import base64
+import binascii
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 사용자 행 변경 후 처리: 커밋되면 인증 캐시를 비우고, 복제 지연 동안 인증 조회를 주 DB 로 보내며, 바뀐 이메일/사번을 존재 필터에 추가
+# (이전 이메일/사번은 필터 재생성 때 정리)
+def _after_user_change(db: Session | AsyncSession, user: User) -> None:
+    user_id, email, emp_number = user.user_id, user.email, user.emp_number
+
+    def invalidate() -> None:
+        principal_cache.invalidate_user(user_id)
+        replica_router.pin_primary(user_id)
+        user_existence_filter.add(email, emp_number)
+
+    after_commit(db, invalidate)
+
+# 아래 서비스 함수들은 flush 까지만 합니다. 커밋은 요청 단위 트랜잭션(get_db / UnitOfWork)이 요청이 끝날 때 한 번 합니다.
 
 # 사용자 생성 서비스
-def create_user(db: Session, user_create: UserCreate) -> User:
-    # 🚨 DEBUG: 함수 시작 로그
-    print(f"DEBUG: create_user 함수 시작 - 이메일: {user_create.email}, 사번: {user_create.emp_number}")
-    
-    hashed_password = get_password_hash(user_create.password)
-    # 🚨 DEBUG: 비밀번호 해싱 완료 로그
-    print(f"DEBUG: 비밀번호 해싱 완료.")
-    
+# password_hash 를 넘기면 (라우트에서 프로세스 풀로 미리 해싱한 값) 여기서 다시 해싱하지 않습니다.
+def create_user(db: Session, user_create: UserCreate, password_hash: Optional[str] = None) -> User:
+    logger.debug("create_user 시작", extra={"emp_number": user_create.emp_number})
+
+    hashed_password = password_hash or get_password_hash(user_create.password)
+
     # ORM 모델 User 인스턴스 생성 및 모든 필수 컬럼 값 할당
     db_user = User(
         user_id=str(uuid.uuid4()), # UUID로 고유 ID 생성 (VARCHAR(50)에 적합)
@@ -24,32 +47,21 @@ def create_user(db: Session, user_create: UserCreate) -> User:
         phone=user_create.phone,
         emp_number=user_create.emp_number,
         # created_at과 is_deleted는 DB의 DEFAULT 값으로 자동 채워지므로 명시적으로 넣지 않음.
-        # db.refresh(db_user) 시 최신 값으로 업데이트 됩니다.
+        # flush 시 INSERT ... RETURNING 으로 함께 받아옵니다. (User.__mapper_args__ 의 eager_defaults)
     )
-    
-    # 🚨 DEBUG: DB User 객체 생성 확인 로그
-    print(f"DEBUG: DB User 객체 생성 (커밋 전): user_id={db_user.user_id}, emp_number={db_user.emp_number}, email={db_user.email}")
 
+    db.add(db_user) # 세션에 사용자 추가
     try:
-        db.add(db_user) # 세션에 사용자 추가
-        # 🚨 DEBUG: DB 세션에 추가 완료 로그
-        print("DEBUG: DB 세션에 사용자 추가 완료 (아직 DB 저장 전).")
-        
-        db.commit()      # 변경 사항 DB에 커밋
-        # 🚨 DEBUG: DB 커밋 완료 로그 (데이터가 이때 실제 DB에 저장됨)
-        print("DEBUG: DB 커밋 완료. 데이터베이스에 저장됨.")
-        
-        db.refresh(db_user) # DB에 저장된 최신 상태(created_at 등)로 객체 업데이트
-        # 🚨 DEBUG: DB User 객체 새로고침 완료 로그
-        print(f"DEBUG: DB User 객체 새로고침 완료. user_id={db_user.user_id}, created_at={db_user.created_at}, is_deleted={db_user.is_deleted}")
-        
-        return db_user
-    except Exception as e:
-        db.rollback() # 오류 발생 시 롤백하여 데이터 일관성 유지
-        # 🚨 ERROR: 예외 발생 시 상세 로그 (가장 중요한 부분!)
-        print(f"ERROR: create_user 함수에서 DB 저장 중 심각한 오류 발생: {e}")
+        db.flush() # INSERT 실행 (커밋과 롤백은 요청 단위 트랜잭션 get_db 가 담당)
+    except IntegrityError:
+        raise # UNIQUE 위반: 전역 핸들러가 제약 이름에 맞는 409 로 응답
+    except Exception:
+        logger.exception("create_user DB 저장 중 오류 발생", extra={"emp_number": user_create.emp_number})
         # 예외를 다시 발생시켜 FastAPI의 상위 핸들러로 전달
         raise 
+    after_commit(db, lambda: user_existence_filter.add(db_user.email, db_user.emp_number))
+    logger.debug("사용자 저장 완료", extra={"user_id": db_user.user_id})
+    return db_user
 
 # 이메일로 사용자 조회
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -73,32 +85,188 @@ def update_user(db: Session, db_user: User, user_update: UserUpdate) -> User:
     if user_update.emp_number is not None:
         db_user.emp_number = user_update.emp_number
     
-    db_user.updated_at = datetime.utcnow() # 업데이트 시각 갱신
     db.add(db_user) 
-    db.commit()     
-    db.refresh(db_user) 
+    db.flush()
+    _after_user_change(db, db_user)
     return db_user
 
 # 사용자 탈퇴 (소프트 삭제) 서비스
 def deactivate_user(db: Session, db_user: User):
     db_user.is_deleted = True 
-    db_user.updated_at = datetime.utcnow() # 업데이트 시각 갱신
     db.add(db_user) 
-    db.commit()     
-    db.refresh(db_user)
+    db.flush()
+    _after_user_change(db, db_user)
 
 # 🚨 새로 추가된: 사용자 비밀번호 업데이트 서비스
 from uuid import UUID # user_id 타입에 따라 UUID 또는 str 임포트
 
-def update_user_password(db: Session, user_id: UUID, new_password: str) -> Optional[User]:
+def update_user_password(
+    db: Session, user_id: UUID, new_password: str, password_hash: Optional[str] = None
+) -> Optional[User]:
     """주어진 user_id에 해당하는 사용자의 비밀번호를 업데이트합니다."""
     user = db.query(User).filter(User.user_id == user_id).first()
     if user:
-        user.password_hash = get_password_hash(new_password)
-        user.updated_at = datetime.utcnow() # 비밀번호 변경 시 updated_at 업데이트
+        user.password_hash = password_hash or get_password_hash(new_password)
         # user.lastPasswordChange = datetime.utcnow() # 만약 모델에 lastPasswordChange 컬럼이 있다면 이 줄을 추가
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        db.flush()
+        _after_user_change(db, user)
         return user
-    return None
\ No newline at end of file
+    return None
+
+
+# ----------------------------------------------------
+# 비동기 버전 (AsyncSession) - async 라우트에서 사용
+# ----------------------------------------------------
+
+# 사용자 생성 서비스 (비동기)
+async def create_user_async(db: AsyncSession, user_create: UserCreate) -> User:
+    logger.debug("create_user_async 시작", extra={"emp_number": user_create.emp_number})
+
+    hashed_password = await get_password_hash_async(user_create.password) # 프로세스 풀에서 해싱
+
+    db_user = User(
+        user_id=str(uuid.uuid4()),
+        password_hash=hashed_password,
+        email=user_create.email,
+        name=user_create.name,
+        phone=user_create.phone,
+        emp_number=user_create.emp_number,
+    )
+
+    db.add(db_user)
+    try:
+        await db.flush() # INSERT ... RETURNING 으로 created_at 등을 함께 받아오므로 refresh 조회가 필요 없습니다.
+    except IntegrityError:
+        raise # 동시 가입 등 UNIQUE 위반: 전역 핸들러가 제약 이름에 맞는 409 로 응답 (롤백은 UnitOfWork 가 담당)
+    except Exception:
+        logger.exception("create_user_async DB 저장 중 오류 발생", extra={"emp_number": user_create.emp_number})
+        raise
+    after_commit(db, lambda: user_existence_filter.add(db_user.email, db_user.emp_number))
+    logger.debug("사용자 저장 완료", extra={"user_id": db_user.user_id})
+    return db_user
+
+# 가입 중복 확인 (비동기): 이메일/사번 충돌을 한 번의 조회로 확인하고, 필터에서 둘 다 "없음" 이면 조회하지 않습니다.
+# 충돌 항목("email" / "emp_number") 을 반환하며, 확인과 INSERT 사이의 경합은 UNIQUE 제약(IntegrityError → 409)이 막습니다.
+async def find_signup_conflict_async(db: AsyncSession, email: str, emp_number: str) -> Optional[str]:
+    check_email = user_existence_filter.might_have_email(email)
+    check_emp_number = user_existence_filter.might_have_emp_number(emp_number)
+    conditions = []
+    if check_email:
+        conditions.append(User.email == email)
+    if check_emp_number:
+        conditions.append(User.emp_number == emp_number)
+    if not conditions:
+        return None
+    result = await db.execute(select(User.email, User.emp_number).where(or_(*conditions)).limit(2))
+    rows = result.all()
+    if any(row.email == email for row in rows):
+        return "email"
+    if any(row.emp_number == emp_number for row in rows):
+        return "emp_number"
+    return None
+
+# 이메일로 사용자 조회 (비동기)
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    return result.scalars().first()
+
+# 사원번호로 사용자 조회 (비동기)
+async def get_user_by_emp_number_async(db: AsyncSession, emp_number: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.emp_number == emp_number).limit(1))
+    return result.scalars().first()
+
+# user_id로 사용자 조회 (비동기)
+async def get_user_by_id_async(db: AsyncSession, user_id: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.user_id == str(user_id)).limit(1))
+    return result.scalars().first()
+
+# 사용자 탈퇴 (소프트 삭제) 서비스 (비동기)
+async def deactivate_user_async(db: AsyncSession, db_user: User):
+    db_user.is_deleted = True
+    db.add(db_user)
+    await db.flush()
+    _after_user_change(db, db_user)
+
+# 사용자 비밀번호 업데이트 서비스 (비동기)
+async def update_user_password_async(db: AsyncSession, user_id: UUID, new_password: str) -> Optional[User]:
+    """주어진 user_id에 해당하는 사용자의 비밀번호를 업데이트합니다."""
+    user = await get_user_by_id_async(db, user_id)
+    if user:
+        user.password_hash = await get_password_hash_async(new_password)
+        db.add(user)
+        await db.flush()
+        _after_user_change(db, user)
+        return user
+    return None
+
+
+# ----------------------------------------------------
+# 관리자 사용자 목록 (키셋 페이지네이션)
+# ----------------------------------------------------
+
+class InvalidCursorError(Exception):
+    """목록 조회 cursor 값을 해석할 수 없을 때 발생합니다."""
+
+
+def encode_user_cursor(user_id: str) -> str:
+    return base64.urlsafe_b64encode(user_id.encode()).decode().rstrip("=")
+
+def decode_user_cursor(cursor: str) -> str:
+    try:
+        user_id = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid cursor")
+    if not user_id:
+        raise InvalidCursorError("Invalid cursor")
+    return user_id
+
+def _prefix_pattern(prefix: str) -> str:
+    # LIKE 와일드카드를 이스케이프하여 입력값 그대로 접두어로만 비교합니다.
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+async def list_users_async(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    is_deleted: Optional[bool] = None,
+    name_prefix: Optional[str] = None,
+    email_prefix: Optional[str] = None,
+    emp_number_prefix: Optional[str] = None,
+) -> tuple[list[User], Optional[str]]:
+    """
+    최근 가입 순 (created_at, user_id 내림차순) 으로 사용자를 조회합니다.
+    OFFSET 대신 이전 페이지 마지막 행 뒤부터 읽으므로 페이지가 뒤로 가도 조회 비용이 일정합니다.
+    반환: (사용자 목록, 다음 페이지 cursor 또는 None)
+    """
+    stmt = select(User)
+    if is_deleted is not None:
+        stmt = stmt.where(User.is_deleted == is_deleted)
+    if name_prefix:
+        stmt = stmt.where(User.name.like(_prefix_pattern(name_prefix), escape="\\"))
+    if email_prefix:
+        stmt = stmt.where(User.email.like(_prefix_pattern(email_prefix), escape="\\"))
+    if emp_number_prefix:
+        stmt = stmt.where(User.emp_number.like(_prefix_pattern(emp_number_prefix), escape="\\"))
+    if cursor:
+        # cursor 는 이전 페이지 마지막 사용자의 user_id 입니다. 그 행의 created_at 은 DB 안에서 비교하여
+        # 드라이버별 날짜 형식 차이로 같은 시각의 행이 중복/누락되지 않도록 합니다.
+        last_user_id = decode_user_cursor(cursor)
+        last_created_at = select(User.created_at).where(User.user_id == last_user_id).scalar_subquery()
+        stmt = stmt.where(tuple_(User.created_at, User.user_id) < tuple_(last_created_at, last_user_id))
+
+    stmt = stmt.order_by(User.created_at.desc(), User.user_id.desc()).limit(limit + 1)
+    users = list((await db.execute(stmt)).scalars().all())
+    if cursor and not users:
+        # cursor 의 행이 없으면 (삭제되었거나 다른 DB 의 cursor) 위 비교가 NULL 이 되어 항상 빈 페이지가 되므로,
+        # 목록의 끝과 구분하여 오류로 알립니다. (빈 페이지일 때만 확인하므로 일반적인 페이지 조회에는 쿼리가 늘지 않음)
+        exists = await db.execute(select(User.user_id).where(User.user_id == last_user_id).limit(1))
+        if exists.first() is None:
+            raise InvalidCursorError("Cursor does not refer to an existing user")
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_user_cursor(users[-1].user_id)
+    return users, next_cursor
@@ -1,22 +1,24 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Annotated
 
 from jose import JWTError, jwt # JWT (JSON Web Token) 처리를 위한 라이브러리
-from passlib.context import CryptContext # 비밀번호 해싱을 위한 라이브러리
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer # OAuth2 패스워드 플로우를 위한 유틸리티
 
 from ..schemas.user import TokenData # JWT 페이로드 스키마 임포트
-from ..database import get_db # DB 세션을 가져오는 함수 임포트
+from ..read_replica import get_read_db, read_from_primary, replica_router # 조회 전용 세션 (복제본 설정 시 복제본에서 조회)
 from ..models.user import User # DB 모델 임포트 (get_current_user에서 사용)
-from sqlalchemy.orm import Session # Session 타입 힌트
-import os
-from dotenv import load_dotenv
-load_dotenv()
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession # AsyncSession 타입 힌트
+from .password_hasher import pwd_context, password_hasher # 비밀번호 해싱 컨텍스트 및 프로세스 풀 해싱 서비스
+from .principal_cache import AuthenticatedUser, principal_cache # 인증된 사용자 캐시
+from .metrics import JWT_DURATION
+from ..services.token_revocation_service import token_revocation_store # 폐기된 토큰(jti) 목록
+import uuid
+from ..config import Settings, request_settings
 
 # --- 1. 비밀번호 해싱 및 검증 설정 ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# 동기 버전은 스크립트 등 이벤트 루프 밖에서만 사용합니다.
 def get_password_hash(password: str) -> str:
     """주어진 비밀번호를 해싱하여 반환합니다."""
     return pwd_context.hash(password)
@@ -25,15 +27,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """평문 비밀번호와 해싱된 비밀번호를 비교하여 일치 여부를 반환합니다."""
     return pwd_context.verify(plain_password, hashed_password)
 
+# async 라우트에서는 아래 함수를 await 하여 이벤트 루프를 막지 않도록 합니다.
+async def get_password_hash_async(password: str) -> str:
+    """프로세스 풀에서 비밀번호를 해싱하여 반환합니다."""
+    return await password_hasher.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """프로세스 풀에서 평문 비밀번호와 해싱된 비밀번호를 비교합니다."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
 # --- 2. JWT (JSON Web Token) 설정 ---
-SECRET_KEY = os.getenv("SECRET_KEY")
+# 서명 키는 앱 설정(Settings.secret_key)에서 가져와 호출할 때 넘깁니다.
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 120
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(data: dict, secret_key: str, expires_delta: Optional[timedelta] = None) -> str:
     """JWT 액세스 토큰을 생성합니다."""
     to_encode = data.copy()
     if expires_delta:
@@ -42,26 +53,36 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         # UTC 시간을 기준으로 만료 시간을 설정합니다.
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire}) # "exp" (expiration time) 클레임 추가
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # 로그아웃/탈퇴 시 이 토큰만 폐기할 수 있도록 고유 ID (jti) 와 발급 시각 (iat) 추가
+    to_encode.update({"jti": uuid.uuid4().hex, "iat": datetime.utcnow()})
+    with JWT_DURATION.time(operation="encode"):
+        encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 # --- 3. 현재 사용자 가져오기 (인증 및 인가) ---
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], # 헤더에서 토큰 추출
-    db: Annotated[Session, Depends(get_db)] # DB 세션 주입
-) -> User:
+async def authenticate_token(token: str, db: AsyncSession, secret_key: str) -> tuple[dict, AuthenticatedUser]:
     """
     JWT 토큰을 검증하고, 토큰에서 사용자 정보를 추출하여
-    현재 인증된 사용자(User ORM 모델 인스턴스)를 반환합니다.
+    (검증된 클레임, 현재 인증된 사용자(User 행의 읽기 전용 사본)) 를 반환합니다.
+    같은 토큰으로 최근에 검증된 적이 있으면 캐시에서 바로 반환하여 DB 조회를 생략합니다.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    cached = principal_cache.lookup(token)
+    if cached is not None:
+        claims, cached_user = cached
+        if token_revocation_store.is_revoked(claims.get("jti")): # 메모리 조회 (DB 조회 없음)
+            raise credentials_exception
+        return claims, cached_user
+
     try:
         # 토큰 디코딩 및 검증
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with JWT_DURATION.time(operation="decode"):
+            payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
         # Pydantic 모델로 페이로드 유효성 검사
         token_data = TokenData.model_validate(payload)
 
@@ -69,14 +90,68 @@ async def get_current_user(
         if token_data.sub is None:
             raise credentials_exception
 
+        # 로그아웃/탈퇴로 폐기된 토큰 (jti 가 없는 이전 토큰은 만료될 때까지 허용)
+        if token_revocation_store.is_revoked(payload.get("jti")):
+            raise credentials_exception
+
     except JWTError: # 토큰이 유효하지 않거나 만료되었을 때
         raise credentials_exception
 
     # JWT의 'sub' 클레임 (emp_number)를 사용하여 DB에서 사용자 조회
-    user = db.query(User).filter(User.emp_number == token_data.sub).first()
+    query = select(User).where(User.emp_number == token_data.sub).limit(1)
+    user = (await db.execute(query)).scalars().first()
+    # 복제 지연 대비: 복제본에 아직 없거나 (방금 가입) 이 워커에서 방금 변경한 사용자는 주 DB 에서 다시 조회
+    if (user is None or replica_router.is_pinned(user.user_id)) and await read_from_primary(db):
+        user = (await db.execute(query)).scalars().first()
     
     # 사용자가 없거나, 삭제된 계정이라면 인증 실패
     if user is None or user.is_deleted:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    current_user = AuthenticatedUser.from_user(user)
+    principal_cache.put(token, payload, current_user)
+    return payload, current_user
+
+# 요청마다 한 번만 실행됩니다. (FastAPI 가 같은 요청의 의존성 결과를 재사용)
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)], # 헤더에서 토큰 추출
+    db: Annotated[AsyncSession, Depends(get_read_db)], # 조회 전용 비동기 DB 세션 주입
+    settings: Annotated[Settings, Depends(request_settings)],
+) -> tuple[dict, AuthenticatedUser]:
+    return await authenticate_token(token, db, settings.secret_key)
+
+async def get_current_user(
+    principal: Annotated[tuple[dict, AuthenticatedUser], Depends(get_current_principal)]
+) -> AuthenticatedUser:
+    """현재 인증된 사용자를 반환합니다."""
+    return principal[1]
+
+async def get_current_token_claims(
+    principal: Annotated[tuple[dict, AuthenticatedUser], Depends(get_current_principal)]
+) -> dict:
+    """
+    검증된 현재 토큰의 클레임 (jti, exp 등) 을 반환합니다. 로그아웃 등 토큰 자체를 다룰 때 사용합니다.
+    get_current_user 와 같은 검증 결과를 사용하므로 토큰을 다시 디코딩하지 않습니다.
+    """
+    return principal[0]
+
+async def revoke_token(db: AsyncSession, claims: dict, user_id: str) -> None:
+    """토큰을 폐기 목록에 추가합니다. (jti 가 없는 이전 토큰은 폐기할 수 없음)"""
+    jti = claims.get("jti")
+    if jti is None:
+        return
+    expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+    await token_revocation_store.revoke(db, jti, user_id, expires_at)
+
+# --- 4. 관리자 권한 확인 ---
+async def require_admin(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    settings: Annotated[Settings, Depends(request_settings)],
+) -> AuthenticatedUser:
+    """현재 사용자가 관리자(Settings.admin_emp_numbers, 예: ADMIN_EMP_NUMBERS=A0001,A0002)가 아니면 403 을 반환합니다."""
+    if current_user.emp_number not in settings.admin_emp_numbers:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
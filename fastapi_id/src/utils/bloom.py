@@ -0,0 +1,48 @@
+# src/utils/bloom.py
+#
+# 존재 여부 필터 (Bloom filter). "없음" 은 확실하고 "있을 수도 있음" 은 error_rate 확률로 틀릴 수 있습니다.
+# 값을 지울 수는 없으므로, 지워진 값은 다시 만들 때까지 "있을 수도 있음" 으로 남습니다.
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 최적 비트 수 m = -n ln(p) / (ln 2)^2, 해시 수 k = (m / n) ln 2
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        # 해시 한 번(128비트)을 둘로 나눠 k 개의 위치를 만듭니다. (double hashing)
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def saturated(self) -> bool:
+        """설계 용량을 넘겨 오탐률이 error_rate 보다 높아졌으면 True (더 큰 필터로 다시 만들 때)"""
+        return self.count > self.capacity
+
+    def stats(self) -> dict:
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bytes": len(self._bits),
+            "hashes": self.num_hashes,
+        }
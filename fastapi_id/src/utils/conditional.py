@@ -0,0 +1,131 @@
+# src/utils/conditional.py
+#
+# 조건부 GET (ETag / Last-Modified → 304 Not Modified)
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 304 응답에서 빼는 헤더 (본문이 없으므로)
+_BODY_HEADERS = ("content-length", "content-type", "content-encoding", "transfer-encoding")
+
+
+def weak_etag(*parts) -> str:
+    """행 식별자와 버전(updated_at 등)으로 약한 ETag 를 만듭니다. 본문을 직렬화하지 않고 계산할 수 있습니다."""
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    UTC 기준 aware datetime 으로 바꿉니다. SQLite 는 시간대 정보 없이(UTC 로 저장된 값), PostgreSQL 은 aware 로 반환하므로
+    검증자를 만들기 전에 맞춰야 같은 행이 DB 에 따라 다른 ETag 를 갖지 않습니다.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return formatdate(as_utc(value).timestamp(), usegmt=True)
+
+
+def version_validators(resource_id, updated_at: datetime) -> dict:
+    """행의 (식별자, 수정 시각) 으로 ETag 와 Last-Modified 를 만듭니다. 두 값 모두 UTC 로 맞춘 수정 시각을 사용합니다."""
+    updated_at = as_utc(updated_at)
+    return {"ETag": weak_etag(resource_id, updated_at.isoformat()), "Last-Modified": http_date(updated_at)}
+
+
+def validators_match(
+    etag: Optional[str],
+    last_modified: Optional[str],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """
+    클라이언트의 검증자가 현재 표현과 일치하면 True (304 를 보내도 됨).
+    If-None-Match 가 있으면 ETag 만 약한 비교로 확인하고, 없을 때만 If-Modified-Since 를 봅니다. (RFC 9110 13.2.2)
+    """
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class NotModified(Exception):
+    """
+    라우트에서 본문을 만들기 전에 검증자가 일치하면 발생시킵니다. main.py 의 핸들러가 304 로 변환하므로
+    변경되지 않은 응답은 직렬화도 본문 전송도 하지 않습니다.
+    """
+
+    def __init__(self, headers: dict):
+        super().__init__("Not Modified")
+        self.headers = headers
+
+
+def check_not_modified(request_headers: Headers, headers: dict) -> None:
+    """headers 에 ETag/Last-Modified 를 담아 넘기면, 요청의 검증자와 일치할 때 NotModified 를 발생시킵니다."""
+    if validators_match(
+        headers.get("ETag"),
+        headers.get("Last-Modified"),
+        request_headers.get("if-none-match"),
+        request_headers.get("if-modified-since"),
+    ):
+        raise NotModified(headers)
+
+
+class ConditionalGetMiddleware:
+    """
+    GET/HEAD 의 200 응답에 ETag 또는 Last-Modified 가 있고 요청의 검증자와 일치하면 본문 대신 304 를 보냅니다.
+    라우트가 검증자 헤더만 붙이면 별도 처리 없이 전송량을 줄일 수 있습니다.
+    (직렬화 비용까지 줄이려면 라우트에서 check_not_modified 를 먼저 호출)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_none_match is None and if_modified_since is None:
+            await self.app(scope, receive, send)
+            return
+
+        not_modified = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal not_modified
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message["headers"]))
+                if message["status"] == 200 and validators_match(
+                    headers.get("etag"), headers.get("last-modified"), if_none_match, if_modified_since
+                ):
+                    not_modified = True
+                    for name in _BODY_HEADERS:
+                        if name in headers:
+                            del headers[name]
+                    await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+            elif not_modified:
+                return # 본문은 버림
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
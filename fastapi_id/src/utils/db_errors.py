@@ -0,0 +1,42 @@
+# src/utils/db_errors.py
+#
+# IntegrityError 에서 위반된 UNIQUE 제약을 찾아 사용자에게 보여줄 메시지로 바꿉니다.
+
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+# 제약(인덱스) 이름 또는 SQLite 의 "테이블.컬럼" → 409 응답 메시지
+# (unique=True, index=True 컬럼은 SQLAlchemy 가 ix_<테이블>_<컬럼> 이름의 UNIQUE 인덱스로 만듭니다)
+UNIQUE_VIOLATION_MESSAGES = {
+    "ix_Users_email": "Email already registered",
+    "Users.email": "Email already registered",
+    "ix_Users_emp_number": "Employee number already registered",
+    "Users.emp_number": "Employee number already registered",
+}
+
+
+def _constraint_name(exc: IntegrityError) -> Optional[str]:
+    orig = exc.orig
+    # psycopg2: orig.diag.constraint_name / asyncpg: SQLAlchemy 어댑터 예외의 __cause__.constraint_name
+    for source in (getattr(orig, "diag", None), getattr(orig, "__cause__", None), orig):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name
+    return None
+
+
+def unique_violation_message(exc: IntegrityError) -> Optional[str]:
+    """알려진 UNIQUE 제약 위반이면 해당 메시지, 아니면 None"""
+    name = _constraint_name(exc)
+    if name is not None:
+        return UNIQUE_VIOLATION_MESSAGES.get(name)
+    # SQLite: "UNIQUE constraint failed: Users.email" (제약 이름 정보가 없음)
+    text = str(exc.orig)
+    if "UNIQUE constraint failed:" in text:
+        columns = text.split("UNIQUE constraint failed:", 1)[1].split(",")
+        for column in columns:
+            message = UNIQUE_VIOLATION_MESSAGES.get(column.strip())
+            if message is not None:
+                return message
+    return None
@@ -0,0 +1,113 @@
+# src/utils/db_pool_monitor.py
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+
+class PoolStats:
+    """커넥션 풀 하나의 체크아웃 대기 시간, 사용 중/오버플로 연결 수를 집계합니다."""
+
+    def __init__(self, name: str, pool_size: int, max_overflow: int):
+        self.name = name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.slow_checkouts = 0 # 100ms 이상 기다린 체크아웃 수
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if seconds >= 0.1:
+                self.slow_checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_checkout(self) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    @property
+    def capacity(self) -> int:
+        return self.pool_size + max(0, self.max_overflow)
+
+    @property
+    def saturation(self) -> float:
+        """사용 중인 연결 수 / 풀이 열 수 있는 최대 연결 수 (0.0 ~ 1.0)"""
+        return min(1.0, self.in_use / self.capacity) if self.capacity else 0.0
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            stats = {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "saturation": round(self.saturation, 3),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_wait_ms": (self.total_wait_seconds / self.checkouts * 1000) if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+        # QueuePool 계열에서만 제공되는 값
+        for attr in ("checkedin", "overflow"):
+            if hasattr(pool, attr):
+                stats[attr] = getattr(pool, attr)()
+        return stats
+
+
+class _MonitoredPoolMixin:
+    pool_stats: PoolStats
+
+    def _do_get(self):
+        # 풀에서 연결을 얻기까지 기다린 시간 (풀이 가득 차면 pool_timeout 까지 대기)
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.pool_stats.record_timeout()
+            raise
+        self.pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def monitored_pool_class(base: type, stats: PoolStats) -> type:
+    """
+    체크아웃 대기 시간을 기록하는 풀 클래스를 만듭니다.
+    engine.dispose() 등으로 풀이 다시 만들어져도 같은 클래스(같은 stats)가 사용됩니다.
+    """
+    # __module__ 을 원래 풀 클래스와 같게 두어 SQLAlchemy 풀 로그가 sqlalchemy.pool 로거 아래에 남도록 합니다.
+    return type(
+        f"Monitored{base.__name__}", (_MonitoredPoolMixin, base), {"pool_stats": stats, "__module__": base.__module__}
+    )
+
+
+def attach_pool_events(sync_engine, stats: PoolStats) -> None:
+    """checkout/checkin 이벤트로 사용 중인 연결 수를 추적합니다."""
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.on_checkout()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.on_checkin()
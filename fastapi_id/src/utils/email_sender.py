@@ -1,45 +1,149 @@
 # src/utils/email_sender.py
 
+import logging
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
-import os
-from dotenv import load_dotenv
+from typing import Optional
+from ..config import Settings, get_settings
+from .metrics import SMTP_SEND_DURATION
 
-load_dotenv() # .env 파일 로드
+logger = logging.getLogger(__name__)
 
-# TODO: .env 파일에 다음 환경 변수들을 설정해야 합니다!
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587)) # 대부분의 SMTP는 587 (TLS) 또는 465 (SSL)
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD") # 앱 비밀번호 (앱 암호) 사용 권장
+# TODO: .env 파일에 SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL 을 설정해야 합니다!
+# (기본값과 설명은 config.Settings 참고. 앱에서는 create_app 에 넘긴 설정으로 발신기를 만듭니다)
 
-# 이메일 발신 주소
-SENDER_EMAIL = os.getenv("SENDER_EMAIL", "your_email@example.com") # 보내는 사람 이메일 주소
+def _build_message(sender_email: str, to_email: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body, 'html') # HTML 형식으로 보낼 수 있도록 'html' 지정
+    msg['Subject'] = subject
+    msg['From'] = sender_email
+    msg['To'] = to_email
+    return msg
 
-def send_email(to_email: str, subject: str, body: str):
+def send_email(to_email: str, subject: str, body: str, settings: Optional[Settings] = None):
     """
-    지정된 이메일 주소로 이메일을 전송합니다.
+    지정된 이메일 주소로 이메일을 전송합니다. (settings 가 없으면 환경 변수 설정 사용)
     """
-    if not SMTP_USERNAME or not SMTP_PASSWORD:
-        print("경고: SMTP 사용자 이름 또는 비밀번호가 설정되지 않아 이메일을 보낼 수 없습니다.")
+    settings = settings or get_settings()
+    if not settings.smtp_username or not settings.smtp_password:
+        logger.warning("SMTP 사용자 이름 또는 비밀번호가 설정되지 않아 이메일을 보낼 수 없습니다.")
         return False # 이메일 전송 실패
 
     try:
-        msg = MIMEText(body, 'html') # HTML 형식으로 보낼 수 있도록 'html' 지정
-        msg['Subject'] = subject
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = to_email
-
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls() # TLS 보안 시작
-            server.login(SMTP_USERNAME, SMTP_PASSWORD) # SMTP 서버 로그인
-            server.send_message(msg) # 이메일 전송
-        print(f"이메일 전송 성공: '{subject}' to {to_email}")
+        msg = _build_message(settings.sender_email, to_email, subject, body)
+
+        with SMTP_SEND_DURATION.time(result="direct"):
+            with smtplib.SMTP(settings.smtp_server, settings.smtp_port) as server:
+                server.starttls() # TLS 보안 시작
+                server.login(settings.smtp_username, settings.smtp_password) # SMTP 서버 로그인
+                server.send_message(msg) # 이메일 전송
+        logger.info("이메일 전송 성공", extra={"subject": subject})
         return True
-    except Exception as e:
-        print(f"이메일 전송 실패: {e}")
+    except Exception:
+        logger.exception("이메일 전송 실패")
         return False
 
+class PersistentSMTPSender:
+    """
+    한 번 연결 + STARTTLS + 로그인한 SMTP 세션을 여러 메시지에 재사용하는 발신기입니다.
+    연결이 끊겨 있으면 다시 연결하며, 한 인스턴스는 한 번에 한 스레드에서만 사용됩니다.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        sender_email: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        idle_check_seconds: float = 30,
+    ):
+        self.server = server
+        self.port = port
+        self.sender_email = sender_email
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.idle_check_seconds = idle_check_seconds
+        self.connections_opened = 0
+        self._conn: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "PersistentSMTPSender":
+        return cls(
+            server=settings.smtp_server,
+            port=settings.smtp_port,
+            sender_email=settings.sender_email,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            idle_check_seconds=settings.smtp_idle_check_seconds,
+        )
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.server, self.port, timeout=30)
+        if self.use_tls:
+            conn.starttls() # TLS 보안 시작
+        if self.username and self.password:
+            conn.login(self.username, self.password) # SMTP 서버 로그인
+        self.connections_opened += 1
+        return conn
+
+    def _ensure_connection(self) -> smtplib.SMTP:
+        if self._conn is not None and time.monotonic() - self._last_used > self.idle_check_seconds:
+            try:
+                if self._conn.noop()[0] != 250:
+                    self._discard()
+            except smtplib.SMTPException:
+                self._discard()
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def send(self, to_email: str, subject: str, body: str) -> None:
+        """메시지를 전송합니다. 실패하면 예외를 그대로 발생시킵니다."""
+        msg = _build_message(self.sender_email, to_email, subject, body)
+        started = time.perf_counter()
+        with self._lock:
+            try:
+                self._ensure_connection().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # 서버가 유휴 연결을 끊은 경우 한 번만 다시 연결하여 재시도
+                self._discard()
+                try:
+                    self._ensure_connection().send_message(msg)
+                except (smtplib.SMTPException, OSError):
+                    self._discard()
+                    SMTP_SEND_DURATION.observe(time.perf_counter() - started, result="error")
+                    raise
+            except (smtplib.SMTPException, OSError):
+                self._discard()
+                SMTP_SEND_DURATION.observe(time.perf_counter() - started, result="error")
+                raise
+            self._last_used = time.monotonic()
+        SMTP_SEND_DURATION.observe(time.perf_counter() - started, result="ok")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.quit()
+                except Exception:
+                    pass
+                self._conn = None
+
 # 사용 예시 (개발 테스트용)
 if __name__ == "__main__":
     # .env 파일에 SMTP 설정이 되어있어야 합니다.
@@ -0,0 +1,171 @@
+# src/utils/logging_config.py
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from ..config import Settings
+
+# --- 1. 로깅 설정 ---
+# 레벨, 형식(json/text), 큐 크기, DEBUG 샘플링 비율은 Settings 의 log_* 값을 사용합니다. (LOG_LEVEL, LOG_FORMAT 등)
+# 라이브러리 로거(SQLAlchemy, httpx 등)의 레벨은 LOG_LIBRARY_LEVEL 로 분리하여, LOG_LEVEL=DEBUG 로 앱 로그를 볼 때
+# 라이브러리 로그까지 쏟아지지 않도록 합니다.
+_LIBRARY_LOGGERS = ("sqlalchemy", "aiosqlite", "asyncio", "httpx", "httpcore", "passlib", "multipart")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성 (extra 로 넘긴 필드만 JSON 에 추가하기 위해 제외)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """클라이언트가 보낸 요청 ID 가 적당한 길이면 그대로 쓰고, 아니면 새로 만듭니다."""
+    if incoming and len(incoming) <= 128:
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestIdFilter(logging.Filter):
+    """현재 요청 ID 를 레코드에 붙입니다. (QueueHandler 에 붙여 요청 처리 중인 컨텍스트에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG 레코드는 sample_rate 비율만 통과시키고, INFO 이상은 모두 통과시킵니다."""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 한 줄짜리 JSON 으로 변환합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    큐가 가득 차면 기다리지 않고 레코드를 버립니다. (버린 개수는 stats() 로 확인)
+    실제 출력은 QueueListener 의 백그라운드 스레드에서 이루어집니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 포매터로 메시지 전체(트레이스백 포함)를 합쳐 버리므로,
+        # 메시지 인자만 미리 합치고 트레이스백은 exc_text 로 따로 남깁니다.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(settings: Settings) -> None:
+    """루트 로거에 큐 핸들러를 설치하고 백그라운드 출력 스레드를 시작합니다. (여러 번 호출해도 한 번만 설정)"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size) # 가득 차면 요청을 막지 않고 로그를 버립니다.
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(DebugSamplingFilter(settings.log_debug_sample_rate))
+    _queue_handler.addFilter(RequestIdFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level)
+    root.addHandler(_queue_handler)
+    for name in _LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(settings.log_library_level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_after_fork() -> None:
+    # 포크된 자식(gunicorn --preload 워커 등)에는 부모의 출력 스레드가 없으므로 새 큐와 스레드로 다시 시작합니다.
+    # (부모 스레드가 큐의 잠금을 잡은 채로 포크되었을 수 있으므로 큐도 새로 만듦)
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력한 뒤 백그라운드 스레드를 멈춥니다."""
+    global _queue_handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def stats() -> dict:
+    if _queue_handler is None:
+        return {"queue_depth": 0, "dropped": 0}
+    return {"queue_depth": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
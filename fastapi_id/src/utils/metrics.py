@@ -0,0 +1,249 @@
+# src/utils/metrics.py
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(label_names: tuple, label_values: tuple, extra: Optional[dict] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs += [f'{name}="{_escape(value)}"' for name, value in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            lines += self._render_samples()
+        return lines
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값별 [구간별 개수..., 합계, 전체 개수]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록의 실행 시간을 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_samples(self) -> list[str]:
+        lines = []
+        for key, series in self._series.items():
+            cumulative = 0
+            for i, upper in enumerate(self.buckets):
+                cumulative += series[i]
+                labels = _format_labels(self.label_names, key, {"le": _format_value(upper)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key, {"le": "+Inf"})
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    메트릭을 모아 Prometheus 텍스트 형식으로 출력합니다.
+    collector 는 스크랩 시점에 호출되어 각 컴포넌트의 stats() 값을 게이지로 내보냅니다.
+    """
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[tuple[str, Callable[[], dict]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Iterable[str] = (), buckets: tuple = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def add_stats_collector(self, prefix: str, collect: Callable[[], dict]) -> None:
+        """stats() 딕셔너리의 숫자 값을 '<prefix>_<키>' 게이지로 내보냅니다. (중첩 딕셔너리는 키를 이어 붙임)"""
+        self._collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for prefix, collect in self._collectors:
+            try:
+                stats = collect()
+            except Exception:
+                continue
+            for name, value in _flatten(prefix, stats):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(prefix: str, stats: dict) -> list[tuple[str, float]]:
+    samples = []
+    for key, value in stats.items():
+        name = f"{prefix}_{key}".replace("-", "_").replace(".", "_")
+        if isinstance(value, bool):
+            samples.append((name, 1 if value else 0))
+        elif isinstance(value, (int, float)):
+            samples.append((name, value))
+        elif isinstance(value, dict):
+            samples += _flatten(name, value)
+    return samples
+
+
+registry = MetricsRegistry()
+
+# --- HTTP ---
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "http_requests_total", "Total HTTP requests.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("method",)
+)
+
+# --- 핫 패스 타이머 ---
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify latency including pool queueing.", ("operation",)
+)
+JWT_DURATION = registry.histogram(
+    "jwt_duration_seconds", "JWT encode/decode latency.", ("operation",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time.", ("engine",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+SMTP_SEND_DURATION = registry.histogram(
+    "smtp_send_duration_seconds", "SMTP message send time (including reconnects).", ("result",)
+)
+
+
+def route_label(scope: dict) -> str:
+    """
+    요청이 매칭된 라우트 템플릿(예: /auth/mypage)을 반환합니다.
+    실제 경로 대신 템플릿을 라벨로 사용하여 경로 파라미터 때문에 라벨 수가 늘어나지 않도록 합니다.
+    """
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_format"):
+        return "unmatched"
+    # include_router(prefix=...) 로 등록된 라우트는 route.path 에 prefix 가 빠져 있을 수 있으므로
+    # 요청 경로에서 라우트가 매칭된 부분을 제외한 앞부분을 prefix 로 붙입니다.
+    path = scope.get("path", "")
+    try:
+        concrete = route.path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError):
+        return route.path
+    prefix = path[: len(path) - len(concrete)] if concrete and path.endswith(concrete) else ""
+    return prefix + route.path
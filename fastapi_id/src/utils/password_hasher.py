@@ -0,0 +1,202 @@
+# src/utils/password_hasher.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from passlib.context import CryptContext # 비밀번호 해싱을 위한 라이브러리
+
+from ..config import get_settings
+from .metrics import PASSWORD_HASH_DURATION
+
+# --- 1. 해싱 워커 설정 ---
+# bcrypt 한 번에 100~300ms 가 걸리므로 이벤트 루프가 아닌 별도 프로세스 풀에서 실행합니다.
+PASSWORD_HASH_WORKERS = get_settings().password_hash_workers
+PASSWORD_HASH_MAX_QUEUE = get_settings().password_hash_max_queue # 대기 + 실행 중 작업 최대 개수
+PASSWORD_HASH_TIMEOUT_SECONDS = get_settings().password_hash_timeout_seconds # 호출당 최대 대기 시간
+
+# --- 2. 해시 방식 / 비용 설정 ---
+# 첫 번째 방식으로 새 해시를 만들고, 나머지는 검증만 합니다. (예: argon2,bcrypt → 로그인 시 bcrypt 해시를 argon2 로 교체)
+# 적절한 값은 python -m src.cli.calibrate_password_hash 로 측정합니다.
+PASSWORD_HASH_SCHEMES = get_settings().password_hash_schemes
+PASSWORD_BCRYPT_ROUNDS = get_settings().password_bcrypt_rounds # passlib 기본값과 동일
+PASSWORD_ARGON2_TIME_COST = get_settings().password_argon2_time_cost
+PASSWORD_ARGON2_MEMORY_COST = get_settings().password_argon2_memory_cost # KiB
+PASSWORD_ARGON2_PARALLELISM = get_settings().password_argon2_parallelism
+
+
+def build_crypt_context(
+    schemes: Sequence[str],
+    bcrypt_rounds: int = PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost: int = PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost: int = PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism: int = PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    설정한 비용과 다른 해시(비용이 더 낮거나 높은 bcrypt, 기본 방식이 아닌 해시)는 needs_update() 가 True 가 되도록
+    min/max_desired 값을 같은 값으로 고정합니다.
+    """
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_desired_rounds=bcrypt_rounds,
+        bcrypt__max_desired_rounds=bcrypt_rounds,
+        argon2__rounds=argon2_time_cost,
+        argon2__min_desired_rounds=argon2_time_cost,
+        argon2__max_desired_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+def describe_hash(hashed_password: str) -> tuple[str, str]:
+    """해시 문자열에서 (방식, 비용) 을 읽습니다. 예) ('bcrypt', '12'), ('argon2', 'm=65536,t=3,p=4')"""
+    parts = hashed_password.split("$")
+    if hashed_password.startswith("$2") and len(parts) > 2:
+        return "bcrypt", parts[2]
+    if hashed_password.startswith("$argon2") and len(parts) > 3:
+        return "argon2", parts[3]
+    return "unknown", ""
+
+
+pwd_context = build_crypt_context(PASSWORD_HASH_SCHEMES)
+
+
+class PasswordHasherUnavailableError(Exception):
+    """해싱 대기열이 가득 찼거나 제한 시간 안에 결과를 받지 못했을 때 발생합니다."""
+
+
+# 프로세스 풀에서 실행되는 함수들 (pickle 가능하도록 모듈 최상위에 정의)
+def _hash_in_worker(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_in_worker(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _hash_many_in_worker(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+def _warm_up_in_worker() -> int:
+    pwd_context.hash("warm-up") # bcrypt 백엔드 로드 및 첫 해싱
+    return os.getpid()
+
+
+class PasswordHasher:
+    """
+    bcrypt 해싱/검증을 프로세스 풀에서 실행하는 비동기 서비스입니다.
+    대기열 길이를 제한하고, 호출마다 제한 시간을 두며, 대기열 깊이와 지연 시간을 집계합니다.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._pending_lock = threading.Lock() # 완료 콜백은 풀의 관리 스레드에서 실행됩니다.
+        self._max_pending_seen = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def warm_up(self) -> int:
+        """
+        워커 프로세스를 모두 미리 띄우고 각 워커에서 bcrypt 를 한 번 실행합니다.
+        첫 로그인 요청이 프로세스 생성과 모듈 import 비용을 떠안지 않도록 startup 에서 호출합니다.
+        워커 수만큼 동시에 제출해야 풀이 워커를 모두 생성하므로, 준비된 워커 수(서로 다른 pid 수)를 반환합니다.
+        """
+        pids = await asyncio.gather(*[
+            self._submit("warm_up", _warm_up_in_worker) for _ in range(self.max_workers)
+        ])
+        return len(set(pids))
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", _hash_in_worker, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit("verify", _verify_in_worker, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: list[str], chunk_size: int = 8) -> list[str]:
+        """
+        대량 등록용: 비밀번호를 chunk_size 개씩 묶어 여러 워커에서 병렬로 해싱합니다.
+        로그인 등 일반 요청이 처리될 수 있도록 동시에 실행하는 묶음 수는 (워커 수 - 1) 로 제한합니다.
+        """
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        semaphore = asyncio.Semaphore(max(1, self.max_workers - 1))
+
+        async def run(chunk: list[str]) -> list[str]:
+            async with semaphore:
+                return await self._submit(
+                    "hash_batch", _hash_many_in_worker, chunk, timeout_seconds=self.timeout_seconds * len(chunk)
+                )
+
+        results = await asyncio.gather(*[run(chunk) for chunk in chunks])
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def _submit(self, operation: str, fn, *args, timeout_seconds: Optional[float] = None):
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherUnavailableError("Password hashing queue is full.")
+
+        self.start() # 스크립트 등에서 startup 이벤트 없이 호출된 경우를 위해 지연 생성
+        started = time.perf_counter()
+        job = self._executor.submit(fn, *args)
+        with self._pending_lock:
+            self._pending += 1
+            self._max_pending_seen = max(self._max_pending_seen, self._pending)
+        # 제한 시간이 지나거나 호출이 취소되어도 이미 실행 중인 작업은 워커에 남아 있으므로,
+        # 기다림이 끝난 시점이 아니라 작업이 실제로 끝나거나 (대기 중에) 취소된 시점에 대기열에서 뺍니다.
+        job.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=timeout_seconds or self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PasswordHasherUnavailableError("Password hashing timed out.")
+
+        elapsed = time.perf_counter() - started
+        self._completed += 1
+        self._total_latency += elapsed
+        self._max_latency = max(self._max_latency, elapsed)
+        PASSWORD_HASH_DURATION.observe(elapsed, operation=operation)
+        return result
+
+    def _release(self, _job) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """대기열 깊이 및 지연 시간 카운터를 반환합니다."""
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "queue_depth": max(0, self._pending - self.max_workers),
+            "max_in_flight_seen": self._max_pending_seen,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+            "avg_latency_ms": (self._total_latency / self._completed * 1000) if self._completed else 0.0,
+            "max_latency_ms": self._max_latency * 1000,
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    timeout_seconds=PASSWORD_HASH_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,147 @@
+# src/utils/principal_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from ..config import get_settings
+
+# 캐시 항목 유지 시간 (초). 워커 프로세스마다 캐시가 따로 있으므로
+# 다른 워커에서 일어난 변경은 최대 이 시간만큼 늦게 반영됩니다.
+PRINCIPAL_CACHE_TTL_SECONDS = get_settings().principal_cache_ttl_seconds
+PRINCIPAL_CACHE_MAX_ENTRIES = get_settings().principal_cache_max_entries
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """get_current_user 가 반환하는 User 행의 가벼운 읽기 전용 사본입니다."""
+    user_id: str
+    emp_number: str
+    email: str
+    name: str
+    phone: str
+    created_at: datetime
+    updated_at: datetime
+    is_deleted: bool
+    password_hash: str
+
+    @classmethod
+    def from_user(cls, user) -> "AuthenticatedUser":
+        return cls(
+            user_id=user.user_id,
+            emp_number=user.emp_number,
+            email=user.email,
+            name=user.name,
+            phone=user.phone,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            is_deleted=user.is_deleted,
+            password_hash=user.password_hash,
+        )
+
+
+@dataclass
+class _CacheEntry:
+    claims: dict
+    user: AuthenticatedUser
+    expires_at: float # time.monotonic() 기준
+
+
+class PrincipalCache:
+    """
+    검증된 JWT 클레임과 사용자 정보를 토큰 문자열 기준으로 보관하는 TTL + LRU 캐시입니다.
+    사용자 정보가 바뀌면 invalidate_user 로 해당 사용자의 모든 토큰 항목을 제거합니다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._tokens_by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, token: str) -> Optional[AuthenticatedUser]:
+        entry = self.lookup(token)
+        return entry[1] if entry is not None else None
+
+    def lookup(self, token: str) -> Optional[tuple[dict, AuthenticatedUser]]:
+        """캐시된 (JWT 클레임, 사용자) 를 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(token)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return entry.claims, entry.user
+
+    def put(self, token: str, claims: dict, user: AuthenticatedUser) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        # 토큰 자체의 만료 시각(exp)보다 오래 캐시하지 않습니다.
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, time.monotonic() + (float(exp) - time.time()))
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = _CacheEntry(claims=claims, user=user, expires_at=expires_at)
+            self._tokens_by_user.setdefault(user.user_id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest_token = next(iter(self._entries))
+                self._remove(oldest_token)
+                self._evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """해당 사용자의 캐시 항목을 모두 제거합니다."""
+        with self._lock:
+            tokens = self._tokens_by_user.pop(str(user_id), set())
+            for token in tokens:
+                self._entries.pop(token, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_user.get(entry.user.user_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry.user.user_id]
+
+    def stats(self) -> dict:
+        """캐시 적중/실패 통계를 반환합니다."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_entries=PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,155 @@
+# src/utils/query_profiler.py
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .metrics import registry, DB_QUERY_DURATION
+
+logger = logging.getLogger(__name__)
+
+# 느린 쿼리 기준(SLOW_QUERY_MS)과 요청당 쿼리 예산(QUERY_BUDGET_PER_REQUEST, QUERY_BUDGET_STRICT)은
+# Settings 에서 엔진을 만들 때(instrument_engine)와 요청이 끝날 때(finish_request_profile) 넘겨받습니다.
+
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "Number of SQL statements issued per HTTP request.", ("route",),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 12, 20, 50),
+)
+DB_REPEATED_QUERIES = registry.counter(
+    "db_repeated_queries_total", "Identical statements (same SQL and parameters) repeated within one request.", ("route",)
+)
+DB_SLOW_QUERIES = registry.counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+
+
+class QueryBudgetExceeded(Exception):
+    """요청 하나가 허용된 쿼리 수를 넘었을 때 (QUERY_BUDGET_STRICT=true) 발생합니다."""
+
+
+def redact_parameters(parameters) -> object:
+    """로그에 값이 남지 않도록 파라미터를 타입 이름으로 바꿉니다."""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(p) if isinstance(p, (dict, list, tuple)) else f"<{type(p).__name__}>" for p in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _parameters_key(parameters) -> str:
+    try:
+        return repr(parameters)
+    except Exception:
+        return str(id(parameters))
+
+
+class QueryProfile:
+    """요청(또는 with 블록) 하나에서 실행된 SQL 문 수와 시간을 집계합니다."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.statement_count = 0
+        self.total_seconds = 0.0
+        self.slow_statements: list[tuple[str, float]] = []
+        self._seen: dict[tuple[str, str], int] = {}
+
+    def record(self, statement: str, parameters, seconds: float, slow: bool = False) -> None:
+        self.statement_count += 1
+        self.total_seconds += seconds
+        key = (statement, _parameters_key(parameters))
+        self._seen[key] = self._seen.get(key, 0) + 1
+        if slow:
+            self.slow_statements.append((statement, seconds))
+
+    @property
+    def repeated_statements(self) -> list[tuple[str, int]]:
+        """같은 SQL + 같은 파라미터로 두 번 이상 실행된 문장과 횟수"""
+        return [(statement, count) for (statement, _), count in self._seen.items() if count > 1]
+
+    def summary(self) -> dict:
+        return {
+            "label": self.label,
+            "statements": self.statement_count,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "slow": len(self.slow_statements),
+            "repeated": [{"sql": sql, "count": count} for sql, count in self.repeated_statements],
+        }
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+@contextmanager
+def profile_queries(label: str = "", budget: Optional[int] = None):
+    """
+    with 블록 안에서 실행된 쿼리를 집계합니다. budget 을 넘으면 QueryBudgetExceeded 를 발생시킵니다.
+    예) with profile_queries("signup", budget=4) as profile: ...
+    """
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+    if budget is not None and profile.statement_count > budget:
+        raise QueryBudgetExceeded(
+            f"{label or 'block'} issued {profile.statement_count} statements (budget {budget}): {profile.summary()}"
+        )
+
+
+def finish_request_profile(profile: QueryProfile, route: str, budget: int = 0, strict: bool = False) -> None:
+    """
+    요청이 끝났을 때 메트릭을 기록하고 반복 쿼리와 예산 초과를 보고합니다.
+    budget 이 0 이면 예산을 검사하지 않고, strict 이면 예산 초과 시 QueryBudgetExceeded 를 발생시킵니다.
+    """
+    DB_QUERIES_PER_REQUEST.observe(profile.statement_count, route=route)
+    repeated = profile.repeated_statements
+    if repeated:
+        DB_REPEATED_QUERIES.inc(sum(count - 1 for _, count in repeated), route=route)
+        logger.warning("한 요청에서 같은 쿼리가 반복 실행됨", extra={"route": route, "repeated": repeated})
+    if budget and profile.statement_count > budget:
+        message = f"{route} issued {profile.statement_count} statements (budget {budget}): {profile.summary()}"
+        if strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning("쿼리 예산 초과 - %s", message)
+
+
+def instrument_engine(sync_engine, engine_name: str, slow_query_ms: float) -> None:
+    """
+    before/after_cursor_execute 이벤트로 쿼리 실행 시간을 메트릭에 기록하고,
+    현재 요청의 QueryProfile 에 쿼리를 추가합니다. slow_query_ms 이상 걸린 쿼리는 파라미터를 가린 채로 로그에 남깁니다.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profiler_query_start"].pop()
+        DB_QUERY_DURATION.observe(elapsed, engine=engine_name)
+        slow = elapsed * 1000 >= slow_query_ms
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, parameters, elapsed, slow)
+        if slow:
+            DB_SLOW_QUERIES.inc()
+            label = profile.label if profile is not None else "-"
+            logger.warning(
+                "느린 쿼리",
+                extra={
+                    "duration_ms": round(elapsed * 1000, 1),
+                    "label": label,
+                    "sql": " ".join(statement.split()),
+                    "params": redact_parameters(parameters),
+                },
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각을 정리합니다.
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profiler_query_start"):
+            conn.info["profiler_query_start"].pop()
@@ -0,0 +1,291 @@
+# src/utils/rate_limit.py
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from ..config import Settings, get_settings, request_settings
+from fastapi import Request
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    limit: int            # window_seconds 동안 허용되는 최대 요청 수
+    window_seconds: int
+
+    @classmethod
+    def parse(cls, name: str, value: str) -> "RateLimitPolicy":
+        # 형식: "<횟수>/<초>" (예: RATE_LIMIT_LOGIN="10/60")
+        limit, window = value.split("/")
+        return cls(name=name, limit=int(limit), window_seconds=int(window))
+
+
+def policies_from_settings(settings: Settings) -> dict[str, RateLimitPolicy]:
+    """라우트별 정책 (Settings.rate_limits). 키(IP, 사번, 이메일)마다 따로 집계됩니다."""
+    return {name: RateLimitPolicy.parse(name, value) for name, value in settings.rate_limits.items()}
+
+
+class RateLimitExceeded(Exception):
+    """허용 횟수를 초과했을 때 발생합니다. main.py 의 핸들러가 429 + Retry-After 로 변환합니다."""
+
+    def __init__(self, policy: RateLimitPolicy, retry_after: int):
+        super().__init__(f"Rate limit '{policy.name}' exceeded.")
+        self.policy = policy
+        self.retry_after = retry_after
+
+
+def _sliding_window_estimate(previous: int, current: int, fraction: float) -> float:
+    # 직전 윈도우 카운트를 현재 윈도우와 겹치는 비율만큼만 반영하는 sliding window counter
+    return previous * (1 - fraction) + current
+
+def _retry_after(previous: int, current: int, fraction: float, policy: RateLimitPolicy) -> int:
+    if current < policy.limit and previous > 0:
+        # 직전 윈도우의 반영 비율이 충분히 줄어들 때까지 기다리면 됩니다.
+        needed_fraction = 1 - (policy.limit - 1 - current) / previous
+        wait = (needed_fraction - fraction) * policy.window_seconds
+    else:
+        wait = (1 - fraction) * policy.window_seconds
+    return max(1, math.ceil(wait))
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        """요청을 허용하면 카운트를 올리고 None, 거부하면 Retry-After(초)를 반환합니다."""
+        ...
+
+    async def peek(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        """카운트를 올리지 않고, 다음 요청이 거부될 상태이면 Retry-After(초)를 반환합니다."""
+        ...
+
+    async def remove(self, key: str, policy: RateLimitPolicy) -> None:
+        """hit 으로 올린 현재 윈도우의 카운트를 하나 되돌립니다. (성공한 시도는 세지 않는 정책)"""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """워커 프로세스 메모리에 키별 (윈도우 번호, 현재 카운트, 직전 카운트)를 보관하는 저장소입니다."""
+
+    def __init__(self, cleanup_every: int = 10000):
+        self._windows: dict[str, tuple[int, int, int]] = {}
+        self._window_seconds: dict[str, int] = {} # 정책 이름 → 윈도우 길이 (정리할 때 사용)
+        self._lock = threading.Lock()
+        self._cleanup_every = cleanup_every
+        self._hits_since_cleanup = 0
+
+    def _counts(self, key: str, window_index: int) -> tuple[int, int]:
+        # (현재 윈도우 카운트, 직전 윈도우 카운트). 윈도우가 넘어갔으면 이동합니다. (잠금 안에서 호출)
+        index, current, previous = self._windows.get(key, (window_index, 0, 0))
+        if index == window_index - 1:
+            return 0, current
+        if index != window_index:
+            return 0, 0
+        return current, previous
+
+    def _increment(self, key: str, window_index: int, current: int, previous: int, now: float) -> None:
+        self._windows[key] = (window_index, current + 1, previous)
+        self._hits_since_cleanup += 1
+        if self._hits_since_cleanup >= self._cleanup_every:
+            self._cleanup(now)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        now = time.time()
+        window_index = int(now // policy.window_seconds)
+        fraction = (now % policy.window_seconds) / policy.window_seconds
+
+        with self._lock:
+            self._window_seconds[policy.name] = policy.window_seconds
+            current, previous = self._counts(key, window_index)
+            if _sliding_window_estimate(previous, current, fraction) + 1 > policy.limit:
+                self._windows[key] = (window_index, current, previous)
+                return _retry_after(previous, current, fraction, policy)
+            self._increment(key, window_index, current, previous, now)
+        return None
+
+    async def peek(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        now = time.time()
+        window_index = int(now // policy.window_seconds)
+        fraction = (now % policy.window_seconds) / policy.window_seconds
+        with self._lock:
+            current, previous = self._counts(key, window_index)
+        if _sliding_window_estimate(previous, current, fraction) + 1 > policy.limit:
+            return _retry_after(previous, current, fraction, policy)
+        return None
+
+    async def remove(self, key: str, policy: RateLimitPolicy) -> None:
+        # 그 사이 윈도우가 넘어갔으면 되돌리지 않습니다. (직전 윈도우 카운트로 조금 더 엄격하게 남음)
+        window_index = int(time.time() // policy.window_seconds)
+        with self._lock:
+            index, current, previous = self._windows.get(key, (window_index, 0, 0))
+            if index == window_index and current > 0:
+                self._windows[key] = (index, current - 1, previous)
+
+    def _cleanup(self, now: float) -> None:
+        # 두 윈도우 이상 지난 키는 더 이상 결과에 영향을 주지 않으므로 제거합니다.
+        self._hits_since_cleanup = 0
+        stale = []
+        for key, (index, _, _) in self._windows.items():
+            window_seconds = self._window_seconds.get(key.split(":", 1)[0], 3600)
+            if index < int(now // window_seconds) - 1:
+                stale.append(key)
+        for key in stale:
+            del self._windows[key]
+
+
+# 윈도우가 넘어가 키가 없으면 음수 카운터(만료 시간 없음)를 만들지 않도록 0 보다 클 때만 줄입니다.
+_REDIS_DECREMENT_IF_POSITIVE = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Redis 에 윈도우별 카운터를 두어 여러 워커/서버가 같은 한도를 공유하는 저장소입니다.
+    redis 패키지가 필요합니다: pip install redis
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis # 선택 의존성이므로 사용할 때만 임포트
+        self._redis = redis.from_url(url)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        now = time.time()
+        window_index = int(now // policy.window_seconds)
+        fraction = (now % policy.window_seconds) / policy.window_seconds
+        current_key = f"ratelimit:{key}:{window_index}"
+        previous_key = f"ratelimit:{key}:{window_index - 1}"
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, policy.window_seconds * 2)
+            pipe.get(previous_key)
+            current, _, previous = await pipe.execute()
+        previous = int(previous or 0)
+
+        if _sliding_window_estimate(previous, current - 1, fraction) + 1 > policy.limit:
+            await self._redis.decr(current_key) # 거부된 요청은 카운트하지 않습니다.
+            return _retry_after(previous, current - 1, fraction, policy)
+        return None
+
+    async def peek(self, key: str, policy: RateLimitPolicy) -> Optional[int]:
+        now = time.time()
+        window_index = int(now // policy.window_seconds)
+        fraction = (now % policy.window_seconds) / policy.window_seconds
+        current, previous = await self._redis.mget(
+            f"ratelimit:{key}:{window_index}", f"ratelimit:{key}:{window_index - 1}"
+        )
+        current, previous = int(current or 0), int(previous or 0)
+        if _sliding_window_estimate(previous, current, fraction) + 1 > policy.limit:
+            return _retry_after(previous, current, fraction, policy)
+        return None
+
+    async def remove(self, key: str, policy: RateLimitPolicy) -> None:
+        current_key = f"ratelimit:{key}:{int(time.time() // policy.window_seconds)}"
+        await self._redis.eval(_REDIS_DECREMENT_IF_POSITIVE, 1, current_key)
+
+
+def create_backend(settings: Settings) -> RateLimitBackend:
+    # RATE_LIMIT_BACKEND: "memory" (워커 프로세스별) 또는 "redis" (여러 워커/서버 공유)
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimitBackend(settings.rate_limit_redis_url)
+    return InMemoryRateLimitBackend()
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, policies: dict[str, RateLimitPolicy]):
+        self.backend = backend
+        self.policies = policies
+        self._allowed: dict[str, int] = {}
+        self._rejected: dict[str, int] = {}
+        self._refunded: dict[str, int] = {}
+
+    def configure(self, settings: Settings) -> None:
+        """앱 설정의 저장소와 정책으로 바꿉니다. (lifespan 시작 시)"""
+        self.backend = create_backend(settings)
+        self.policies = policies_from_settings(settings)
+
+    async def check(self, policy_name: str, **identifiers: Optional[str]) -> None:
+        """
+        주어진 식별자(ip=..., emp_number=..., email=...) 각각에 대해 정책 한도를 확인합니다.
+        하나라도 초과하면 RateLimitExceeded 를 발생시킵니다.
+        """
+        policy = self.policies[policy_name]
+        for kind, value in identifiers.items():
+            if not value:
+                continue
+            retry_after = await self.backend.hit(f"{policy.name}:{kind}:{value.lower()}", policy)
+            if retry_after is not None:
+                self._rejected[policy.name] = self._rejected.get(policy.name, 0) + 1
+                raise RateLimitExceeded(policy, retry_after)
+        self._allowed[policy.name] = self._allowed.get(policy.name, 0) + 1
+
+    # 실패한 시도만 세는 정책 (로그인): 처리 전에 reserve 로 자리를 먼저 차지하고, 성공하면 refund 로 돌려줍니다.
+    # 자리를 먼저 차지하므로 동시에 들어온 시도들도 한도를 넘어 비밀번호 확인까지 가지 못하고,
+    # 같은 NAT/프록시 뒤의 사용자들이 정상적으로 로그인하는 것은 IP 한도를 소모하지 않습니다.
+    async def reserve(self, policy_name: str, **identifiers: Optional[str]) -> None:
+        """
+        식별자마다 카운트를 하나씩 올립니다. 하나라도 한도에 이르렀으면 이미 올린 카운트를 되돌리고
+        RateLimitExceeded 를 발생시킵니다. 시도가 성공하면 같은 식별자로 refund 를 호출해야 합니다.
+        """
+        policy = self.policies[policy_name]
+        reserved = []
+        for kind, value in identifiers.items():
+            if not value:
+                continue
+            key = f"{policy.name}:{kind}:{value.lower()}"
+            retry_after = await self.backend.hit(key, policy)
+            if retry_after is not None:
+                for reserved_key in reserved:
+                    await self.backend.remove(reserved_key, policy)
+                self._rejected[policy.name] = self._rejected.get(policy.name, 0) + 1
+                raise RateLimitExceeded(policy, retry_after)
+            reserved.append(key)
+        self._allowed[policy.name] = self._allowed.get(policy.name, 0) + 1
+
+    async def refund(self, policy_name: str, **identifiers: Optional[str]) -> None:
+        policy = self.policies[policy_name]
+        for kind, value in identifiers.items():
+            if value:
+                await self.backend.remove(f"{policy.name}:{kind}:{value.lower()}", policy)
+        self._refunded[policy.name] = self._refunded.get(policy.name, 0) + 1
+
+    def stats(self) -> dict:
+        """정책별 통과/거부/되돌린 횟수를 반환합니다. (check() 호출 단위이므로 IP 검사와 식별자 검사가 따로 집계됩니다)"""
+        return {
+            name: {
+                "passed_checks": self._allowed.get(name, 0),
+                "rejected": self._rejected.get(name, 0),
+                "refunded": self._refunded.get(name, 0),
+            }
+            for name in self.policies
+        }
+
+
+# lifespan 전(스크립트 등)에는 기본 설정을 사용하고, 시작 시 configure(settings) 로 앱 설정을 적용합니다.
+rate_limiter = RateLimiter(create_backend(get_settings()), policies_from_settings(get_settings()))
+
+
+def get_client_ip(request: Request) -> str:
+    # 리버스 프록시 뒤에서 실행할 때만 RATE_LIMIT_TRUST_FORWARDED=true (X-Forwarded-For 의 첫 번째 주소 사용)
+    if request_settings(request).rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_by_ip(policy_name: str):
+    """
+    라우트 데코레이터의 dependencies=[...] 에 넣어 사용하는 IP 기준 제한 의존성입니다.
+    라우트 수준 의존성은 다른 의존성(인증, DB 세션)보다 먼저 실행되므로
+    해싱이나 DB 작업 전에 요청을 거부할 수 있습니다.
+    """
+    async def dependency(request: Request) -> None:
+        await rate_limiter.check(policy_name, ip=get_client_ip(request))
+    return dependency
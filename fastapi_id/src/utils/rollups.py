@@ -0,0 +1,111 @@
+# src/utils/rollups.py
+#
+# 시간 구간별 집계용 자료구조. 값을 넣을 때 해당 구간만 갱신하므로 조회 비용은 원본 행 수가 아니라 구간 수에 비례합니다.
+
+from collections import Counter
+from typing import Hashable, Optional, Sequence
+
+
+class RingCounter:
+    """
+    bucket_seconds 간격의 구간 size 개를 원형 배열로 보관하는 합계 카운터입니다.
+    각 구간은 fields 개의 값(예: 패킷 수, 바이트 수)을 가지며, 가장 오래된 구간은 새 구간이 들어올 때 덮어씁니다.
+    """
+
+    def __init__(self, bucket_seconds: int, size: int, fields: int = 1):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.fields = fields
+        self._indexes: list[Optional[int]] = [None] * size # 슬롯에 들어있는 구간 번호 (epoch // bucket_seconds)
+        self._values: list[list[float]] = [[0] * fields for _ in range(size)]
+        self._latest: Optional[int] = None
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, timestamp: float, *values: float) -> bool:
+        """구간 범위보다 오래된 값은 버리고 False 를 반환합니다."""
+        index = self._bucket(timestamp)
+        if self._latest is not None and index <= self._latest - self.size:
+            return False
+        slot = index % self.size
+        if self._indexes[slot] != index:
+            self._indexes[slot] = index
+            self._values[slot] = [0] * self.fields
+        bucket = self._values[slot]
+        for i, value in enumerate(values):
+            bucket[i] += value
+        if self._latest is None or index > self._latest:
+            self._latest = index
+        return True
+
+    def _get(self, index: int) -> Sequence[float]:
+        slot = index % self.size
+        return self._values[slot] if self._indexes[slot] == index else [0] * self.fields
+
+    def series(self, now: float, count: int, include_current: bool = True) -> list[tuple[float, Sequence[float]]]:
+        """최근 count 개 구간의 (구간 시작 epoch 초, 값) 목록 (오래된 순). include_current=False 면 진행 중인 구간 제외"""
+        last = self._bucket(now) - (0 if include_current else 1)
+        count = min(count, self.size)
+        return [(index * self.bucket_seconds, self._get(index)) for index in range(last - count + 1, last + 1)]
+
+    def total(self, now: float, count: int) -> list[float]:
+        """진행 중인 구간을 포함한 최근 count 개 구간의 합계"""
+        totals = [0] * self.fields
+        for _, values in self.series(now, count):
+            for i, value in enumerate(values):
+                totals[i] += value
+        return totals
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters 스케치. 최대 capacity 개의 키만 추적하며, 가득 찼을 때 새 키는 가장 작은 키를 대체하고
+    그 카운트를 이어받습니다. (빈도가 높은 키의 카운트는 실제 값 이상, 오차는 최소 카운트 이하)
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[Hashable, float] = {}
+
+    def add(self, key: Hashable, amount: float = 1) -> None:
+        if key in self.counts:
+            self.counts[key] += amount
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = amount
+        else:
+            smallest = min(self.counts, key=self.counts.__getitem__)
+            self.counts[key] = self.counts.pop(smallest) + amount
+
+    def top(self, k: int) -> list[tuple[Hashable, float]]:
+        return Counter(self.counts).most_common(k)
+
+
+class WindowedTopK:
+    """구간마다 SpaceSaving 스케치를 두고, 조회 시 최근 구간의 스케치만 합쳐 상위 k 개를 구합니다."""
+
+    def __init__(self, bucket_seconds: int, size: int, capacity: int):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.capacity = capacity
+        self._indexes: list[Optional[int]] = [None] * size
+        self._sketches: list[Optional[SpaceSaving]] = [None] * size
+
+    def add(self, timestamp: float, key: Hashable, amount: float = 1) -> None:
+        index = int(timestamp // self.bucket_seconds)
+        slot = index % self.size
+        if self._indexes[slot] != index:
+            if self._indexes[slot] is not None and self._indexes[slot] > index:
+                return # 이미 더 최근 구간이 차지한 슬롯 (너무 오래된 값)
+            self._indexes[slot] = index
+            self._sketches[slot] = SpaceSaving(self.capacity)
+        self._sketches[slot].add(key, amount)
+
+    def top(self, now: float, buckets: int, k: int) -> list[tuple[Hashable, float]]:
+        last = int(now // self.bucket_seconds)
+        merged: Counter = Counter()
+        for index in range(last - min(buckets, self.size) + 1, last + 1):
+            slot = index % self.size
+            if self._indexes[slot] == index:
+                merged.update(self._sketches[slot].counts)
+        return merged.most_common(k)
@@ -0,0 +1,60 @@
+# src/utils/startup_timer.py
+#
+# 워커가 요청을 받을 준비가 되기까지 걸린 시간을 단계별로 기록합니다.
+# 모듈 import 시간도 포함하려면 main.py 에서 가장 먼저 import 해야 합니다.
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StartupTimer:
+    def __init__(self):
+        self._created = time.perf_counter() # 이 모듈이 import 된 시점 (≈ 프로세스의 앱 import 시작)
+        self._startup_began: Optional[float] = None
+        self._phases: dict[str, float] = {} # 단계 이름 → 소요 시간 (ms)
+        self._ready_ms: Optional[float] = None
+
+    def begin(self) -> None:
+        """startup 이벤트 시작 시 호출합니다. 여기까지가 import 단계입니다."""
+        self._startup_began = time.perf_counter()
+        self._phases["import"] = (self._startup_began - self._created) * 1000
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = (time.perf_counter() - started) * 1000
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        """비동기 단계용. asyncio.gather 로 여러 단계를 동시에 실행해도 각 단계 시간이 따로 기록됩니다."""
+        with self.phase(name):
+            return await awaitable
+
+    def finish(self, **details) -> None:
+        """모든 단계가 끝나면 호출하여 단계별 시간을 한 줄로 기록합니다."""
+        self._ready_ms = (time.perf_counter() - self._created) * 1000
+        logger.info(
+            "startup complete",
+            extra={
+                "ready_ms": round(self._ready_ms, 1),
+                "phases": {name: round(ms, 1) for name, ms in self._phases.items()},
+                **details,
+            },
+        )
+
+    def stats(self) -> dict:
+        stats = {f"{name}_ms": ms for name, ms in self._phases.items()}
+        if self._ready_ms is not None:
+            stats["ready_ms"] = self._ready_ms
+        return stats
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,158 @@
+# tests/conftest.py
+#
+# 공용 픽스처: 테스트마다 임시 SQLite 파일(sqlite+aiosqlite)로 앱과 DB 를 만듭니다.
+# 실행 (fastapi_id 디렉토리에서): python -m pytest -q
+
+import dataclasses
+import os
+from collections import defaultdict
+
+# src 모듈이 import 시점에 읽는 환경 변수는 import 전에 지정합니다. (.env 보다 우선)
+# 앱 설정(Settings)으로 정하는 값은 아래의 settings 픽스처에서 지정합니다.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test-unused.db") # 각 테스트는 settings 픽스처의 DB 를 사용
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4") # 테스트 속도를 위해 최소 비용
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "2")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_REQUESTS", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import main
+from src.config import Settings, get_settings
+from src.database import Database, open_database, set_database
+from src.main import create_app
+from src.migrations import ensure_schema
+from src.utils.password_hasher import password_hasher
+from src.utils.principal_cache import principal_cache
+from src.utils.query_profiler import QueryBudgetExceeded
+from src.utils.rate_limit import InMemoryRateLimitBackend, rate_limiter
+
+PASSWORD = "Passw0rd!23"
+
+# 인증 라우트별 요청 하나당 허용하는 SQL 문 수 (query_budget 픽스처가 검사)
+# 인증 캐시가 비어 있을 때 기준입니다. get_current_user 의 사용자 조회 1회가 포함됩니다.
+AUTH_QUERY_BUDGETS = {
+    "/auth/signup": 1, # INSERT ... RETURNING (중복 확인은 존재 필터, 누락된 중복은 UNIQUE 제약)
+    "/auth/login": 1, # 사용자 조회
+    "/auth/mypage": 1, # 인증
+    "/auth/logout": 2, # 인증 + 토큰 폐기
+    "/auth/withdrawal": 4, # 인증 + 사용자 조회 + 비활성화 + 토큰 폐기
+    "/auth/forgot_password": 3, # 사용자 조회 + 토큰 발급 (UPSERT) + 메일 대기열
+    "/auth/reset_password": 4, # 토큰 조회 + 사용자 조회 + 토큰 삭제 + 비밀번호 변경
+    "/auth/change-password": 3, # 인증 + 사용자 조회 + 비밀번호 변경
+    "/auth/verify-password": 1, # 인증
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_state(monkeypatch):
+    # 프로세스 전역 상태(인증 캐시, 요청 제한 카운터)가 다른 테스트의 DB 와 섞이지 않도록 비웁니다.
+    principal_cache.clear()
+    monkeypatch.setattr(rate_limiter, "backend", InMemoryRateLimitBackend())
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture
+def settings(tmp_path) -> Settings:
+    return dataclasses.replace(
+        get_settings(),
+        database_url=f"sqlite:///{tmp_path / 'app.db'}",
+        async_database_url=None,
+        database_replica_urls=(),
+        secret_key="test-secret-key",
+        admin_emp_numbers=frozenset({"ADM1"}),
+        agent_download_url_secret="test-download-secret",
+        smtp_server="127.0.0.1",
+        smtp_port=1, # 발송기는 연결에 실패하고 재시도만 예약합니다.
+        smtp_use_tls=False,
+        startup_warm_db_connections=0,
+        startup_warm_password_hasher=False,
+    )
+
+
+@pytest.fixture
+def app(settings):
+    return create_app(settings)
+
+
+@pytest.fixture
+def client(app):
+    with TestClient(app) as c: # lifespan 실행 (DB 생성, 스키마, 백그라운드 작업)
+        yield c
+
+
+@pytest.fixture
+def signup(client):
+    def _signup(emp_number: str = "E1", email: str = None, password: str = PASSWORD):
+        return client.post(
+            "/auth/signup",
+            json={
+                "email": email or f"{emp_number.lower()}@example.com",
+                "password": password,
+                "name": "Tester",
+                "phone": "010-0000-0000",
+                "empNumber": emp_number,
+            },
+        )
+    return _signup
+
+
+@pytest.fixture
+def login(client):
+    def _login(emp_number: str = "E1", password: str = PASSWORD) -> dict:
+        response = client.post("/auth/login", json={"emp_number": emp_number, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
+
+
+@pytest.fixture
+def query_budget(monkeypatch) -> dict:
+    """
+    요청이 끝날 때마다 라우트의 쿼리 예산(AUTH_QUERY_BUDGETS)을 검사하여, 넘으면 QueryBudgetExceeded 로 요청을 실패시킵니다.
+    예산이 없는 /auth 라우트도 실패시킵니다. 반환된 dict 에는 라우트별 쿼리 수가 요청 순서대로 쌓입니다.
+    """
+    counts = defaultdict(list)
+    finish = main.finish_request_profile
+
+    def enforce(profile, route: str, *args) -> None:
+        counts[route].append(profile.statement_count)
+        budget = AUTH_QUERY_BUDGETS.get(route)
+        if budget is None and route.startswith("/auth/"):
+            raise QueryBudgetExceeded(f"{route} has no query budget in AUTH_QUERY_BUDGETS")
+        if budget is not None and profile.statement_count > budget:
+            raise QueryBudgetExceeded(
+                f"{route} issued {profile.statement_count} statements (budget {budget}): {profile.summary()}"
+            )
+        finish(profile, route, *args)
+
+    monkeypatch.setattr(main, "finish_request_profile", enforce)
+    return counts
+
+
+# --- 앱 없이 서비스 계층을 직접 테스트할 때 (anyio 테스트) ---
+@pytest.fixture
+async def database(settings) -> Database:
+    database = open_database(settings)
+    ensure_schema(database.engine)
+    set_database(database) # 백그라운드/서비스 코드의 AsyncSessionLocal 도 이 DB 를 사용
+    password_hasher.start()
+    try:
+        yield database
+    finally:
+        password_hasher.shutdown()
+        set_database(None)
+        await database.dispose()
+
+
+@pytest.fixture
+async def session(database):
+    async with database.AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,121 @@
+import csv
+import gzip
+import io
+import json
+
+from sqlalchemy import create_engine, delete
+
+from src.models.user import User
+from src.services.user_export_service import EXPORT_FIELD_NAMES
+from src.services.user_service import decode_user_cursor, encode_user_cursor
+
+from conftest import PASSWORD
+
+
+def _list(client, headers, **params):
+    response = client.get("/admin/users", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [item["emp_number"] for item in body["items"]], body["next_cursor"]
+
+
+def test_keyset_pagination_walks_every_user_once(client, signup, login):
+    signup("ADM1")
+    for i in range(6):
+        signup(f"E{i}")
+    headers = login("ADM1")
+    # SQLite 의 created_at 은 초 단위이므로 대부분 같은 시각: user_id 로 순서를 이어가는지 확인합니다.
+    everyone, cursor = _list(client, headers, limit=200)
+    assert cursor is None and len(everyone) == 7
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+        page, cursor = _list(client, headers, **params)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [emp for page in pages for emp in page] == everyone
+
+
+def test_invalid_or_stale_cursor_is_rejected(client, signup, login, settings):
+    signup("ADM1")
+    for i in range(3):
+        signup(f"E{i}")
+    headers = login("ADM1")
+    _, cursor = _list(client, headers, limit=2)
+
+    assert client.get("/admin/users", headers=headers, params={"cursor": "!!"}).status_code == 400
+    missing = encode_user_cursor("no-such-user")
+    assert client.get("/admin/users", headers=headers, params={"cursor": missing}).status_code == 400
+
+    # 이전 페이지의 마지막 행이 지워진 cursor 는 빈 페이지(목록의 끝)가 아니라 400 으로 알립니다.
+    engine = create_engine(settings.database_url)
+    with engine.begin() as conn:
+        conn.execute(delete(User).where(User.user_id == decode_user_cursor(cursor)))
+    engine.dispose()
+    response = client.get("/admin/users", headers=headers, params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_prefix_search_escapes_like_wildcards(client, signup, login):
+    signup("ADM1")
+    for emp_number in ("E1", "E10", "E2", "A_1", "AB1", "A%1"):
+        signup(emp_number, email=f"{emp_number.replace('%', 'p').lower()}@example.com")
+    headers = login("ADM1")
+
+    assert sorted(_list(client, headers, emp_number="E1")[0]) == ["E1", "E10"]
+    assert _list(client, headers, email="e2@")[0] == ["E2"]
+    # '_' 와 '%' 는 와일드카드가 아니라 문자 그대로 비교합니다.
+    assert _list(client, headers, emp_number="A_")[0] == ["A_1"]
+    assert _list(client, headers, emp_number="A%")[0] == ["A%1"]
+    assert _list(client, headers, emp_number="%")[0] == []
+    # 접두어 일치만: 중간에 포함된 값은 찾지 않습니다.
+    assert _list(client, headers, emp_number="1")[0] == []
+
+
+def _export(client, headers, **params):
+    response = client.get("/admin/users/export", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_export_streams_ndjson_and_csv_without_password_hashes(client, signup, login):
+    signup("ADM1")
+    signup("E1")
+    signup("E2")
+    withdrawal = client.request("DELETE", "/auth/withdrawal", headers=login("E2"), json={"password": PASSWORD})
+    assert withdrawal.status_code == 204
+    headers = login("ADM1")
+    assert client.get("/admin/users/export", headers=login("E1")).status_code == 403
+
+    response = _export(client, headers)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["emp_number"] for row in rows) == ["ADM1", "E1", "E2"]
+    assert all(tuple(row) == EXPORT_FIELD_NAMES for row in rows)
+    assert "password_hash" not in response.text and "$2b$" not in response.text
+
+    deleted = [json.loads(line) for line in _export(client, headers, is_deleted="true").text.splitlines()]
+    assert [(row["emp_number"], row["is_deleted"]) for row in deleted] == [("E2", True)]
+
+    response = _export(client, headers, format="csv", is_deleted="false")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].endswith('.csv"')
+    header, *records = list(csv.reader(io.StringIO(response.text)))
+    assert tuple(header) == EXPORT_FIELD_NAMES
+    assert sorted(record[header.index("emp_number")] for record in records) == ["ADM1", "E1"]
+
+
+def test_export_gzip_round_trip(client, signup, login):
+    signup("ADM1")
+    signup("E1")
+    headers = login("ADM1")
+    plain = _export(client, headers, format="csv").content
+
+    response = _export(client, headers, format="csv", gzip="true")
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.csv.gz"')
+    assert "content-encoding" not in response.headers # 파일 자체가 gzip (클라이언트가 풀지 않고 저장)
+    assert gzip.decompress(response.content) == plain
@@ -0,0 +1,128 @@
+import dataclasses
+import gzip
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import create_app
+from src.services import agent_download_service
+
+from conftest import PASSWORD
+
+AGENT_BYTES = bytes(range(256)) * 64 # 16 KiB
+
+
+@pytest.fixture
+def download_dir(tmp_path):
+    directory = tmp_path / "downloads"
+    directory.mkdir()
+    (directory / "agent.exe").write_bytes(AGENT_BYTES)
+    return directory
+
+
+@pytest.fixture
+def settings(settings, download_dir):
+    return dataclasses.replace(settings, agent_download_dir=str(download_dir), agent_download_file="agent.exe")
+
+
+def _signed_path(client, headers) -> str:
+    response = client.post("/api/v1/agent/download-url", headers=headers)
+    assert response.status_code == 200
+    url = urlsplit(response.json()["url"])
+    return f"{url.path}?{url.query}"
+
+
+def _raw_get(client, path: str, headers: dict) -> tuple:
+    # 미리 압축된 변형은 클라이언트가 풀지 않은 그대로 비교합니다.
+    with client.stream("GET", path, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_signed_download_url_round_trip(client, signup, login):
+    signup("E1")
+    path = _signed_path(client, login("E1"))
+
+    signed = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert signed.status_code == 200
+    assert signed.content == AGENT_BYTES
+    assert signed.headers["content-disposition"] == 'attachment; filename="agent.exe"'
+    assert "content-encoding" not in signed.headers
+
+    tampered = client.get(path.replace("uid=", "uid=x"))
+    assert tampered.status_code == 403
+
+
+def test_signed_download_rejected_after_withdrawal(client, signup, login):
+    signup("E1")
+    headers = login("E1")
+    path = _signed_path(client, headers)
+    withdrawal = client.request("DELETE", "/auth/withdrawal", headers=headers, json={"password": PASSWORD})
+    assert withdrawal.status_code == 204
+
+    # 서명과 유효 시간은 그대로지만 탈퇴한 사용자의 URL 은 사용할 수 없습니다.
+    assert client.get(path).status_code == 403
+
+
+def test_download_supports_range_and_conditional_get(client, signup, login):
+    signup("E1")
+    headers = {**login("E1"), "Accept-Encoding": "identity"}
+
+    full = client.get("/api/v1/agent/download", headers=headers)
+    assert full.status_code == 200 and full.content == AGENT_BYTES
+    etag = full.headers["etag"]
+
+    partial = client.get("/api/v1/agent/download", headers={**headers, "Range": "bytes=1024-2047"})
+    assert partial.status_code == 206
+    assert partial.content == AGENT_BYTES[1024:2048]
+    assert partial.headers["content-range"] == f"bytes 1024-2047/{len(AGENT_BYTES)}"
+
+    cached = client.get("/api/v1/agent/download", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_download_prefers_precompressed_variants(client, signup, login, download_dir):
+    gz_bytes = gzip.compress(AGENT_BYTES)
+    br_bytes = b"not-really-brotli" # 내용은 검사하지 않으므로 구분할 수 있는 바이트면 충분
+    (download_dir / "agent.exe.gz").write_bytes(gz_bytes)
+    (download_dir / "agent.exe.br").write_bytes(br_bytes)
+    signup("E1")
+    headers = login("E1")
+
+    response, body = _raw_get(client, "/api/v1/agent/download", {**headers, "Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert (response.headers["content-encoding"], body) == ("br", br_bytes)
+    assert "Accept-Encoding" in response.headers["vary"]
+
+    response, body = _raw_get(client, "/api/v1/agent/download", {**headers, "Accept-Encoding": "gzip, br;q=0"})
+    assert (response.headers["content-encoding"], body) == ("gzip", gz_bytes)
+    assert gzip.decompress(body) == AGENT_BYTES
+
+    # 변형마다 ETag 가 다르므로 원본의 ETag 로는 압축본이 304 가 되지 않습니다.
+    original = client.get("/api/v1/agent/download", headers={**headers, "Accept-Encoding": "identity"})
+    assert original.content == AGENT_BYTES and "content-encoding" not in original.headers
+    response, _ = _raw_get(
+        client, "/api/v1/agent/download", {**headers, "Accept-Encoding": "gzip", "If-None-Match": original.headers["etag"]}
+    )
+    assert response.status_code == 200
+
+
+def test_signed_download_disabled_without_secret(settings):
+    expires, sig = agent_download_service.sign_download(settings, "someone")
+    # AGENT_DOWNLOAD_URL_SECRET 과 SECRET_KEY 가 모두 없는 설정 (JWT 는 테스트용 키 그대로)
+    no_secret = dataclasses.replace(settings, agent_download_url_secret=None)
+
+    with TestClient(create_app(no_secret)) as client:
+        client.post("/auth/signup", json={
+            "email": "e1@example.com", "password": PASSWORD, "name": "Tester", "phone": "010-0000-0000", "empNumber": "E1",
+        })
+        token = client.post("/auth/login", json={"emp_number": "E1", "password": PASSWORD}).json()["access_token"]
+
+        # 빈 키로 서명한 URL 은 누구나 만들 수 있으므로 발급도, 사용도 하지 않습니다.
+        assert client.post("/api/v1/agent/download-url", headers={"Authorization": f"Bearer {token}"}).status_code == 503
+        forged_expires, forged_sig = agent_download_service.sign_download(no_secret, "someone") # 빈 키로 서명
+        response = client.get(f"/api/v1/agent/download/signed?uid=someone&expires={forged_expires}&sig={forged_sig}")
+        assert response.status_code == 503
+    assert not agent_download_service.verify_download_signature(no_secret, "someone", expires, sig)
@@ -0,0 +1,125 @@
+import dataclasses
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from src.database import get_async_uow
+from src.main import create_app
+from src.models.user import User
+from src.schemas.user import UserCreate
+from src.services import user_service
+from src.utils import auth
+from src.utils.principal_cache import principal_cache
+
+from conftest import PASSWORD
+
+
+def test_signup_login_mypage_withdrawal(client, signup, login):
+    response = signup("E1")
+    assert response.status_code == 201
+    body = response.json()
+    assert body["emp_number"] == "E1"
+    assert body["created_at"] # INSERT ... RETURNING 으로 채워짐
+    assert body["is_deleted"] is False
+
+    headers = login("E1")
+    me = client.get("/auth/mypage", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["user_id"] == body["user_id"]
+
+    withdrawal = client.request("DELETE", "/auth/withdrawal", headers=headers, json={"password": PASSWORD})
+    assert withdrawal.status_code == 204
+    # 탈퇴와 함께 현재 토큰도 폐기됩니다.
+    assert client.get("/auth/mypage", headers=headers).status_code == 401
+    relogin = client.post("/auth/login", json={"emp_number": "E1", "password": PASSWORD})
+    assert relogin.status_code == 403
+
+
+def test_signup_duplicates_return_409(client, signup):
+    assert signup("E1", email="a@example.com").status_code == 201
+    duplicate_email = signup("E2", email="a@example.com")
+    assert duplicate_email.status_code == 409
+    assert duplicate_email.json()["detail"] == "Email already registered"
+    duplicate_emp_number = signup("E1", email="b@example.com")
+    assert duplicate_emp_number.status_code == 409
+    assert duplicate_emp_number.json()["detail"] == "Employee number already registered"
+
+
+def test_login_rejects_wrong_password(client, signup):
+    signup("E1")
+    response = client.post("/auth/login", json={"emp_number": "E1", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_logout_decodes_token_once(client, signup, login, monkeypatch):
+    signup("E1")
+    headers = login("E1")
+    principal_cache.clear()
+    decodes = []
+    decode = auth.jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: decodes.append(1) or decode(*args, **kwargs))
+
+    # 인증(get_current_user)과 토큰 폐기(get_current_token_claims)가 한 번의 검증 결과를 함께 사용
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert len(decodes) == 1
+
+
+@pytest.mark.anyio
+async def test_async_services_flush_without_commit(database, session):
+    user = await user_service.create_user_async(
+        session,
+        UserCreate(email="svc@example.com", password=PASSWORD, name="n", phone="1", empNumber="S1"),
+    )
+    assert user.created_at is not None # 서버 기본값을 flush 때 함께 받아옴
+
+    # 커밋 전에는 다른 세션에서 보이지 않습니다.
+    async with database.AsyncSessionLocal() as other:
+        assert await user_service.get_user_by_emp_number_async(other, "S1") is None
+
+    await session.commit()
+    async with database.AsyncSessionLocal() as other:
+        found = await user_service.get_user_by_emp_number_async(other, "S1")
+        assert found is not None and found.email == "svc@example.com"
+
+
+@pytest.mark.anyio
+async def test_unit_of_work_commits_once_and_rolls_back_on_error(database):
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(database=database)))
+
+    # 정상 종료: 엔드포인트가 끝나면 커밋
+    uow = get_async_uow(request)
+    db = await uow.__anext__()
+    db.add(User(password_hash="x", email="ok@example.com", name="n", phone="1", emp_number="U1"))
+    await db.flush()
+    with pytest.raises(StopAsyncIteration):
+        await uow.__anext__()
+
+    # 예외: 요청 중의 변경을 모두 롤백
+    uow = get_async_uow(request)
+    db = await uow.__anext__()
+    db.add(User(password_hash="x", email="fail@example.com", name="n", phone="1", emp_number="U2"))
+    await db.flush()
+    with pytest.raises(RuntimeError):
+        await uow.athrow(RuntimeError("endpoint failed"))
+
+    async with database.AsyncSessionLocal() as check:
+        emp_numbers = (await check.execute(select(User.emp_number))).scalars().all()
+    assert emp_numbers == ["U1"]
+
+
+def test_app_settings_control_jwt_key_and_admins(settings):
+    # 환경 변수가 아니라 create_app 에 넘긴 Settings 의 서명 키와 관리자 목록을 사용합니다.
+    custom = dataclasses.replace(settings, secret_key="another-key", admin_emp_numbers=frozenset({"E1"}))
+    with TestClient(create_app(custom)) as client:
+        client.post("/auth/signup", json={
+            "email": "e1@example.com", "password": PASSWORD, "name": "Tester", "phone": "010-0000-0000", "empNumber": "E1",
+        })
+        token = client.post("/auth/login", json={"emp_number": "E1", "password": PASSWORD}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/admin/email-outbox", headers=headers).status_code == 200
+
+    principal_cache.clear()
+    with TestClient(create_app(settings)) as client: # 같은 DB, 다른 서명 키
+        assert client.get("/auth/mypage", headers=headers).status_code == 401
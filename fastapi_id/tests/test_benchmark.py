@@ -0,0 +1,34 @@
+# 인증 API 벤치마크의 baseline 회귀 검사
+# 기본 실행에서는 제외되며 python -m pytest -m benchmark 로 실행합니다. (baseline 대비 성능 저하가 있으면 실패)
+
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.auth_bench import APP_DIR, DEFAULT_BASELINE, compare_with_baseline
+
+BASE = {"results": {"login": {"requests": 100, "errors": 0, "rps": 100.0, "p50_ms": 5.0, "p95_ms": 10.0, "p99_ms": 12.0}}}
+
+
+def _current(**changes) -> dict:
+    return {"login": {**BASE["results"]["login"], **changes}}
+
+
+def test_compare_with_baseline_within_tolerance():
+    assert compare_with_baseline(_current(p95_ms=11.9, rps=81.0), BASE, tolerance=0.20) == []
+
+
+@pytest.mark.parametrize("changes", [{"p95_ms": 12.5}, {"rps": 79.0}, {"errors": 1}])
+def test_compare_with_baseline_reports_regressions(changes):
+    assert len(compare_with_baseline(_current(**changes), BASE, tolerance=0.20)) == 1
+
+
+@pytest.mark.benchmark
+def test_auth_benchmark_has_no_regression():
+    if not DEFAULT_BASELINE.exists():
+        pytest.skip(f"{DEFAULT_BASELINE} 가 없습니다. 기준 장비에서 python benchmarks/auth_bench.py --update-baseline 으로 생성하세요.")
+    result = subprocess.run(
+        [sys.executable, "benchmarks/auth_bench.py"], cwd=APP_DIR, capture_output=True, text=True, timeout=1800
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+
+from src.utils.conditional import version_validators
+
+
+def test_validators_are_the_same_for_naive_and_aware_timestamps():
+    aware = datetime(2026, 10, 17, 3, 0, 0, 123456, tzinfo=timezone.utc)
+    naive = aware.replace(tzinfo=None) # SQLite 가 반환하는 값
+    kst = aware.astimezone(timezone(timedelta(hours=9))) # 세션 시간대가 UTC 가 아닌 PostgreSQL
+    expected = version_validators("u1", aware)
+    assert version_validators("u1", naive) == expected
+    assert version_validators("u1", kst) == expected
+    assert expected["Last-Modified"] == "Sat, 17 Oct 2026 03:00:00 GMT"
+
+
+def test_mypage_returns_304_for_matching_validators(client, signup, login):
+    signup("E1")
+    headers = login("E1")
+    first = client.get("/auth/mypage", headers=headers)
+    assert first.status_code == 200
+
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+    assert client.get("/auth/mypage", headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert client.get("/auth/mypage", headers={**headers, "If-Modified-Since": last_modified}).status_code == 304
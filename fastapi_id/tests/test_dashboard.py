@@ -0,0 +1,98 @@
+import dataclasses
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src.schemas.dashboard import SystemLogIn, TrafficFlowIn
+from src.services.dashboard_rollup_service import LogRollup, TrafficRollup
+from src.utils.auth import create_access_token
+
+ROLLUP_ROUTES = [
+    "/api/dashboard/traffic/traffic-over-time",
+    "/api/dashboard/traffic/stats",
+    "/api/dashboard/traffic/top-ports",
+    "/api/dashboard/traffic/attacks",
+    "/api/dashboard/logs/stats",
+    "/api/dashboard/logs/count-24h",
+    "/api/dashboard/logs/list",
+]
+
+
+@pytest.fixture
+def settings(settings):
+    # 스트림이 토큰 상태를 자주 확인하도록 하트비트 간격을 줄입니다.
+    return dataclasses.replace(settings, dashboard_stream_heartbeat_seconds=0.05)
+
+
+def _receive_until_closed(websocket) -> WebSocketDisconnect:
+    for _ in range(1000):
+        try:
+            websocket.receive_text()
+        except WebSocketDisconnect as closed:
+            return closed
+    raise AssertionError("stream was not closed")
+
+
+@pytest.mark.parametrize("path", ROLLUP_ROUTES)
+def test_rollup_routes_require_login(client, signup, login, path):
+    assert client.get(path).status_code == 401
+    signup("E1")
+    assert client.get(path, headers=login("E1")).status_code == 200
+
+
+def test_readyz_reports_per_worker_rollups(client):
+    body = client.get("/readyz").json()
+    assert body["status"] == "ready"
+    assert body["dashboard_rollups"]["scope"] == "per_worker"
+
+
+def test_far_future_samples_do_not_block_later_ingest():
+    now = datetime.now(timezone.utc)
+    far_future = now + timedelta(days=3650)
+    traffic, logs = TrafficRollup(), LogRollup()
+
+    assert traffic.ingest([TrafficFlowIn(timestamp=far_future, src_ip="10.0.0.1", dst_port=22, protocol=6, packets=9)]) == 0
+    assert traffic.ingest([TrafficFlowIn(timestamp=now, src_ip="10.0.0.1", dst_port=80, protocol=6, packets=3)]) == 1
+    assert (traffic.flows_future, traffic.flows_late) == (1, 0)
+    assert traffic.per_second.total(now.timestamp(), 1) == [3, 0]
+    assert traffic.top_ports_in(1, now=now.timestamp()) == [{"port": 80, "count": 1}]
+    assert traffic.stats(now.timestamp())["latest_data_timestamp"] == now.isoformat()
+
+    assert logs.ingest([SystemLogIn(detected_at=far_future), SystemLogIn(detected_at=now)]) == 1
+    assert logs.logs_future == 1
+    assert logs.count_24h(now.timestamp()) == {"log_count_24h": 1}
+
+
+def test_websocket_closes_when_token_expires(client, signup, settings):
+    signup("E1")
+    token = create_access_token({"sub": "E1"}, settings.secret_key, expires_delta=timedelta(seconds=2))
+
+    with client.websocket_connect(f"/api/dashboard/ws?token={token}") as websocket:
+        websocket.receive_text() # 연결할 때는 유효
+        closed = _receive_until_closed(websocket)
+    assert closed.code == 1008
+
+
+def test_websocket_closes_when_token_is_revoked(client, signup, login):
+    signup("E1")
+    headers = login("E1")
+    token = headers["Authorization"].split()[1]
+
+    with client.websocket_connect(f"/api/dashboard/ws?token={token}") as websocket:
+        websocket.receive_text()
+        assert client.post("/auth/logout", headers=headers).status_code == 204
+        closed = _receive_until_closed(websocket)
+    assert closed.code == 1008
+
+
+def test_sse_stream_ends_when_token_expires(client, signup, settings):
+    signup("E1")
+    token = create_access_token({"sub": "E1"}, settings.secret_key, expires_delta=timedelta(seconds=2))
+
+    # TestClient 는 응답 본문이 끝나야 반환하므로, 스트림이 끝났다는 것 자체가 서버가 연결을 닫았다는 뜻입니다.
+    response = client.get("/api/dashboard/stream", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    lines = response.text.rstrip("\n").splitlines()
+    assert lines[0] == "retry: 3000"
+    assert lines[-2:] == ["event: auth_expired", 'data: {"type": "auth_expired"}']
@@ -0,0 +1,133 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select, update
+
+from src.models.email_outbox import OUTBOX_PENDING, OUTBOX_SENT, EmailOutbox
+from src.services.email_outbox_service import EMAIL_RETRY_BASE_SECONDS, EmailDispatcher, enqueue_email
+from src.utils.email_sender import PersistentSMTPSender
+
+
+class RecordingHandler:
+    """받은 메시지의 수신자를 기록합니다. fail_next 만큼은 451 (일시 오류) 로 거부합니다."""
+
+    def __init__(self):
+        self.recipients: list[str] = []
+        self.fail_next = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_next:
+            self.fail_next -= 1
+            return "451 4.3.0 Try again later"
+        self.recipients.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as s: # 비어 있는 포트
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield handler, port
+    finally:
+        controller.stop()
+
+
+def _dispatcher(port: int, **kwargs) -> EmailDispatcher:
+    return EmailDispatcher(
+        sender_factory=lambda: PersistentSMTPSender(
+            server="127.0.0.1", port=port, sender_email="noreply@example.com", use_tls=False
+        ),
+        **kwargs,
+    )
+
+
+async def _enqueue(database, count: int) -> None:
+    async with database.AsyncSessionLocal() as db:
+        for i in range(count):
+            enqueue_email(db, f"user{i}@example.com", "subject", "<p>body</p>")
+        await db.commit()
+
+
+async def _messages(database) -> list[EmailOutbox]:
+    async with database.AsyncSessionLocal() as db:
+        return list((await db.execute(select(EmailOutbox).order_by(EmailOutbox.to_email))).scalars().all())
+
+
+@pytest.mark.anyio
+async def test_dispatcher_delivers_pending_messages(database, smtp_server):
+    handler, port = smtp_server
+    await _enqueue(database, 3)
+    dispatcher = _dispatcher(port, connections=2)
+
+    assert await dispatcher.dispatch_once() == 3
+    await dispatcher.stop()
+
+    assert sorted(handler.recipients) == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert [(m.status, m.attempts) for m in await _messages(database)] == [(OUTBOX_SENT, 1)] * 3
+    assert await dispatcher.dispatch_once() == 0 # 보낸 메시지는 다시 가져가지 않음
+
+
+@pytest.mark.anyio
+async def test_dispatcher_retries_with_exponential_backoff(database, smtp_server):
+    handler, port = smtp_server
+    await _enqueue(database, 1)
+    dispatcher = _dispatcher(port, connections=1)
+    handler.fail_next = 2
+
+    delays = []
+    for _ in range(2):
+        started = datetime.now(timezone.utc)
+        assert await dispatcher.dispatch_once() == 1
+        (message,) = await _messages(database)
+        assert message.status == OUTBOX_PENDING
+        next_attempt_at = message.next_attempt_at.replace(tzinfo=timezone.utc) # SQLite 는 naive 로 반환
+        delays.append(round((next_attempt_at - started).total_seconds()))
+        # 재시도 시각 전에는 가져가지 않습니다.
+        assert await dispatcher.dispatch_once() == 0
+        async with database.AsyncSessionLocal() as db: # 시간이 흐른 것처럼 재시도 시각을 앞당김
+            await db.execute(update(EmailOutbox).values(next_attempt_at=started - timedelta(seconds=1)))
+            await db.commit()
+
+    assert delays == [EMAIL_RETRY_BASE_SECONDS, EMAIL_RETRY_BASE_SECONDS * 2]
+    assert await dispatcher.dispatch_once() == 1
+    await dispatcher.stop()
+
+    (message,) = await _messages(database)
+    assert (message.status, message.attempts, message.last_error) == (OUTBOX_SENT, 3, None)
+    assert handler.recipients == ["user0@example.com"]
+    assert dispatcher.stats()["retried"] == 2
+
+
+@pytest.mark.anyio
+async def test_concurrent_dispatchers_do_not_double_send(database, smtp_server):
+    handler, port = smtp_server
+    await _enqueue(database, 20)
+    # 여러 워커의 디스패처가 같은 시점에 같은 메시지를 조회하는 상황
+    dispatchers = [_dispatcher(port, connections=2) for _ in range(4)]
+
+    claimed = await asyncio.gather(*[d.dispatch_once() for d in dispatchers])
+    for dispatcher in dispatchers:
+        await dispatcher.stop()
+
+    assert sum(claimed) == 20
+    assert sorted(handler.recipients) == sorted(f"user{i}@example.com" for i in range(20))
+    assert {(m.status, m.attempts) for m in await _messages(database)} == {(OUTBOX_SENT, 1)}
+
+
+def test_admin_outbox_status_counts(client, signup, login):
+    signup("ADM1")
+    signup("E1")
+    client.post("/auth/forgot_password", json={"email": "e1@example.com"})
+
+    assert client.get("/admin/email-outbox", headers=login("E1")).status_code == 403
+    response = client.get("/admin/email-outbox", headers=login("ADM1"))
+    assert response.status_code == 200
+    assert sum(response.json().values()) == 1
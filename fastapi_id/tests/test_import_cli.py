@@ -0,0 +1,29 @@
+import sys
+
+from sqlalchemy import create_engine, select
+
+from src.cli import import_users
+from src.database import open_database, set_database
+from src.migrations import ensure_schema
+from src.models.user import User
+
+from conftest import PASSWORD
+
+
+def test_import_cli_prepares_schema_like_the_app(settings, tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text(f"email,password,name,phone,emp_number\nc1@example.com,{PASSWORD},A,1,C1\n", encoding="utf-8")
+    set_database(open_database(settings)) # CLI 가 get_database() 로 사용할 DB
+    monkeypatch.setattr(sys, "argv", ["import_users", str(csv_file)])
+    try:
+        assert import_users.main() == 0
+    finally:
+        set_database(None)
+    assert '"created": 1' in capsys.readouterr().out
+
+    # CLI 가 스키마 변경 단계까지 적용하고 지문을 저장했으므로 앱 시작 시 다시 확인할 것이 없습니다.
+    engine = create_engine(settings.database_url)
+    assert ensure_schema(engine) == {"schema": "current", "applied": []}
+    with engine.connect() as conn:
+        assert conn.execute(select(User.emp_number)).scalars().all() == ["C1"]
+    engine.dispose()
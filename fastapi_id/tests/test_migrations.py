@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.migrations import apply_schema_upgrades, ensure_schema
+from src.models.user import User
+
+
+def _create_legacy_reset_tokens(engine) -> None:
+    # user-005 이전 스키마: user_id 에 UNIQUE 인덱스가 없고 사용자별 토큰이 여러 개일 수 있음
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE password_reset_tokens ("
+            " id VARCHAR(36) PRIMARY KEY, user_id VARCHAR(50) NOT NULL, token VARCHAR NOT NULL,"
+            " expires_at DATETIME NOT NULL, created_at DATETIME)"
+        ))
+        conn.execute(text("CREATE INDEX ix_password_reset_tokens_user_id ON password_reset_tokens (user_id)"))
+        conn.execute(text(
+            "INSERT INTO password_reset_tokens VALUES"
+            " ('t1', 'u1', 'old', '2026-01-01 00:00:00', '2026-01-01 00:00:00'),"
+            " ('t2', 'u1', 'new', '2026-01-01 00:10:00', '2026-01-01 00:10:00'),"
+            " ('t3', 'u2', 'only', '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+        ))
+
+
+def test_reset_token_upgrade_dedupes_and_adds_unique_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    _create_legacy_reset_tokens(engine)
+
+    ensure_schema(engine, skip_if_current=False)
+
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("password_reset_tokens")}
+    assert indexes["ix_password_reset_tokens_user_id"]["unique"]
+    assert "ix_password_reset_tokens_expires_at" in indexes
+    with engine.connect() as conn:
+        tokens = conn.execute(text("SELECT user_id, token FROM password_reset_tokens ORDER BY user_id")).all()
+    assert tokens == [("u1", "new"), ("u2", "only")] # 사용자별 가장 최근 토큰만 남음
+
+    # 다시 실행해도 아무것도 하지 않습니다.
+    assert "password_reset_tokens_one_per_user" not in apply_schema_upgrades(engine)
+    engine.dispose()
+
+
+def test_fresh_database_needs_no_upgrades(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    result = ensure_schema(engine)
+    assert result == {"schema": "updated", "applied": []}
+    assert ensure_schema(engine) == {"schema": "current", "applied": []}
+    # 목록/검색 인덱스는 PostgreSQL 전용: SQLite 에는 UNIQUE 인덱스만 있습니다.
+    assert {index["name"] for index in inspect(engine).get_indexes("Users")} == {"ix_Users_email", "ix_Users_emp_number"}
+    engine.dispose()
+
+
+def test_list_index_upgrade_drops_duplicates_outside_postgresql(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    ensure_schema(engine)
+    # 이전 create_all 이 모든 DB 에 만들던 인덱스
+    with engine.begin() as conn:
+        conn.execute(text('CREATE INDEX ix_users_email_prefix ON "Users" (email)'))
+        conn.execute(text('CREATE INDEX ix_users_created_at_user_id ON "Users" (created_at, user_id)'))
+
+    assert "users_list_indexes" in apply_schema_upgrades(engine)
+    assert {index["name"] for index in inspect(engine).get_indexes("Users")} == {"ix_Users_email", "ix_Users_emp_number"}
+    assert "users_list_indexes" not in apply_schema_upgrades(engine)
+    engine.dispose()
+
+
+def test_list_indexes_use_pattern_ops_on_postgresql():
+    ddl = {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in User.__table__.indexes
+    }
+    assert ddl["ix_users_name_prefix"].endswith("(name varchar_pattern_ops)")
+    assert ddl["ix_users_created_at_user_id"].endswith("(created_at, user_id)")
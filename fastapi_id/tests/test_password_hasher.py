@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.password_hasher import PasswordHasher, PasswordHasherUnavailableError
+
+
+@pytest.mark.anyio
+async def test_timed_out_jobs_stay_counted_until_the_worker_finishes():
+    hasher = PasswordHasher(max_workers=2, max_queue=2, timeout_seconds=0.05)
+    try:
+        # 제한 시간은 지났지만 워커에서는 아직 실행 중인 작업 (time.sleep 은 pickle 가능)
+        with pytest.raises(PasswordHasherUnavailableError):
+            await hasher._submit("sleep", time.sleep, 0.5)
+        with pytest.raises(PasswordHasherUnavailableError):
+            await hasher._submit("sleep", time.sleep, 0.5)
+        assert hasher.stats()["in_flight"] == 2
+
+        # 대기열은 워커에 남은 작업 기준으로 가득 찬 상태
+        with pytest.raises(PasswordHasherUnavailableError, match="queue is full"):
+            await hasher._submit("sleep", time.sleep, 0)
+
+        deadline = time.monotonic() + 5
+        while hasher.stats()["in_flight"] and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        stats = hasher.stats()
+        assert (stats["in_flight"], stats["timeouts"], stats["rejected"]) == (0, 2, 1)
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,67 @@
+import httpx
+import pytest
+from sqlalchemy import create_engine, select, update
+
+from src.models.user import User
+from src.services.password_hash_service import drain_rehash_tasks, schedule_rehash_if_needed
+from src.utils.password_hasher import PASSWORD_BCRYPT_ROUNDS, build_crypt_context, describe_hash, pwd_context
+
+from conftest import PASSWORD
+
+# 테스트 설정의 비용(PASSWORD_BCRYPT_ROUNDS=4)은 bcrypt 의 최솟값이므로 다른 비용으로 만든 해시를 "오래된 해시"로 사용합니다.
+OUTDATED_ROUNDS = PASSWORD_BCRYPT_ROUNDS + 1
+outdated_context = build_crypt_context(["bcrypt"], bcrypt_rounds=OUTDATED_ROUNDS)
+
+
+def _set_password_hash(database_url: str, emp_number: str, password_hash: str) -> None:
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(update(User).where(User.emp_number == emp_number).values(password_hash=password_hash))
+    engine.dispose()
+
+
+async def _stored_hash(database, emp_number: str) -> str:
+    async with database.AsyncSessionLocal() as db:
+        return (await db.execute(select(User.password_hash).where(User.emp_number == emp_number))).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_login_rewrites_outdated_hash(app, database, settings):
+    old_hash = outdated_context.hash(PASSWORD)
+    assert pwd_context.needs_update(old_hash)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        signup = await client.post("/auth/signup", json={
+            "email": "e1@example.com", "password": PASSWORD, "name": "Tester", "phone": "010-0000-0000", "empNumber": "E1",
+        })
+        assert signup.status_code in (200, 201), signup.text
+        _set_password_hash(settings.database_url, "E1", old_hash)
+
+        assert (await client.post("/auth/login", json={"emp_number": "E1", "password": PASSWORD})).status_code == 200
+        await drain_rehash_tasks() # 로그인 응답은 재해싱을 기다리지 않습니다.
+
+        new_hash = await _stored_hash(database, "E1")
+        assert new_hash != old_hash
+        assert describe_hash(new_hash) == ("bcrypt", f"{PASSWORD_BCRYPT_ROUNDS:02d}")
+        assert not pwd_context.needs_update(new_hash) and pwd_context.verify(PASSWORD, new_hash)
+        # 새 해시로도 로그인되고, 더 이상 재해싱을 예약하지 않습니다.
+        assert (await client.post("/auth/login", json={"emp_number": "E1", "password": PASSWORD})).status_code == 200
+        await drain_rehash_tasks()
+        assert await _stored_hash(database, "E1") == new_hash
+
+
+@pytest.mark.anyio
+async def test_rehash_does_not_overwrite_a_changed_password(database, session, settings):
+    old_hash = outdated_context.hash(PASSWORD)
+    user = User(password_hash=old_hash, email="e1@example.com", name="Tester", phone="1", emp_number="E1")
+    session.add(user)
+    await session.commit()
+
+    assert schedule_rehash_if_needed(user.user_id, PASSWORD, old_hash)
+    # 재해싱 작업이 실행되기 전에 (await 없이) 비밀번호가 바뀐 상황
+    changed_hash = pwd_context.hash("N3w-passw0rd!")
+    _set_password_hash(settings.database_url, "E1", changed_hash)
+    await drain_rehash_tasks()
+
+    # 조건부 UPDATE (기존 해시가 그대로일 때만) 가 아무 행도 바꾸지 않아야 합니다.
+    assert await _stored_hash(database, "E1") == changed_hash
@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select
+
+from src.models.password_reset_token import PasswordResetToken
+from src.models.user import User
+from src.services.password_reset_service import ResetTokenSweeper
+
+
+@pytest.mark.anyio
+async def test_sweeper_deletes_expired_tokens_in_bounded_batches(database, session):
+    now = datetime.now(timezone.utc)
+    for i in range(6):
+        user = User(user_id=f"u{i}", password_hash="x", email=f"u{i}@example.com", name="n", phone="1", emp_number=f"E{i}")
+        session.add(user)
+        session.add(PasswordResetToken(
+            user_id=user.user_id,
+            token=uuid.uuid4().hex,
+            expires_at=now + (timedelta(minutes=10) if i == 5 else -timedelta(minutes=1)), # 5개 만료, 1개 유효
+        ))
+    await session.commit()
+
+    deletes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("DELETE"):
+            deletes.append(cursor.rowcount)
+
+    sync_engine = database.async_engine.sync_engine
+    event.listen(sync_engine, "after_cursor_execute", record)
+    try:
+        deleted = await ResetTokenSweeper(batch_size=2).sweep_once()
+    finally:
+        event.remove(sync_engine, "after_cursor_execute", record)
+
+    assert deleted == 5
+    assert deletes == [2, 2, 1] # 배치마다 batch_size 이하로 나눠서 삭제
+    async with database.AsyncSessionLocal() as check:
+        assert (await check.execute(select(func.count()).select_from(PasswordResetToken))).scalar_one() == 1
+
+
+def test_forgot_password_for_user_created_outside_this_worker(client):
+    # 다른 워커(또는 import CLI)가 방금 만든 사용자: 이 워커의 존재 필터에는 아직 없습니다.
+    with client.app.state.database.SessionLocal() as db:
+        db.add(User(password_hash="x", email="fresh@example.com", name="n", phone="1", emp_number="F1"))
+        db.commit()
+
+    response = client.post("/auth/forgot_password", json={"email": "fresh@example.com"})
+    assert response.status_code == 200
+    assert response.json()["detail"] == "Check your email for the reset link."
+    with client.app.state.database.SessionLocal() as db:
+        assert db.execute(select(func.count()).select_from(PasswordResetToken)).scalar_one() == 1
@@ -0,0 +1,67 @@
+import pytest
+
+from src.models.user import User
+from src.services.user_service import deactivate_user_async, update_user_password_async
+from src.utils.principal_cache import AuthenticatedUser, principal_cache
+
+from conftest import PASSWORD
+
+TOKEN = "token-e1"
+
+
+async def _cached_user(session) -> User:
+    user = User(password_hash="x", email="e1@example.com", name="Tester", phone="1", emp_number="E1")
+    session.add(user)
+    await session.commit()
+    principal_cache.put(TOKEN, {"sub": "E1"}, AuthenticatedUser.from_user(user))
+    assert principal_cache.lookup(TOKEN) is not None
+    return user
+
+
+@pytest.mark.anyio
+async def test_password_change_invalidates_after_commit(database, session):
+    user = await _cached_user(session)
+
+    await update_user_password_async(session, user.user_id, "N3w-passw0rd!")
+    # 커밋 전에는 다른 요청이 아직 이전 값을 보므로 캐시도 그대로 둡니다.
+    assert principal_cache.lookup(TOKEN) is not None
+    await session.commit()
+    assert principal_cache.lookup(TOKEN) is None
+
+
+@pytest.mark.anyio
+async def test_withdrawal_invalidates_after_commit(database, session):
+    user = await _cached_user(session)
+
+    await deactivate_user_async(session, user)
+    assert principal_cache.lookup(TOKEN) is not None
+    await session.commit()
+    assert principal_cache.lookup(TOKEN) is None
+
+
+@pytest.mark.anyio
+async def test_rollback_leaves_cache_untouched(database, session):
+    user = await _cached_user(session)
+
+    await update_user_password_async(session, user.user_id, "N3w-passw0rd!")
+    await session.rollback()
+    assert principal_cache.lookup(TOKEN) is not None
+
+    # 롤백된 변경의 무효화 콜백은 버려지므로 같은 세션의 다음 커밋에서도 실행되지 않습니다.
+    await session.commit()
+    cached = principal_cache.lookup(TOKEN)
+    assert cached is not None and cached[1].password_hash == "x"
+
+
+def test_verify_password_sees_new_password_after_change(client, signup, login):
+    signup("E1")
+    headers = login("E1")
+    assert client.get("/auth/mypage", headers=headers).status_code == 200 # 캐시에 적재
+
+    changed = client.put("/auth/change-password", headers=headers, json={
+        "current_password": PASSWORD, "new_password": "N3w-passw0rd!", "confirm_password": "N3w-passw0rd!",
+    })
+    assert changed.status_code == 200, changed.text
+    # 같은 토큰이지만 캐시된 이전 해시가 아니라 새 비밀번호로 확인합니다.
+    assert client.post("/auth/verify-password", headers=headers, json={"password": "N3w-passw0rd!"}).status_code == 200
+    assert client.post("/auth/verify-password", headers=headers, json={"password": PASSWORD}).status_code == 401
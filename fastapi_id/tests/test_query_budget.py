@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select
+
+from src.models.password_reset_token import PasswordResetToken
+from src.utils.principal_cache import principal_cache
+from src.utils.query_profiler import QueryBudgetExceeded
+
+from conftest import AUTH_QUERY_BUDGETS, PASSWORD
+
+NEW_PASSWORD = "NewPassw0rd!"
+
+
+def test_auth_routes_stay_within_query_budget(client, login, query_budget):
+    def cold(method: str, url: str, **kwargs):
+        principal_cache.clear() # 예산은 인증 캐시가 비어 있을 때(다른 워커, 캐시 만료) 기준
+        response = client.request(method, url, **kwargs)
+        assert response.status_code < 400, response.text
+        return response
+
+    cold("POST", "/auth/signup", json={
+        "email": "e1@example.com", "password": PASSWORD, "name": "Tester", "phone": "010-0000-0000", "empNumber": "E1",
+    })
+    headers = login("E1")
+    cold("GET", "/auth/mypage", headers=headers)
+    cold("POST", "/auth/verify-password", headers=headers, json={"password": PASSWORD})
+    cold("PUT", "/auth/change-password", headers=headers, json={
+        "current_password": PASSWORD, "new_password": NEW_PASSWORD, "confirm_password": NEW_PASSWORD,
+    })
+
+    cold("POST", "/auth/forgot_password", json={"email": "e1@example.com"})
+    with client.app.state.database.SessionLocal() as db:
+        token = db.execute(select(PasswordResetToken.token)).scalar_one()
+    cold("POST", "/auth/reset_password", json={"token": token, "new_password": PASSWORD})
+
+    cold("POST", "/auth/logout", headers=login("E1"))
+    cold("DELETE", "/auth/withdrawal", headers=login("E1"), json={"password": PASSWORD})
+
+    # 예산 이하일 뿐 아니라 현재 쿼리 수와 같아야 합니다. (줄었다면 AUTH_QUERY_BUDGETS 도 낮춥니다)
+    assert {route: max(counts) for route, counts in query_budget.items()} == AUTH_QUERY_BUDGETS
+
+
+def test_query_budget_fails_request_over_budget(client, signup, query_budget, monkeypatch):
+    monkeypatch.setitem(AUTH_QUERY_BUDGETS, "/auth/signup", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        signup("E1")
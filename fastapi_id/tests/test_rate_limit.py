@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils.rate_limit import rate_limiter
+
+from conftest import PASSWORD
+
+LOGIN_LIMIT = rate_limiter.policies["login"].limit
+
+
+def _login(client, emp_number: str, password: str = PASSWORD):
+    return client.post("/auth/login", json={"emp_number": emp_number, "password": password})
+
+
+def test_successful_logins_do_not_use_up_the_ip_limit(client, signup):
+    # 같은 NAT 뒤(같은 IP)의 여러 사용자가 정상 로그인
+    for i in range(3):
+        signup(f"E{i}")
+    for _ in range(LOGIN_LIMIT + 2):
+        for i in range(3):
+            assert _login(client, f"E{i}").status_code == 200
+
+
+def test_failed_logins_are_limited_per_ip_and_emp_number(client, signup):
+    signup("E1")
+    signup("E2")
+    for _ in range(LOGIN_LIMIT):
+        assert _login(client, "E1", "wrong-password").status_code == 401
+
+    blocked = _login(client, "E1") # 한도에 이르면 올바른 비밀번호도 확인하지 않음
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) >= 1
+    # 같은 IP 에서 다른 사번으로 바꿔 시도해도 IP 기준 한도에 걸립니다.
+    assert _login(client, "E2").status_code == 429
+
+
+@pytest.mark.anyio
+async def test_concurrent_failed_logins_cannot_exceed_the_limit(app, database):
+    # 모든 시도가 비밀번호 확인(수 ms ~ 수백 ms) 전에 한도를 확인하므로, 동시에 보내도 한도 이상은 확인까지 가지 못합니다.
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        signup = await client.post("/auth/signup", json={
+            "email": "e1@example.com", "password": PASSWORD, "name": "Tester", "phone": "010-0000-0000", "empNumber": "E1",
+        })
+        assert signup.status_code == 201
+
+        attempts = [
+            client.post("/auth/login", json={"emp_number": "E1", "password": f"wrong-{i}"})
+            for i in range(LOGIN_LIMIT * 4)
+        ]
+        statuses = [response.status_code for response in await asyncio.gather(*attempts)]
+
+    assert statuses.count(401) == LOGIN_LIMIT
+    assert statuses.count(429) == LOGIN_LIMIT * 3
@@ -0,0 +1,111 @@
+import dataclasses
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from src.database import open_database
+from src.migrations import ensure_schema
+from src.models.user import User
+from src.read_replica import replica_router
+from src.utils.principal_cache import principal_cache
+
+
+@pytest.fixture
+def replica_url(tmp_path) -> str:
+    # 복제 대신 같은 스키마의 별도 SQLite 파일을 사용: 어느 DB 에서 읽었는지 행 내용으로 구분할 수 있습니다.
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(url)
+    ensure_schema(engine)
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def settings(settings, replica_url):
+    return dataclasses.replace(settings, database_replica_urls=(replica_url,), db_read_after_write_seconds=0)
+
+
+def _add_user(url: str, emp_number: str, name: str, user_id: str = None) -> None:
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            user_id=user_id or f"id-{emp_number}", password_hash="x", email=f"{emp_number.lower()}@example.com",
+            name=name, phone="1", emp_number=emp_number,
+        ))
+    engine.dispose()
+
+
+async def _names(db) -> list[str]:
+    return (await db.execute(select(User.name).order_by(User.name))).scalars().all()
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_replica(database, settings, replica_url):
+    _add_user(settings.database_url, "P1", "primary")
+    _add_user(replica_url, "R1", "replica")
+
+    before = replica_router.stats()["replica_reads"]
+    async with database.ReadSessionLocal() as db:
+        assert await _names(db) == ["replica"]
+    assert replica_router.stats()["replica_reads"] == before + 1
+
+    # 쓰기 경로(UnitOfWork 등)의 세션은 항상 주 DB
+    async with database.AsyncSessionLocal() as db:
+        assert await _names(db) == ["primary"]
+
+
+@pytest.mark.anyio
+async def test_writes_and_reads_after_write_go_to_primary(database, settings, replica_url):
+    _add_user(settings.database_url, "P1", "primary")
+    _add_user(replica_url, "R1", "replica")
+
+    async with database.ReadSessionLocal() as db:
+        assert await _names(db) == ["replica"]
+        db.add(User(password_hash="x", email="w1@example.com", name="written", phone="1", emp_number="W1"))
+        await db.flush()
+        # 같은 세션(요청)에서 쓴 뒤의 조회는 자신이 쓴 행이 보이는 주 DB 에서
+        assert await _names(db) == ["primary", "written"]
+        await db.commit()
+
+    async with database.AsyncSessionLocal() as db:
+        assert await _names(db) == ["primary", "written"]
+    engine = create_engine(replica_url)
+    with engine.connect() as conn:
+        assert conn.execute(select(User.name)).scalars().all() == ["replica"]
+    engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_dead_replica_falls_back_to_primary(settings, tmp_path):
+    # 존재하지 않는 디렉토리의 SQLite 파일: 연결할 때 OperationalError
+    dead = dataclasses.replace(settings, database_replica_urls=(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}",))
+    database = open_database(dead)
+    try:
+        ensure_schema(database.engine)
+        _add_user(dead.database_url, "P1", "primary")
+        fallbacks = replica_router.stats()["fallbacks"]
+
+        async with database.ReadSessionLocal() as db:
+            assert await _names(db) == ["primary"]
+        stats = replica_router.stats()
+        assert stats["fallbacks"] == fallbacks + 1 and stats["replicas_down"] == 1
+
+        # 제외 기간 동안은 복제본에 다시 연결하지 않고 바로 주 DB 에서 조회
+        async with database.ReadSessionLocal() as db:
+            assert await _names(db) == ["primary"]
+        assert replica_router.stats()["fallbacks"] == fallbacks + 1
+    finally:
+        await database.dispose()
+
+
+def test_request_reads_from_replica_and_falls_back_for_new_user(client, signup, login, replica_url):
+    # 방금 가입한 사용자는 복제본에 없으므로 로그인 조회는 주 DB 로 다시 시도하여 성공합니다.
+    user_id = signup("E1").json()["user_id"]
+    headers = login("E1")
+
+    # 복제된 뒤 (이름만 다르게 넣어 어느 DB 에서 읽었는지 구분): 인증 조회는 복제본에서
+    _add_user(replica_url, "E1", "from-replica", user_id=user_id)
+    principal_cache.clear()
+    me = client.get("/auth/mypage", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["name"] == "from-replica"